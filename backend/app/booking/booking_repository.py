@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, exists, literal_column
+from sqlalchemy.engine import Row
 import logging
 
-from models import Booking, Flight
+from models import Booking, Flight, CheckinRecord
 from app.shared.exceptions import BookingNotFoundError
 
 logger = logging.getLogger(__name__)
@@ -25,6 +26,10 @@ class IBookingRepository(ABC):
     @abstractmethod
     async def find_booking_with_flight(self, booking_id: str) -> Optional[tuple]:
         pass
+    
+    @abstractmethod
+    async def mark_checked_in(self, booking_id: str) -> Optional[Row]:
+        pass
 
 class BookingRepository(IBookingRepository):
     def __init__(self, db: AsyncSession):
@@ -53,4 +58,24 @@ class BookingRepository(IBookingRepository):
             .join(Flight)
             .where(Booking.booking_id == booking_id)
         )
-        return result.first()
\ No newline at end of file
+        return result.first()
+    
+    async def mark_checked_in(self, booking_id: str) -> Optional[Row]:
+        # None for a missing or cancelled booking
+        result = await self.db.execute(
+            update(Booking)
+            .where(Booking.booking_id == booking_id, Booking.booking_status != "cancelled")
+            .values(booking_status="checked_in")
+            .returning(
+                Booking.booking_id,
+                Booking.passenger_id,
+                Booking.seat_number,
+                Booking.flight_id,
+                # Outer columns spelled out: SQLite renders RETURNING columns unqualified
+                select(Flight.departure_time).where(Flight.flight_id == literal_column("bookings.flight_id"))
+                .scalar_subquery().label("departure_time"),
+                exists().where(CheckinRecord.booking_id == literal_column("bookings.booking_id"))
+                .label("already_checked_in")
+            )
+        )
+        return result.first()
@@ -3,15 +3,15 @@ from typing import Optional
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import Booking
+from models import Booking, generate_uuid
 from schemas import BookingCreate, BookingResponse
-from utils import assign_seat
+from app.core.seat_counts import seat_counts
 from app.booking.booking_repository import BookingRepository
 from app.flight.flight_repository import FlightRepository
 from app.passenger.passenger_repository import PassengerRepository
 from app.shared.exceptions import (
     BookingNotFoundError, FlightNotFoundError, PassengerNotFoundError,
-    NoSeatsAvailableError
+    NoSeatsAvailableError, SeatNotAvailableError, BusinessValidationError
 )
 
 logger = logging.getLogger(__name__)
@@ -40,34 +40,35 @@ class BookingService(IBookingService):
         logger.info(f"Creating booking for user {user_id}")
         
         try:
-            # Validate entities exist
-            flight = await self.flight_repository.find_by_id(booking_data.flight_id)
-            if not flight:
-                raise FlightNotFoundError(booking_data.flight_id)
-            
             passenger = await self.passenger_repository.find_by_id(booking_data.passenger_id)
             if not passenger:
                 raise PassengerNotFoundError(booking_data.passenger_id)
             
-            # Validate business rules
-            if flight.available_seats <= 0:
+            # Claim a seat row; the flight row stays out of the booking path
+            booking_id = generate_uuid()
+            seat_number = await self.flight_repository.claim_seat(
+                booking_data.flight_id, booking_id, booking_data.seat_number
+            )
+            if not seat_number:
+                if not await self.flight_repository.find_by_id(booking_data.flight_id):
+                    raise FlightNotFoundError(booking_data.flight_id)
+                if booking_data.seat_number:
+                    if not await self.flight_repository.find_seat(booking_data.flight_id, booking_data.seat_number):
+                        raise BusinessValidationError(f"Seat {booking_data.seat_number} does not exist on this flight")
+                    raise SeatNotAvailableError(booking_data.seat_number)
                 raise NoSeatsAvailableError()
             
-            # Assign seat
-            seat_number = booking_data.seat_number or assign_seat(flight.total_seats, flight.available_seats)
-            
             # Create booking
             booking = Booking(
+                booking_id=booking_id,
                 flight_id=booking_data.flight_id,
                 passenger_id=booking_data.passenger_id,
                 seat_number=seat_number
             )
             
-            # Update available seats
-            await self.flight_repository.update_available_seats(booking_data.flight_id, -1)
-            
-            # Save booking
+            # Save booking, committing the seat claim with it
             booking = await self.booking_repository.save(booking)
+            seat_counts.mark(booking_data.flight_id)
             
             logger.info(f"Booking {booking.booking_id} created successfully")
             return booking
@@ -94,10 +95,12 @@ class BookingService(IBookingService):
             # Update booking status
             await self.booking_repository.update_status(booking_id, "cancelled")
             
-            # Restore seat availability
-            await self.flight_repository.update_available_seats(booking.flight_id, 1)
+            # Free the seat row for the next booking
+            await self.flight_repository.release_seat(booking_id)
+            flight_id = booking.flight_id
             
             await self.db.commit()
+            seat_counts.mark(flight_id)
             logger.info(f"Booking {booking_id} cancelled successfully")
             
         except Exception as e:
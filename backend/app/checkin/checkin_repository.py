@@ -5,6 +5,7 @@ from sqlalchemy import select
 import logging
 
 from models import CheckinRecord, Booking, Flight
+from app.core.upsert import insert_for
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +18,10 @@ class ICheckinRepository(ABC):
     async def save(self, checkin: CheckinRecord) -> CheckinRecord:
         pass
     
+    @abstractmethod
+    async def save_if_absent(self, checkin: CheckinRecord) -> Optional[CheckinRecord]:
+        pass
+    
     @abstractmethod
     async def find_checkin_details_by_id(self, checkin_id: str) -> Optional[tuple]:
         pass
@@ -35,6 +40,23 @@ class CheckinRepository(ICheckinRepository):
         await self.db.refresh(checkin)
         return checkin
     
+    async def save_if_absent(self, checkin: CheckinRecord) -> Optional[CheckinRecord]:
+        # Returns None instead of inserting when the booking is already checked in
+        result = await self.db.execute(
+            insert_for(self.db, CheckinRecord)
+            .values(
+                booking_id=checkin.booking_id,
+                boarding_pass_number=checkin.boarding_pass_number,
+                gate_number=checkin.gate_number,
+                boarding_group=checkin.boarding_group
+            )
+            .on_conflict_do_nothing(index_elements=[CheckinRecord.booking_id])
+            .returning(CheckinRecord)
+        )
+        checkin = result.scalar_one_or_none()
+        await self.db.commit()
+        return checkin
+    
     async def find_checkin_details_by_id(self, checkin_id: str) -> Optional[tuple]:
         result = await self.db.execute(
             select(CheckinRecord, Booking, Flight)
@@ -39,29 +39,25 @@ class CheckinService(ICheckinService):
         logger.info(f"Processing check-in for booking {checkin_data.booking_id}")
         
         try:
-            # Get booking with flight info
-            booking_flight = await self.booking_repository.find_booking_with_flight(checkin_data.booking_id)
-            if not booking_flight:
+            # Status flip and flight lookup in one statement; errors below roll it back
+            booking = await self.booking_repository.mark_checked_in(checkin_data.booking_id)
+            if not booking:
                 raise BookingNotFoundError(checkin_data.booking_id)
             
-            booking, flight = booking_flight
-            
             # Validate passenger ID
             if booking.passenger_id != checkin_data.passenger_id:
                 raise PassengerMismatchError()
             
-            # Check if already checked in
-            existing_checkin = await self.checkin_repository.find_by_booking_id(checkin_data.booking_id)
-            if existing_checkin:
+            if booking.already_checked_in:
                 raise AlreadyCheckedInError(checkin_data.booking_id)
             
             # Validate check-in window
-            is_valid, error_msg = validate_checkin_window(flight.departure_time)
+            is_valid, error_msg = validate_checkin_window(booking.departure_time)
             if not is_valid:
                 raise CheckinWindowError(error_msg)
             
             # Create check-in record
-            boarding_pass_number = generate_boarding_pass_number(flight.flight_id, booking.booking_id)
+            boarding_pass_number = generate_boarding_pass_number(booking.flight_id)
             boarding_group = get_boarding_group(booking.seat_number)
             
             checkin_record = CheckinRecord(
@@ -71,18 +67,17 @@ class CheckinService(ICheckinService):
                 boarding_group=boarding_group
             )
             
-            # Update booking status
-            await self.booking_repository.update_status(checkin_data.booking_id, "checked_in")
-            
-            # Save checkin record
-            checkin_record = await self.checkin_repository.save(checkin_record)
+            # Save checkin record; the unique booking_id settles concurrent check-ins
+            checkin_record = await self.checkin_repository.save_if_absent(checkin_record)
+            if not checkin_record:
+                raise AlreadyCheckedInError(checkin_data.booking_id)
             
             logger.info(f"Check-in completed for booking {checkin_data.booking_id}")
             
             return BoardingPassResponse(
                 checkin_id=checkin_record.checkin_id,
                 boarding_pass_number=checkin_record.boarding_pass_number,
-                flight_id=flight.flight_id,
+                flight_id=booking.flight_id,
                 seat_number=booking.seat_number,
                 boarding_group=checkin_record.boarding_group,
                 gate_number=checkin_record.gate_number,
@@ -1,13 +1,21 @@
 from datetime import datetime, timedelta
 from typing import Optional
+import os
+import uuid
 import jwt
 from jwt import InvalidTokenError as JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
+from app.core.token_cache import token_cache
 
 SECRET_KEY = "your-secret-key-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# "database": every request loads the user (through the principal cache);
+# "stateless": the principal comes from the token's claims, checked against revocations
+AUTH_MODE = os.getenv("AUTH_MODE", "database")
+# Usernames allowed to use the admin write endpoints; nobody when unset
+ADMIN_USERNAMES = frozenset(name.strip() for name in (os.getenv("ADMIN_USERNAMES") or "").split(",") if name.strip())
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -19,28 +27,37 @@ def get_password_hash(password):
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+        expire = now + timedelta(minutes=15)
+    # jti names the token for revocation, iat orders it against user-wide revocations
+    to_encode.update({"exp": expire, "iat": now, "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str):
+def principal_claims(user) -> dict:
+    """Claims that let a stateless request build the principal without the users table"""
+    return {"sub": user.username, "uid": user.id, "active": bool(user.is_active)}
+
+def decode_token(token: str) -> dict:
+    """Verified claims of the token; shared with other requests, do not modify"""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        return username
     except JWTError:
+        payload = {}
+    if payload.get("sub") is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
+    token_cache.put(token, payload)
+    return payload
+
+def verify_token(token: str):
+    return decode_token(token)["sub"]
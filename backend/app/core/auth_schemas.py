@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel, EmailStr, Field
 
 class Token(BaseModel):
@@ -15,4 +16,14 @@ class User(BaseModel):
 class UserCreate(BaseModel):
     username: str = Field(..., min_length=3, max_length=50)
     email: EmailStr
-    password: str = Field(..., min_length=6)
\ No newline at end of file
+    password: str = Field(..., min_length=6)
+
+class ProvisionIssue(BaseModel):
+    line: int
+    username: Optional[str] = None
+    reason: str
+
+class BulkProvisionReport(BaseModel):
+    created: int = 0
+    duplicates: List[ProvisionIssue] = Field(default_factory=list)
+    invalid: List[ProvisionIssue] = Field(default_factory=list)
@@ -0,0 +1,159 @@
+import heapq
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+
+from app.core.route_index import FlightRecord, RouteIndex, route_index
+
+# Shortest time between arriving and departing again at the same airport, with per-airport overrides
+MIN_CONNECTION_MINUTES = float(os.getenv("MIN_CONNECTION_MINUTES") or 45)
+# Comma-separated AIRPORT:MINUTES pairs, e.g. "JFK:75,ATL:40"
+AIRPORT_MIN_CONNECTION_MINUTES = os.getenv("AIRPORT_MIN_CONNECTION_MINUTES") or ""
+MAX_LAYOVER_HOURS = float(os.getenv("MAX_LAYOVER_HOURS") or 12)
+# How far after departure_from the first leg may leave when no departure_to is given
+CONNECTION_SEARCH_WINDOW_HOURS = float(os.getenv("CONNECTION_SEARCH_WINDOW_HOURS") or 24)
+CONNECTION_MAX_LEGS = int(os.getenv("CONNECTION_MAX_LEGS") or 3)
+
+UNBOOKABLE_STATUSES = frozenset({"cancelled"})
+
+
+def parse_connection_minutes(value: str) -> Dict[str, timedelta]:
+    minutes = {}
+    for pair in value.split(","):
+        if pair.strip():
+            airport, _, amount = pair.partition(":")
+            minutes[airport.strip().upper()] = timedelta(minutes=float(amount))
+    return minutes
+
+
+@dataclass
+class Itinerary:
+    """Flights taken one after another, shaped for ItineraryResponse"""
+    legs: List[FlightRecord]
+
+    @property
+    def departure_time(self) -> datetime:
+        return self.legs[0].departure_time
+
+    @property
+    def arrival_time(self) -> datetime:
+        return self.legs[-1].arrival_time
+
+    @property
+    def duration_minutes(self) -> int:
+        return int((self.arrival_time - self.departure_time).total_seconds() // 60)
+
+    @property
+    def connections(self) -> int:
+        return len(self.legs) - 1
+
+    @property
+    def available_seats(self) -> int:
+        return min(leg.available_seats for leg in self.legs)
+
+
+# Search label: flights taken so far, newest last, as a linked list shared between labels
+Path = Tuple[FlightRecord, Optional["Path"]]
+
+
+def _legs(path: Path) -> List[FlightRecord]:
+    legs = []
+    while path is not None:
+        legs.append(path[0])
+        path = path[1]
+    return legs[::-1]
+
+
+class ConnectionFinder:
+    """Connecting itineraries over the route index.
+
+    The route index is the time-expanded graph: a flight is an edge from its
+    departure event to its arrival event, and a connection at an airport is
+    any flight on a route out of it leaving between the minimum connection
+    time and the maximum layover after arrival. Edges are found by bisecting
+    the route's departures, so the graph is never materialised beyond the
+    index, which already follows flight commits and seat counts.
+
+    The search is label-setting in arrival order: labels come off a heap
+    earliest arrival first, so the first ``limit`` labels reaching the
+    destination are the ``limit`` earliest-arriving itineraries. Each airport is
+    expanded in full at most ``limit`` times per number of legs taken; later
+    arrivals there only add the departures past the earlier layover windows.
+    """
+
+    def __init__(self, index: RouteIndex = route_index, min_connection: Optional[timedelta] = None,
+                 airport_min_connection: Optional[Dict[str, timedelta]] = None,
+                 max_layover: Optional[timedelta] = None):
+        self.index = index
+        self.min_connection = min_connection if min_connection is not None else timedelta(minutes=MIN_CONNECTION_MINUTES)
+        self.airport_min_connection = (
+            airport_min_connection if airport_min_connection is not None
+            else parse_connection_minutes(AIRPORT_MIN_CONNECTION_MINUTES)
+        )
+        self.max_layover = max_layover if max_layover is not None else timedelta(hours=MAX_LAYOVER_HOURS)
+
+    def min_connection_at(self, airport: str) -> timedelta:
+        return self.airport_min_connection.get(airport, self.min_connection)
+
+    def search(self, origin: str, destination: str, departure_from: datetime, departure_to: datetime,
+               limit: int = 5, max_legs: int = CONNECTION_MAX_LEGS, seats: int = 1) -> List[Itinerary]:
+        """Up to ``limit`` itineraries from origin to destination by arrival time, first leg
+        departing in [departure_from, departure_to), every leg with ``seats`` seats free"""
+        if origin == destination:
+            return []
+        heap: list = []
+        tie = count()
+
+        def usable(record: FlightRecord) -> bool:
+            return record.available_seats >= seats and record.status not in UNBOOKABLE_STATUSES
+
+        def push(airport: str, earliest: datetime, latest: datetime, path: Optional[Path], legs: int,
+                 visited: frozenset) -> None:
+            routes = self.index.routes_from(airport)
+            if legs + 1 == max_legs:
+                # The last leg has to land at the destination
+                routes = {destination: routes[destination]} if destination in routes else {}
+            # Copied in one step: new routes may be added on the event loop while this runs in the threadpool
+            for arrival_airport, route in list(routes.items()):
+                if arrival_airport in visited:
+                    continue
+                for record in route.departing_from(earliest):
+                    if record.departure_time >= latest:
+                        break
+                    if usable(record):
+                        heapq.heappush(heap, (record.arrival_time, next(tie), legs + 1, (record, path)))
+
+        push(origin, departure_from, departure_to, None, 0, frozenset((origin,)))
+        settled: Dict[Tuple[str, int], Tuple[int, datetime]] = {}
+        found: List[Itinerary] = []
+        while heap and len(found) < limit:
+            arrival, _, legs, path = heapq.heappop(heap)
+            airport = path[0].arrival_airport
+            if airport == destination:
+                found.append(Itinerary(_legs(path)))
+                continue
+            if legs == max_legs:
+                continue
+            # A label with fewer legs can still go further, so it is not dominated by an earlier one with more
+            key = (airport, legs)
+            earliest, latest = arrival + self.min_connection_at(airport), arrival + self.max_layover
+            times, covered = settled.get(key, (0, None))
+            if times >= limit:
+                # Departures up to ``covered`` were offered to earlier arrivals already
+                earliest = max(earliest, covered)
+                if earliest >= latest:
+                    continue
+            settled[key] = (times + 1, latest)
+            visited = frozenset(record.departure_airport for record in _legs(path)) | {airport}
+            push(airport, earliest, latest, path, legs, visited)
+        return found
+
+    def earliest_arrival(self, origin: str, destination: str, departure_from: datetime, departure_to: datetime,
+                         max_legs: int = CONNECTION_MAX_LEGS, seats: int = 1) -> Optional[Itinerary]:
+        found = self.search(origin, destination, departure_from, departure_to, 1, max_legs, seats)
+        return found[0] if found else None
+
+
+connection_finder = ConnectionFinder()
@@ -2,25 +2,73 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.core.database import get_db
-from app.core.auth import verify_token
+from app.core.database import get_db, replica_router
+from app.core.auth import ADMIN_USERNAMES, AUTH_MODE, decode_token
 from app.core.user_models import User
+from app.core.unit_of_work import UnitOfWork
+from app.core.flight_cache import BYPASS_CACHE
+from app.core.loader import enable_batch_loading
+from app.core.principal_cache import principal_cache
+from app.core.revocation import revocation_list
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+def get_unit_of_work(db: AsyncSession = Depends(get_db)) -> UnitOfWork:
+    """One unit of work per request, shared by every service built for it"""
+    return UnitOfWork(db)
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
-    username = verify_token(token)
+    claims = decode_token(token)
+    if revocation_list.is_revoked(claims):
+        raise _credentials_exception()
+    username = claims["sub"]
+    if AUTH_MODE == "stateless" and "uid" in claims:
+        # The token is the principal; tokens issued before stateless mode fall through
+        return User(id=claims["uid"], username=username, is_active=claims.get("active", True))
+    # Cached principals need no query; the session only connects on a miss
+    user = await principal_cache.get(username)
+    if user is not None:
+        return user
     result = await db.execute(select(User).where(User.username == username))
     user = result.scalar_one_or_none()
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _credentials_exception()
+    await principal_cache.put(user)
     return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
\ No newline at end of file
+    return current_user
+
+async def get_current_admin_user(current_user: User = Depends(get_current_active_user)):
+    if current_user.username not in ADMIN_USERNAMES:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
+    return current_user
+
+async def get_read_db(db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_active_user)):
+    """Session for read-only routes: a healthy replica, or the primary when pinned or lagging"""
+    replica = await replica_router.choose(current_user.username)
+    if replica is None:
+        if replica_router.is_pinned(current_user.username):
+            # A client reading its own writes skips the per-process caches too
+            db.info[BYPASS_CACHE] = True
+        yield db
+        return
+    async with replica.session_factory() as session:
+        enable_batch_loading(session)
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def pin_to_primary(current_user: User = Depends(get_current_active_user)):
+    """Route this user's reads to the primary for a while after a write"""
+    replica_router.pin(current_user.username)
@@ -0,0 +1,196 @@
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+FLIGHT_CACHE_SIZE = int(os.getenv("FLIGHT_CACHE_SIZE") or 4096)
+FLIGHT_CACHE_TTL_SECONDS = float(os.getenv("FLIGHT_CACHE_TTL_SECONDS") or 300)
+FLIGHT_SEAT_COUNT_TTL_SECONDS = float(os.getenv("FLIGHT_SEAT_COUNT_TTL_SECONDS") or 1)
+
+# Session.info key: reads on this session go to the database and refill the cache
+BYPASS_CACHE = "bypass_flight_cache"
+
+# Flight columns that only change through an explicit reschedule; available_seats
+# is cached separately with its own, much shorter TTL
+SCHEDULE_FIELDS = (
+    "flight_id",
+    "departure_airport",
+    "arrival_airport",
+    "departure_time",
+    "arrival_time",
+    "aircraft_type",
+    "total_seats",
+    "status",
+)
+
+
+@dataclass
+class _Entry:
+    schedule: Dict[str, Any]
+    schedule_expires: float
+    available_seats: Optional[int] = None
+    seats_expires: float = float("-inf")
+
+
+class FlightCache:
+    """Per-process read-through cache of flight rows, in front of the flight repositories.
+
+    The schedule part of a flight is kept for ``ttl`` seconds and its seat count
+    for ``seat_ttl`` seconds, so a stale seat count never outlives the schedule
+    and a seat count miss costs a one-column SELECT instead of the whole row.
+    At most ``capacity`` flights are kept, least recently used first out.
+    Writers in this process invalidate explicitly; other workers see a change
+    within the TTLs. Only found flights are cached, so creating a flight never
+    has to fight a cached miss.
+    """
+
+    def __init__(self, capacity: int = FLIGHT_CACHE_SIZE, ttl: float = FLIGHT_CACHE_TTL_SECONDS,
+                 seat_ttl: float = FLIGHT_SEAT_COUNT_TTL_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.seat_ttl = min(seat_ttl, ttl)
+        self.clock = clock
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.schedule_hits = 0
+        self.schedule_misses = 0
+        self.seat_hits = 0
+        self.seat_misses = 0
+        self.evictions = 0
+
+    def get_schedule(self, flight_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(flight_id)
+        if entry is None or entry.schedule_expires <= self.clock():
+            self._entries.pop(flight_id, None)
+            self.schedule_misses += 1
+            return None
+        self._entries.move_to_end(flight_id)
+        self.schedule_hits += 1
+        return entry.schedule
+
+    def get_available_seats(self, flight_id: str) -> Optional[int]:
+        entry = self._entries.get(flight_id)
+        if entry is None or entry.seats_expires <= self.clock():
+            self.seat_misses += 1
+            return None
+        self.seat_hits += 1
+        return entry.available_seats
+
+    def put(self, flight: Any) -> None:
+        """Cache a loaded flight row, schedule and seat count together"""
+        now = self.clock()
+        self._entries[flight.flight_id] = _Entry(
+            schedule={field: getattr(flight, field) for field in SCHEDULE_FIELDS},
+            schedule_expires=now + self.ttl,
+            available_seats=flight.available_seats,
+            seats_expires=now + self.seat_ttl,
+        )
+        self._entries.move_to_end(flight.flight_id)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def put_available_seats(self, flight_id: str, available_seats: int) -> None:
+        entry = self._entries.get(flight_id)
+        if entry is not None:
+            entry.available_seats = available_seats
+            entry.seats_expires = min(self.clock() + self.seat_ttl, entry.schedule_expires)
+
+    def invalidate(self, flight_id: str) -> None:
+        self._entries.pop(flight_id, None)
+
+    def invalidate_seats(self, flight_ids: Iterable[str]) -> None:
+        for flight_id in flight_ids:
+            entry = self._entries.get(flight_id)
+            if entry is not None:
+                entry.seats_expires = float("-inf")
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.schedule_hits = self.schedule_misses = self.seat_hits = self.seat_misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        lookups = self.schedule_hits + self.schedule_misses
+        return {
+            "flights": len(self._entries),
+            "capacity": self.capacity,
+            "ttl_seconds": self.ttl,
+            "seat_ttl_seconds": self.seat_ttl,
+            "hits": self.schedule_hits,
+            "misses": self.schedule_misses,
+            "seat_count_hits": self.seat_hits,
+            "seat_count_misses": self.seat_misses,
+            "evictions": self.evictions,
+            # Lookups answered without any flight SELECT
+            "hit_ratio": (self.seat_hits / lookups) if lookups else 0.0,
+        }
+
+
+flight_cache = FlightCache()
+
+
+async def read_through_many(session: AsyncSession, flight_model, flight_ids: List[str],
+                            cache: FlightCache = flight_cache) -> Dict[str, Any]:
+    """Found flights by id like ``read_through``, with one SELECT for every flight missing from
+    the cache and one for every stale seat count"""
+    found: Dict[str, Any] = {}
+    missing: List[str] = []
+    stale: Dict[str, Dict[str, Any]] = {}
+    bypass = session.info.get(BYPASS_CACHE)
+    for flight_id in flight_ids:
+        schedule = None if bypass else cache.get_schedule(flight_id)
+        if schedule is None:
+            missing.append(flight_id)
+            continue
+        available_seats = cache.get_available_seats(flight_id)
+        if available_seats is None:
+            stale[flight_id] = schedule
+        else:
+            found[flight_id] = flight_model(**schedule, available_seats=available_seats)
+
+    if missing:
+        result = await session.execute(select(flight_model).where(flight_model.flight_id.in_(missing)))
+        for flight in result.scalars():
+            cache.put(flight)
+            found[flight.flight_id] = flight
+    if stale:
+        result = await session.execute(
+            select(flight_model.flight_id, flight_model.available_seats).where(flight_model.flight_id.in_(list(stale)))
+        )
+        seat_counts = dict(result.all())
+        for flight_id, schedule in stale.items():
+            if flight_id not in seat_counts:
+                cache.invalidate(flight_id)
+                continue
+            cache.put_available_seats(flight_id, seat_counts[flight_id])
+            found[flight_id] = flight_model(**schedule, available_seats=seat_counts[flight_id])
+    return found
+
+
+async def read_through(session: AsyncSession, flight_model, flight_id: str, cache: FlightCache = flight_cache):
+    """Flight by id from the cache, loading what is missing or expired.
+
+    A cached flight comes back as a new, transient ``flight_model`` instance:
+    good for reading, not for changing the row through the session.
+    """
+    schedule = None if session.info.get(BYPASS_CACHE) else cache.get_schedule(flight_id)
+    if schedule is None:
+        result = await session.execute(select(flight_model).where(flight_model.flight_id == flight_id))
+        flight = result.scalar_one_or_none()
+        if flight is not None:
+            cache.put(flight)
+        return flight
+
+    available_seats = cache.get_available_seats(flight_id)
+    if available_seats is None:
+        available_seats = await session.scalar(
+            select(flight_model.available_seats).where(flight_model.flight_id == flight_id)
+        )
+        if available_seats is None:
+            cache.invalidate(flight_id)
+            return None
+        cache.put_available_seats(flight_id, available_seats)
+    return flight_model(**schedule, available_seats=available_seats)
@@ -0,0 +1,123 @@
+import os
+import time
+from datetime import datetime, timezone
+
+# Snowflake layout: 41 bits of milliseconds since EPOCH_MS, 10 bits of worker ID,
+# 12 bits of per-millisecond sequence. IDs are time ordered and unique per worker
+# without any coordination through the database.
+TIMESTAMP_BITS = 41
+WORKER_ID_BITS = 10
+SEQUENCE_BITS = 12
+
+MAX_WORKER_ID = (1 << WORKER_ID_BITS) - 1
+SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+TIMESTAMP_SHIFT = WORKER_ID_BITS + SEQUENCE_BITS
+
+# 2024-01-01T00:00:00Z; 41 bits of milliseconds last until 2093
+EPOCH_MS = 1704067200000
+
+# Crockford base32: digits and uppercase letters without I, L, O and U, so encoded
+# IDs are case-insensitive, unambiguous when read aloud and fit the uppercase
+# alphanumeric fields of IATA BCBP barcodes
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ENCODED_LENGTH = 13  # ceil(63 / 5)
+_DECODE = {c: i for i, c in enumerate(ALPHABET)}
+_DECODE.update({c.lower(): i for c, i in list(_DECODE.items())})
+_DECODE.update({"O": 0, "o": 0, "I": 1, "i": 1, "L": 1, "l": 1})
+
+
+class SnowflakeGenerator:
+    """Time-ordered 63-bit ID generator for one worker.
+
+    ``next_id`` has no await points, so calls from the event loop never
+    interleave and no lock is needed; give each thread or process its own
+    generator with a distinct worker ID. When the sequence of a millisecond
+    runs out, or the wall clock steps back, the generator keeps counting on
+    its own logical clock instead of blocking, so IDs stay unique and ordered.
+    """
+
+    def __init__(self, worker_id: int, epoch_ms: int = EPOCH_MS):
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}")
+        self.worker_id = worker_id
+        self.epoch_ms = epoch_ms
+        self._worker_bits = worker_id << SEQUENCE_BITS
+        self._last_ms = -1
+        self._sequence = 0
+
+    def next_id(self) -> int:
+        now_ms = time.time_ns() // 1_000_000 - self.epoch_ms
+        if now_ms > self._last_ms:
+            self._last_ms = now_ms
+            self._sequence = 0
+        else:
+            self._sequence = (self._sequence + 1) & SEQUENCE_MASK
+            if self._sequence == 0:
+                self._last_ms += 1
+        return (self._last_ms << TIMESTAMP_SHIFT) | self._worker_bits | self._sequence
+
+
+def encode_id(value: int) -> str:
+    """Fixed-width Crockford base32, so encoded IDs sort like the integers"""
+    chars = []
+    for _ in range(ENCODED_LENGTH):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    if value:
+        raise ValueError("ID does not fit in 63 bits")
+    return "".join(reversed(chars))
+
+
+def decode_id(encoded: str) -> int:
+    value = 0
+    for char in encoded:
+        if char == "-":
+            continue
+        try:
+            value = (value << 5) | _DECODE[char]
+        except KeyError:
+            raise ValueError(f"Invalid character {char!r} in encoded ID")
+    return value
+
+
+def id_timestamp(value: int, epoch_ms: int = EPOCH_MS) -> datetime:
+    """When an ID was generated (UTC); handy when tracing a boarding pass"""
+    return datetime.fromtimestamp(((value >> TIMESTAMP_SHIFT) + epoch_ms) / 1000, tz=timezone.utc)
+
+
+def id_worker(value: int) -> int:
+    return (value >> SEQUENCE_BITS) & MAX_WORKER_ID
+
+
+def default_worker_id() -> int:
+    """ID_WORKER_ID, or the process ID folded into the worker range.
+
+    PIDs are only unique on one host and fold onto each other modulo 1024, so
+    deployments running several hosts or many workers per host should set
+    ID_WORKER_ID explicitly for every process.
+    """
+    value = os.getenv("ID_WORKER_ID")
+    if value not in (None, ""):
+        return int(value)
+    return os.getpid() & MAX_WORKER_ID
+
+
+_generator = SnowflakeGenerator(default_worker_id())
+
+
+def _reset_after_fork() -> None:
+    # Forked workers (e.g. a preloading process manager) must not share the parent's worker ID
+    global _generator
+    _generator = SnowflakeGenerator(default_worker_id())
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def next_id() -> int:
+    return _generator.next_id()
+
+
+def next_encoded_id() -> str:
+    return encode_id(_generator.next_id())
@@ -0,0 +1,145 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, TypeVar
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# Session.info key: the loaders of the request the session serves. Sessions
+# without them (scripts, tests) load one row per get_by_id as before
+LOADERS = "batch_loaders"
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+Fetch = Callable[[List[K]], Awaitable[Dict[K, V]]]
+
+
+class BatchLoader(Generic[K, V]):
+    """Coalesces the loads issued in one event-loop tick into one ``fetch`` and memoizes the results.
+
+    ``fetch`` gets the distinct keys not loaded yet and returns what it found by
+    key; keys it leaves out load as None. Loads of several loaders sharing a
+    ``lock`` take turns, since a session runs one statement at a time.
+    """
+
+    def __init__(self, fetch: Fetch, lock: Optional[asyncio.Lock] = None):
+        self.fetch = fetch
+        self._lock = lock or asyncio.Lock()
+        self._memo: Dict[K, asyncio.Future] = {}
+        self._pending: Dict[K, asyncio.Future] = {}
+
+    def _future(self, key: K) -> asyncio.Future:
+        future = self._memo.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                # Runs once every task already scheduled in this tick has had its turn
+                loop.call_soon(lambda: loop.create_task(self._dispatch()))
+            future = self._memo[key] = self._pending[key] = loop.create_future()
+        return future
+
+    async def load(self, key: K) -> Optional[V]:
+        # Shielded: a cancelled caller must not cancel the load for everyone else waiting on it
+        return await asyncio.shield(self._future(key))
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        return list(await asyncio.shield(asyncio.gather(*(self._future(key) for key in keys))))
+
+    async def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        try:
+            async with self._lock:
+                found = await self.fetch(list(batch))
+        except Exception as e:
+            for key, future in batch.items():
+                self._memo.pop(key, None)
+                future.set_exception(e)
+            return
+        for key, future in batch.items():
+            future.set_result(found.get(key))
+
+    def clear(self) -> None:
+        """Forget loaded results; loads still in flight are kept"""
+        self._memo = {key: future for key, future in self._memo.items() if not future.done()}
+
+
+class Loaders:
+    """The loaders of one session, one per key column, taking turns on it"""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self._loaders: Dict[str, BatchLoader] = {}
+
+    def get(self, name: str, fetch: Fetch) -> BatchLoader:
+        loader = self._loaders.get(name)
+        if loader is None:
+            loader = self._loaders[name] = BatchLoader(fetch, self.lock)
+        return loader
+
+    def clear(self) -> None:
+        for loader in self._loaders.values():
+            loader.clear()
+
+
+def enable_batch_loading(session: AsyncSession) -> None:
+    session.info[LOADERS] = Loaders()
+
+
+def fetch_by(session: AsyncSession, column) -> Fetch:
+    """Fetch for rows of ``column``'s entity by that column, one IN query per batch"""
+    entity = column.class_
+
+    async def fetch(keys: List[Any]) -> Dict[Any, Any]:
+        result = await session.execute(select(entity).where(column.in_(keys)))
+        return {getattr(row, column.key): row for row in result.scalars()}
+
+    return fetch
+
+
+def batch_loader(session: AsyncSession, column, fetch: Optional[Fetch] = None) -> Optional[BatchLoader]:
+    """The session's loader by ``column``, fetching with ``fetch_by`` unless given; None without batch loading"""
+    loaders = session.info.get(LOADERS)
+    if not isinstance(loaders, Loaders):
+        return None
+    return loaders.get(f"{column.class_.__tablename__}.{column.key}", fetch or fetch_by(session, column))
+
+
+async def load_many(session: AsyncSession, column, keys: Iterable[Any], fetch: Optional[Fetch] = None) -> Dict[Any, Any]:
+    """Found rows by key, through the session's loader or else one IN query"""
+    keys = list(dict.fromkeys(keys))
+    loader = batch_loader(session, column, fetch)
+    if loader is not None:
+        return {key: row for key, row in zip(keys, await loader.load_many(keys)) if row is not None}
+    return await (fetch or fetch_by(session, column))(keys) if keys else {}
+
+
+# Anything the session writes may change what was loaded, and committed or
+# rolled back instances expire, so every loader starts over
+
+
+def _forget_loaded(session: Session) -> None:
+    loaders = session.info.get(LOADERS)
+    if loaders is not None:
+        loaders.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _forget_after_flush(session, flush_context):
+    _forget_loaded(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_after_commit(session):
+    _forget_loaded(session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_after_rollback(session, previous_transaction):
+    _forget_loaded(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _forget_before_write(orm_execute_state):
+    if not orm_execute_state.is_select:
+        _forget_loaded(orm_execute_state.session)
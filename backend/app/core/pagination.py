@@ -0,0 +1,56 @@
+import base64
+import binascii
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, List, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE") or 100)
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE") or 500)
+# Most ids one bulk read may ask for
+MAX_BULK_IDS = int(os.getenv("MAX_BULK_IDS") or 500)
+
+# Response header carrying the cursor of the next page; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Keyset position: the sort key of the last row of a page, (timestamp, id)
+Position = Tuple[datetime, str]
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(kind: str, position: Position) -> str:
+    """Opaque cursor for the position; ``kind`` keeps one listing's cursors out of another"""
+    moment, key = position
+    raw = json.dumps([kind, moment.isoformat(), key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(kind: str, cursor: Optional[str]) -> Optional[Position]:
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_kind, moment, key = json.loads(raw)
+        if cursor_kind != kind or not isinstance(key, str):
+            raise ValueError(cursor_kind)
+        return datetime.fromisoformat(moment), key
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def paginate(kind: str, rows: list, limit: int, position_of) -> Page:
+    """Page of ``rows``, fetched with ``limit + 1`` so the extra row tells whether there is a next page"""
+    if len(rows) <= limit:
+        return Page(items=rows)
+    rows = rows[:limit]
+    return Page(items=rows, next_cursor=encode_cursor(kind, position_of(rows[-1])))
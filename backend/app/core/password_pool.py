@@ -0,0 +1,86 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+# bcrypt releases the GIL while hashing, so threads run it in parallel with the event loop
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS") or 4)
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE") or 256)
+
+T = TypeVar("T")
+
+
+class PasswordPool:
+    """Runs password hashing and verification in a bounded thread pool.
+
+    At most ``workers`` hashes run at once; up to ``max_queue`` more wait their
+    turn and anything beyond that is refused with 503, so a login storm queues
+    in front of the pool instead of stalling every request on the event loop.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_queue: int = PASSWORD_HASH_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.active = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent logins, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password")
+            self._semaphore = asyncio.Semaphore(self.workers)
+        queued_at = time.perf_counter()
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        started = time.perf_counter()
+        self.wait_seconds += started - queued_at
+        self.active += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            self.completed += 1
+            self.run_seconds += time.perf_counter() - started
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._semaphore = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": (self.wait_seconds / self.completed * 1000) if self.completed else 0.0,
+            "avg_run_ms": (self.run_seconds / self.completed * 1000) if self.completed else 0.0,
+        }
+
+
+password_pool = PasswordPool()
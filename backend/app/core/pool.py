@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Upper bounds (ms) of the acquire latency histogram buckets; the last bucket is +Inf
+ACQUIRE_LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection pool configuration, read from DB_POOL_* environment variables"""
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    pool_timeout: float = 10.0
+    statement_cache_size: int = 100
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        return cls(
+            pool_size=_env_int("DB_POOL_SIZE", cls.pool_size),
+            max_overflow=_env_int("DB_MAX_OVERFLOW", cls.max_overflow),
+            pool_recycle=_env_int("DB_POOL_RECYCLE", cls.pool_recycle),
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", cls.pool_pre_ping),
+            pool_timeout=_env_float("DB_POOL_TIMEOUT", cls.pool_timeout),
+            statement_cache_size=_env_int("DB_STATEMENT_CACHE_SIZE", cls.statement_cache_size),
+        )
+
+    def engine_kwargs(self, database_url: str) -> dict:
+        """Keyword arguments for create_async_engine for the given URL"""
+        url = make_url(database_url)
+        if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+            # In-memory SQLite lives in a single connection, let the dialect pick its pool
+            return {}
+
+        kwargs = {
+            "poolclass": InstrumentedAsyncPool,
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+            "pool_timeout": self.pool_timeout,
+        }
+        if url.get_driver_name() == "asyncpg":
+            kwargs["connect_args"] = {"statement_cache_size": self.statement_cache_size}
+        return kwargs
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class PoolMetrics:
+    """Counters and acquire latency histogram for one connection pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.max_waiting = 0
+        self.acquire_time_total = 0.0
+        self.acquire_time_max = 0.0
+        self.buckets = [0] * (len(ACQUIRE_LATENCY_BUCKETS_MS) + 1)
+
+    def acquire_started(self) -> None:
+        with self._lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def acquire_failed(self, timed_out: bool = False) -> None:
+        with self._lock:
+            self.waiting -= 1
+            if timed_out:
+                self.timeouts += 1
+
+    def acquire_finished(self, elapsed: float) -> None:
+        with self._lock:
+            self.waiting -= 1
+            self.acquired += 1
+            self.acquire_time_total += elapsed
+            self.acquire_time_max = max(self.acquire_time_max, elapsed)
+            self.buckets[bisect_left(ACQUIRE_LATENCY_BUCKETS_MS, elapsed * 1000)] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            histogram = {
+                f"le_{bound}ms": count
+                for bound, count in zip(ACQUIRE_LATENCY_BUCKETS_MS, self.buckets)
+            }
+            histogram["le_inf"] = self.buckets[-1]
+            avg = self.acquire_time_total / self.acquired if self.acquired else 0.0
+            return {
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "acquired": self.acquired,
+                "timeouts": self.timeouts,
+                "acquire_ms_avg": round(avg * 1000, 3),
+                "acquire_ms_max": round(self.acquire_time_max * 1000, 3),
+                "acquire_ms_histogram": histogram,
+            }
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout waits and latency"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        self.metrics.acquire_started()
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.acquire_failed(timed_out=True)
+            raise
+        except Exception:
+            self.metrics.acquire_failed()
+            raise
+        self.metrics.acquire_finished(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def pool_stats(engine, settings: Optional[PoolSettings] = None) -> dict:
+    """Live statistics for the pool behind an (async) engine"""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    if settings is not None:
+        stats["settings"] = settings.as_dict()
+    return stats
@@ -0,0 +1,208 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.user_models import User
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE") or 10000)
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS") or 60)
+# redis://host:6379/0 shares the cache, and its invalidations, across workers
+PRINCIPAL_CACHE_URL = os.getenv("PRINCIPAL_CACHE_URL")
+
+# What authorization needs from a user; the password hash never enters the cache
+PRINCIPAL_FIELDS = ("id", "username", "email", "is_active")
+
+Principal = Dict[str, Any]
+
+
+class PrincipalBackend(ABC):
+    @abstractmethod
+    async def get(self, username: str) -> Optional[Principal]:
+        pass
+
+    @abstractmethod
+    async def set(self, username: str, principal: Principal, ttl: float) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, username: str) -> None:
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        pass
+
+
+class MemoryPrincipalBackend(PrincipalBackend):
+    """Per-process LRU with expiry; invalidations reach only this worker"""
+
+    def __init__(self, capacity: int = PRINCIPAL_CACHE_SIZE, clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+
+    async def get(self, username: str) -> Optional[Principal]:
+        entry = self._entries.get(username)
+        if entry is None:
+            return None
+        expires, principal = entry
+        if expires <= self.clock():
+            del self._entries[username]
+            return None
+        self._entries.move_to_end(username)
+        return principal
+
+    async def set(self, username: str, principal: Principal, ttl: float) -> None:
+        self._entries[username] = (self.clock() + ttl, principal)
+        self._entries.move_to_end(username)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    async def delete(self, username: str) -> None:
+        self._entries.pop(username, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisPrincipalBackend(PrincipalBackend):
+    """Shared by every worker pointing at the same Redis; bounded by its maxmemory policy"""
+
+    def __init__(self, url: str, prefix: str = "principal:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("PRINCIPAL_CACHE_URL is set but the redis package is not installed") from e
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, username: str) -> Optional[Principal]:
+        value = await self.client.get(self.prefix + username)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, username: str, principal: Principal, ttl: float) -> None:
+        await self.client.set(self.prefix + username, json.dumps(principal), px=int(ttl * 1000))
+
+    async def delete(self, username: str) -> None:
+        await self.client.delete(self.prefix + username)
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=self.prefix + "*"):
+            await self.client.delete(key)
+
+
+class PrincipalCache:
+    """Authenticated users by token subject, so identity costs no query per request.
+
+    Entries live for ``ttl`` seconds. Committed ORM changes to a user (deactivation,
+    rename, deletion) invalidate its entry; bulk UPDATEs on users bypass the ORM
+    and must call ``invalidate`` themselves.
+    """
+
+    def __init__(self, backend: PrincipalBackend, ttl: float = PRINCIPAL_CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def get(self, username: str) -> Optional[User]:
+        try:
+            principal = await self.backend.get(username)
+        except Exception as e:
+            # A cache outage costs a query, not the request
+            self.errors += 1
+            logger.warning(f"Principal cache read failed: {str(e)}")
+            principal = None
+        if principal is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return User(**principal)
+
+    async def put(self, user: User) -> None:
+        try:
+            await self.backend.set(user.username, {field: getattr(user, field) for field in PRINCIPAL_FIELDS}, self.ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Principal cache write failed: {str(e)}")
+
+    async def invalidate(self, username: str) -> None:
+        await self.backend.delete(username)
+
+    def invalidate_soon(self, usernames: Iterable[str]) -> None:
+        """Invalidate from synchronous code, such as session events, on the running loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        for username in usernames:
+            task = loop.create_task(self.invalidate(username))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        stats = {
+            "backend": type(self.backend).__name__,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+        if isinstance(self.backend, MemoryPrincipalBackend):
+            stats["users"] = len(self.backend)
+            stats["capacity"] = self.backend.capacity
+        return stats
+
+
+def backend_from_env() -> PrincipalBackend:
+    if PRINCIPAL_CACHE_URL:
+        return RedisPrincipalBackend(PRINCIPAL_CACHE_URL)
+    return MemoryPrincipalBackend()
+
+
+principal_cache = PrincipalCache(backend_from_env())
+
+# Usernames of users changed in a session, invalidated once the change commits
+_CHANGED_USERS = "changed_users"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = session.info.setdefault(_CHANGED_USERS, set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            changed.add(obj.username)
+            # A rename also drops the entry under the old name
+            changed.update(inspect(obj).attrs.username.history.deleted or ())
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    changed = session.info.pop(_CHANGED_USERS, None)
+    if changed:
+        principal_cache.invalidate_soon(changed)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_changed_users(session, previous_transaction):
+    session.info.pop(_CHANGED_USERS, None)
@@ -0,0 +1,192 @@
+import asyncio
+import csv
+import json
+import math
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import get_password_hash
+from app.core.auth_schemas import BulkProvisionReport, ProvisionIssue, UserCreate
+from app.core.upsert import insert_for
+from app.core.user_models import User
+
+PROVISIONING_BATCH_SIZE = int(os.getenv("PROVISIONING_BATCH_SIZE") or 500)
+# Processes hashing passwords during bulk provisioning; bcrypt is CPU-bound
+PROVISIONING_HASH_PROCESSES = int(os.getenv("PROVISIONING_HASH_PROCESSES") or os.cpu_count() or 1)
+
+FORMATS = ("csv", "jsonl")
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hash a chunk of passwords; runs in a worker process"""
+    return [get_password_hash(password) for password in passwords]
+
+
+async def parse_users(lines: AsyncIterable[str], fmt: str) -> AsyncIterator[Tuple[int, Optional[UserCreate], Optional[str]]]:
+    """(line number, user, error) per data line of a CSV (with a header) or JSONL stream.
+
+    CSV records must fit on one line; quoted fields may not contain newlines.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    header = None
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            if fmt == "jsonl":
+                data = json.loads(line)
+            elif header is None:
+                header = [field.strip() for field in next(csv.reader([line]))]
+                continue
+            else:
+                data = dict(zip(header, next(csv.reader([line]))))
+            yield line_number, UserCreate(**data), None
+        except (ValueError, TypeError) as e:
+            # ValidationError and JSONDecodeError are both ValueErrors
+            reason = "; ".join(error["msg"] for error in e.errors()) if isinstance(e, ValidationError) else str(e)
+            yield line_number, None, reason
+
+
+class HashPool:
+    """The worker processes bulk provisioning hashes passwords in, shared by every import.
+
+    Created on first use and shut down with the app, so a request neither
+    forks its own workers nor blocks the event loop waiting for them to exit.
+    """
+
+    def __init__(self, processes: int = PROVISIONING_HASH_PROCESSES):
+        self.processes = processes
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.processes)
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hash_pool = HashPool()
+
+
+class UserProvisioner:
+    """Creates users from a stream in batches: one duplicate check, parallel hashing
+    and one multi-row INSERT per batch, committed batch by batch.
+
+    Duplicates (within the stream or against existing users) and invalid rows are
+    collected in the report instead of failing the import.
+    """
+
+    def __init__(self, session: AsyncSession, executor: Executor, processes: int = PROVISIONING_HASH_PROCESSES,
+                 batch_size: int = PROVISIONING_BATCH_SIZE):
+        self.session = session
+        self.executor = executor
+        self.processes = processes
+        self.batch_size = batch_size
+        self.report = BulkProvisionReport()
+        self._usernames: Dict[str, int] = {}
+        self._emails: Dict[str, int] = {}
+
+    async def run(self, lines: AsyncIterable[str], fmt: str) -> BulkProvisionReport:
+        batch: List[Tuple[int, UserCreate]] = []
+        async for line_number, user, error in parse_users(lines, fmt):
+            if error is not None:
+                self.report.invalid.append(ProvisionIssue(line=line_number, reason=error))
+                continue
+            if self._seen_in_stream(line_number, user):
+                continue
+            batch.append((line_number, user))
+            if len(batch) >= self.batch_size:
+                await self._insert_batch(batch)
+                batch = []
+        if batch:
+            await self._insert_batch(batch)
+        return self.report
+
+    def _seen_in_stream(self, line_number: int, user: UserCreate) -> bool:
+        email = str(user.email)
+        for key, seen, field in ((user.username, self._usernames, "username"), (email, self._emails, "email")):
+            if key in seen:
+                self._duplicate(line_number, user, f"{field} repeats line {seen[key]}")
+                return True
+        self._usernames[user.username] = line_number
+        self._emails[email] = line_number
+        return False
+
+    def _duplicate(self, line_number: int, user: UserCreate, reason: str) -> None:
+        self.report.duplicates.append(ProvisionIssue(line=line_number, username=user.username, reason=reason))
+
+    async def _insert_batch(self, batch: List[Tuple[int, UserCreate]]) -> None:
+        usernames = [user.username for _, user in batch]
+        emails = [str(user.email) for _, user in batch]
+        result = await self.session.execute(
+            select(User.username, User.email).where(or_(User.username.in_(usernames), User.email.in_(emails)))
+        )
+        taken_usernames, taken_emails = set(), set()
+        for username, email in result:
+            taken_usernames.add(username)
+            taken_emails.add(email)
+
+        new = []
+        for line_number, user in batch:
+            if user.username in taken_usernames:
+                self._duplicate(line_number, user, "username exists")
+            elif str(user.email) in taken_emails:
+                self._duplicate(line_number, user, "email exists")
+            else:
+                new.append((line_number, user))
+        if not new:
+            return
+
+        hashes = await self._hash([user.password for _, user in new])
+        # Rows created concurrently since the SELECT are skipped, not fatal
+        stmt = insert_for(self.session, User).values([
+            {"username": user.username, "email": str(user.email), "hashed_password": hashed, "is_active": True}
+            for (_, user), hashed in zip(new, hashes)
+        ]).on_conflict_do_nothing().returning(User.username)
+        created = set((await self.session.execute(stmt)).scalars())
+        await self.session.commit()
+
+        self.report.created += len(created)
+        for line_number, user in new:
+            if user.username not in created:
+                self._duplicate(line_number, user, "created concurrently")
+
+    async def _hash(self, passwords: List[str]) -> List[str]:
+        size = math.ceil(len(passwords) / self.processes)
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, hash_passwords, passwords[i:i + size])
+            for i in range(0, len(passwords), size)
+        ))
+        return [hashed for chunk in chunks for hashed in chunk]
+
+
+async def iterate(lines: Iterable[str]) -> AsyncIterator[str]:
+    for line in lines:
+        yield line
+
+
+async def stream_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decoded lines of a byte stream, such as a request body"""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig")
+    if pending:
+        yield pending.decode("utf-8-sig")
@@ -0,0 +1,121 @@
+import logging
+import time
+from dataclasses import dataclass
+from itertools import count
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+LagProbe = Callable[[AsyncSession], Awaitable[float]]
+
+async def postgres_replication_lag(session: AsyncSession) -> float:
+    """Seconds since the replica last replayed a transaction (0 on a primary or non-Postgres DB)"""
+    if session.bind.dialect.name != "postgresql":
+        return 0.0
+    result = await session.execute(text(
+        "SELECT CASE WHEN pg_is_in_recovery() "
+        "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+        "ELSE 0 END"
+    ))
+    return float(result.scalar() or 0.0)
+
+@dataclass
+class Replica:
+    name: str
+    session_factory: Callable[[], AsyncSession]
+    lag: float = 0.0
+    healthy: bool = True
+    checked_at: float = float("-inf")
+    probing: bool = False
+    reads: int = 0
+
+class ReplicaRouter:
+    """Routes read-only sessions to replicas.
+
+    Clients that just wrote are pinned to the primary for ``pin_seconds`` so they
+    read their own writes, and replicas lagging more than ``max_lag`` seconds (or
+    failing the lag probe) are skipped. ``choose`` returns None when the primary
+    should serve the read.
+    """
+
+    def __init__(self, replicas: List[Replica], max_lag: float = 5.0, pin_seconds: float = 5.0,
+                 lag_check_interval: float = 1.0, lag_probe: LagProbe = postgres_replication_lag):
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.pin_seconds = pin_seconds
+        self.lag_check_interval = lag_check_interval
+        self.lag_probe = lag_probe
+        self._pins: Dict[str, float] = {}
+        self._next = count()
+        self.primary_reads = 0
+        self.pinned_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def pin(self, key: str) -> None:
+        now = time.monotonic()
+        if len(self._pins) > 10000:
+            self._pins = {k: until for k, until in self._pins.items() if until > now}
+        self._pins[key] = now + self.pin_seconds
+
+    def is_pinned(self, key: Optional[str]) -> bool:
+        if key is None:
+            return False
+        until = self._pins.get(key)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            self._pins.pop(key, None)
+            return False
+        return True
+
+    async def choose(self, key: Optional[str] = None) -> Optional[Replica]:
+        if not self.replicas:
+            return None
+        if self.is_pinned(key):
+            self.pinned_reads += 1
+            return None
+
+        start = next(self._next)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            await self._refresh_lag(replica)
+            if replica.healthy and replica.lag <= self.max_lag:
+                replica.reads += 1
+                return replica
+
+        self.primary_reads += 1
+        return None
+
+    async def _refresh_lag(self, replica: Replica) -> None:
+        if replica.probing or time.monotonic() - replica.checked_at < self.lag_check_interval:
+            return
+        replica.probing = True
+        try:
+            async with replica.session_factory() as session:
+                replica.lag = await self.lag_probe(session)
+            replica.healthy = True
+        except Exception as e:
+            logger.warning(f"Replica {replica.name} lag probe failed: {str(e)}")
+            replica.healthy = False
+        finally:
+            replica.checked_at = time.monotonic()
+            replica.probing = False
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [
+                {"name": r.name, "healthy": r.healthy, "lag_seconds": r.lag, "reads": r.reads}
+                for r in self.replicas
+            ],
+            "max_lag_seconds": self.max_lag,
+            "pin_seconds": self.pin_seconds,
+            "pinned_clients": sum(1 for until in self._pins.values() if until > time.monotonic()),
+            "primary_fallback_reads": self.primary_reads,
+            "pinned_reads": self.pinned_reads,
+        }
@@ -0,0 +1,185 @@
+import asyncio
+import calendar
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import delete, event, inspect, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.auth import ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.user_models import TokenRevocation, User
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_REFRESH_SECONDS = float(os.getenv("REVOCATION_REFRESH_SECONDS") or 1)
+# Rows are re-read this long after they were written, in case a lower id committed late
+REVOCATION_LOOKBACK = timedelta(seconds=60)
+
+
+def _timestamp(moment: datetime) -> float:
+    return calendar.timegm(moment.utctimetuple()) + moment.microsecond / 1e6
+
+
+class RevocationList:
+    """Revoked access tokens, held in memory so checking one costs no query.
+
+    Revoked token ids and users are exact dict lookups; entries drop out once
+    every token they could match has expired, so the list stays as small as
+    the revocations of one token lifetime. Other workers' revocations arrive
+    with the next ``refresh``, which reads only rows added since the last one.
+    """
+
+    def __init__(self, interval: float = REVOCATION_REFRESH_SECONDS):
+        self.interval = interval
+        self._tokens: Dict[str, float] = {}  # jti -> expires
+        self._users: Dict[str, float] = {}  # username -> revoked_at
+        self._user_expires: Dict[str, float] = {}
+        self._last_id = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def is_revoked(self, claims: dict) -> bool:
+        if claims.get("jti") in self._tokens:
+            return True
+        revoked_at = self._users.get(claims.get("sub"))
+        # iat has whole seconds, so a token from the second of the revocation counts
+        # as old; tokens without iat predate revocation support and count as old too
+        return revoked_at is not None and claims.get("iat", 0) <= revoked_at
+
+    def add(self, revocation: TokenRevocation) -> None:
+        expires = _timestamp(revocation.expires_at)
+        if revocation.jti:
+            self._tokens[revocation.jti] = expires
+        if revocation.username:
+            revoked_at = _timestamp(revocation.revoked_at)
+            if revoked_at >= self._users.get(revocation.username, float("-inf")):
+                self._users[revocation.username] = revoked_at
+                self._user_expires[revocation.username] = expires
+        if revocation.id:
+            self._last_id = max(self._last_id, revocation.id)
+
+    def prune(self, now: Optional[datetime] = None) -> None:
+        cutoff = _timestamp(now or datetime.utcnow())
+        self._tokens = {jti: expires for jti, expires in self._tokens.items() if expires > cutoff}
+        for username in [u for u, expires in self._user_expires.items() if expires <= cutoff]:
+            del self._users[username]
+            del self._user_expires[username]
+
+    def clear(self) -> None:
+        self._tokens.clear()
+        self._users.clear()
+        self._user_expires.clear()
+        self._last_id = 0
+
+    async def refresh(self, session: AsyncSession) -> int:
+        """Load revocations added since the last refresh; returns how many"""
+        now = datetime.utcnow()
+        result = await session.execute(
+            select(TokenRevocation)
+            .where(
+                or_(TokenRevocation.id > self._last_id, TokenRevocation.revoked_at > now - REVOCATION_LOOKBACK),
+                TokenRevocation.expires_at > now
+            )
+            .order_by(TokenRevocation.id)
+        )
+        revocations = result.scalars().all()
+        for revocation in revocations:
+            self.add(revocation)
+        self.prune(now)
+        return len(revocations)
+
+    async def revoke_token(self, session: AsyncSession, claims: dict) -> None:
+        await self._revoke(session, revocation_for_token(claims))
+
+    async def revoke_user(self, session: AsyncSession, username: str) -> None:
+        """Revoke every token the user holds now; tokens issued afterwards stay valid"""
+        await self._revoke(session, revocation_for_user(username))
+
+    async def _revoke(self, session: AsyncSession, revocation: TokenRevocation) -> None:
+        # Revocations are rare, so they also clear out rows nothing can match any more
+        await session.execute(delete(TokenRevocation).where(TokenRevocation.expires_at <= datetime.utcnow()))
+        session.add(revocation)
+        await session.commit()
+
+    async def run(self, session_factory: Callable[[], AsyncSession]) -> None:
+        while True:
+            try:
+                async with session_factory() as session:
+                    await self.refresh(session)
+            except Exception as e:
+                logger.warning(f"Revocation refresh failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def start(self, session_factory: Callable[[], AsyncSession]) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(session_factory))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+revocation_list = RevocationList()
+
+
+def revocation_for_token(claims: dict) -> TokenRevocation:
+    return TokenRevocation(
+        jti=claims["jti"],
+        revoked_at=datetime.utcnow(),
+        expires_at=datetime.utcfromtimestamp(claims["exp"]),
+    )
+
+
+def revocation_for_user(username: str) -> TokenRevocation:
+    now = datetime.utcnow()
+    return TokenRevocation(
+        username=username,
+        revoked_at=now,
+        expires_at=now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+
+
+# Revocations written in a session, applied to this worker's list once they commit
+_NEW_REVOCATIONS = "new_revocations"
+
+
+@event.listens_for(Session, "before_flush")
+def _revoke_changed_users(session, flush_context, instances):
+    # Stateless tokens carry is_active and the username, so deactivating,
+    # renaming or deleting a user revokes the tokens issued to it so far
+    for user in list(session.dirty) + list(session.deleted):
+        if not isinstance(user, User):
+            continue
+        state = inspect(user)
+        old_names = state.attrs.username.history.deleted
+        deactivated = state.attrs.is_active.history.has_changes() and not user.is_active
+        if user in session.deleted or deactivated or old_names:
+            for username in old_names or [user.username]:
+                session.add(revocation_for_user(username))
+    for obj in session.new:
+        if isinstance(obj, TokenRevocation):
+            session.info.setdefault(_NEW_REVOCATIONS, []).append(obj)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_new_revocations(session):
+    for revocation in session.info.pop(_NEW_REVOCATIONS, ()):
+        # Without its id: rows before it may not have been read by this worker yet
+        revocation_list.add(TokenRevocation(
+            jti=revocation.jti,
+            username=revocation.username,
+            revoked_at=revocation.revoked_at,
+            expires_at=revocation.expires_at,
+        ))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_new_revocations(session, previous_transaction):
+    session.info.pop(_NEW_REVOCATIONS, None)
@@ -0,0 +1,289 @@
+import asyncio
+import heapq
+import logging
+import os
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.models import Flight
+from app.core.pagination import Position
+from app.core.schemas import FlightSearch
+
+logger = logging.getLogger(__name__)
+
+# Seat counts of every indexed flight are reloaded this often, the whole index this many times less often
+ROUTE_INDEX_SEAT_REFRESH_SECONDS = float(os.getenv("ROUTE_INDEX_SEAT_REFRESH_SECONDS") or 5)
+ROUTE_INDEX_REBUILD_EVERY = int(os.getenv("ROUTE_INDEX_REBUILD_EVERY") or 12)
+
+RECORD_FIELDS = (
+    "flight_id",
+    "departure_airport",
+    "arrival_airport",
+    "departure_time",
+    "arrival_time",
+    "aircraft_type",
+    "total_seats",
+    "available_seats",
+    "status",
+)
+
+
+@dataclass(eq=False, slots=True)
+class FlightRecord:
+    """Read-only flight, shaped like the Flight row for FlightResponse"""
+    flight_id: str
+    departure_airport: str
+    arrival_airport: str
+    departure_time: datetime
+    arrival_time: datetime
+    aircraft_type: str
+    total_seats: int
+    available_seats: int
+    status: str
+
+    @classmethod
+    def of(cls, flight) -> "FlightRecord":
+        return cls(*(getattr(flight, field) for field in RECORD_FIELDS))
+
+
+class _Route:
+    """Flights of one origin and destination, sorted by (departure_time, flight_id).
+
+    Copy-on-write: a change builds new lists and swaps them in with one
+    assignment, so a search running in the threadpool while flights commit on
+    the event loop iterates one consistent version of the route.
+    """
+    __slots__ = ("flights",)
+
+    def __init__(self, records: Iterable[FlightRecord] = ()):
+        records = sorted(records, key=lambda record: (record.departure_time, record.flight_id))
+        self.flights: Tuple[List[Position], List[FlightRecord]] = (
+            [(record.departure_time, record.flight_id) for record in records], records
+        )
+
+    def add(self, record: FlightRecord) -> None:
+        self.replace(None, record)
+
+    def remove(self, record: FlightRecord) -> None:
+        self.replace(record, None)
+
+    def replace(self, old: Optional[FlightRecord], new: Optional[FlightRecord]) -> None:
+        """Take ``old`` out and put ``new`` in as one change"""
+        keys, records = self.flights
+        keys, records = list(keys), list(records)
+        if old is not None:
+            i = bisect_left(keys, (old.departure_time, old.flight_id))
+            if i < len(records) and records[i] is old:
+                del keys[i]
+                del records[i]
+        if new is not None:
+            key = (new.departure_time, new.flight_id)
+            i = bisect_left(keys, key)
+            keys.insert(i, key)
+            records.insert(i, new)
+        self.flights = (keys, records)
+
+    def departing_from(self, moment: datetime) -> Iterator[FlightRecord]:
+        keys, records = self.flights
+        return islice(records, bisect_left(keys, (moment, "")), None)
+
+    def from_position(self, after: Optional[Position], start: Optional[datetime]) -> Iterator[FlightRecord]:
+        keys, records = self.flights
+        i = 0
+        if after is not None:
+            # Past the cursor: the first key greater than it
+            i = bisect_left(keys, after)
+            if i < len(keys) and keys[i] == after:
+                i += 1
+        if start is not None:
+            i = max(i, bisect_left(keys, (start, "")))
+        return islice(records, i, None)
+
+
+class RouteIndex:
+    """Upcoming flights in memory, origin -> destination -> departure order, for searches without SQL.
+
+    Holds every flight departing at or after ``horizon``, the time of the last
+    full build, so it answers searches whose ``departure_from`` is at or after
+    the horizon; anything reaching further back goes to the database. Flights
+    committed in this process are applied as they commit and seat counts as the
+    seat count refresher writes them. Changes made by other workers arrive with
+    the periodic seat count reload, or the full rebuild.
+    """
+
+    def __init__(self, interval: float = ROUTE_INDEX_SEAT_REFRESH_SECONDS, rebuild_every: int = ROUTE_INDEX_REBUILD_EVERY):
+        self.interval = interval
+        self.rebuild_every = rebuild_every
+        self.horizon: Optional[datetime] = None
+        self._routes: Dict[str, Dict[str, _Route]] = {}
+        self._flights: Dict[str, FlightRecord] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.horizon is not None
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def covers(self, search: Optional[FlightSearch]) -> bool:
+        return self.ready and search is not None and search.departure_from is not None and search.departure_from >= self.horizon
+
+    def build(self, flights: Iterable, horizon: datetime) -> None:
+        grouped: Dict[str, Dict[str, List[FlightRecord]]] = {}
+        records: Dict[str, FlightRecord] = {}
+        for flight in flights:
+            record = FlightRecord.of(flight)
+            records[record.flight_id] = record
+            grouped.setdefault(record.departure_airport, {}).setdefault(record.arrival_airport, []).append(record)
+        routes = {
+            origin: {destination: _Route(route) for destination, route in destinations.items()}
+            for origin, destinations in grouped.items()
+        }
+        # Swapped in whole, so a search never sees a half-built index
+        self._routes, self._flights, self.horizon = routes, records, horizon
+
+    def upsert(self, record: FlightRecord) -> None:
+        if not self.ready or record.departure_time < self.horizon:
+            return
+        old = self._flights.get(record.flight_id)
+        route = self._routes.setdefault(record.departure_airport, {}).setdefault(record.arrival_airport, _Route())
+        if old is not None and (old.departure_airport, old.arrival_airport) == (record.departure_airport, record.arrival_airport):
+            # Same route: one swap, so a concurrent search sees the old or the new flight, never neither
+            route.replace(old, record)
+        else:
+            self.remove(record.flight_id)
+            route.add(record)
+        self._flights[record.flight_id] = record
+
+    def remove(self, flight_id: str) -> None:
+        record = self._flights.pop(flight_id, None)
+        if record is not None:
+            self._routes[record.departure_airport][record.arrival_airport].remove(record)
+
+    def routes_from(self, airport: str) -> Mapping[str, _Route]:
+        """Routes leaving the airport, by destination"""
+        return self._routes.get(airport, {})
+
+    def set_available_seats(self, counts: Mapping[str, int]) -> None:
+        for flight_id, available_seats in counts.items():
+            record = self._flights.get(flight_id)
+            if record is not None:
+                record.available_seats = available_seats
+
+    def search(self, search: FlightSearch, limit: int, after: Optional[Position] = None) -> List[FlightRecord]:
+        """Up to ``limit`` flights matching ``search`` after the cursor, in (departure_time, flight_id) order"""
+        origins = [search.departure_airport] if search.departure_airport else list(self._routes)
+        routes = []
+        for origin in origins:
+            destinations = self._routes.get(origin, {})
+            if search.arrival_airport:
+                route = destinations.get(search.arrival_airport)
+                routes.extend([route] if route is not None else [])
+            else:
+                routes.extend(destinations.values())
+
+        candidates = [route.from_position(after, search.departure_from) for route in routes]
+        merged = candidates[0] if len(candidates) == 1 else heapq.merge(
+            *candidates, key=lambda record: (record.departure_time, record.flight_id)
+        )
+        found = []
+        for record in merged:
+            if search.departure_to is not None and record.departure_time >= search.departure_to:
+                break
+            if search.status and record.status != search.status:
+                continue
+            found.append(record)
+            if len(found) == limit:
+                break
+        return found
+
+    def clear(self) -> None:
+        self._routes, self._flights, self.horizon = {}, {}, None
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        horizon = datetime.utcnow()
+        result = await session.execute(
+            select(*(getattr(Flight, field) for field in RECORD_FIELDS)).where(Flight.departure_time >= horizon)
+        )
+        self.build(result.all(), horizon)
+
+    async def refresh_seats(self, session: AsyncSession) -> None:
+        result = await session.execute(
+            select(Flight.flight_id, Flight.available_seats).where(Flight.departure_time >= self.horizon)
+        )
+        self.set_available_seats(dict(result.all()))
+
+    async def run(self, session_factory: Callable[[], AsyncSession]) -> None:
+        rounds = 0
+        while True:
+            try:
+                async with session_factory() as session:
+                    if rounds % self.rebuild_every == 0 or not self.ready:
+                        await self.rebuild(session)
+                    else:
+                        await self.refresh_seats(session)
+            except Exception as e:
+                logger.warning(f"Route index refresh failed: {str(e)}")
+            rounds += 1
+            await asyncio.sleep(self.interval)
+
+    def start(self, session_factory: Callable[[], AsyncSession]) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(session_factory))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "horizon": self.horizon.isoformat() if self.horizon else None,
+            "flights": len(self._flights),
+            "routes": sum(len(destinations) for destinations in self._routes.values()),
+        }
+
+
+route_index = RouteIndex()
+
+# Flights written through the ORM in a session, applied to the index once they commit
+_CHANGED_FLIGHTS = "changed_flights"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_flights(session, flush_context):
+    changed = session.info.setdefault(_CHANGED_FLIGHTS, {})
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Flight):
+            # Snapshot now; after the commit the instance may be expired
+            changed[obj.flight_id] = FlightRecord.of(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Flight):
+            changed[obj.flight_id] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changed_flights(session):
+    for flight_id, record in session.info.pop(_CHANGED_FLIGHTS, {}).items():
+        if record is None:
+            route_index.remove(flight_id)
+        else:
+            route_index.upsert(record)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_changed_flights(session, previous_transaction):
+    session.info.pop(_CHANGED_FLIGHTS, None)
@@ -0,0 +1,79 @@
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.models import Base
+from app.core.user_models import User  # Register the users table on Base.metadata
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# verify: refuse to start unless the database is at the head revision (default)
+# migrate: apply pending migrations, for single-instance deployments
+# create: create_all and stamp head, for throwaway local databases
+SCHEMA_MODES = ("verify", "migrate", "create")
+SCHEMA_MODE = os.getenv("DB_SCHEMA_MODE", "verify")
+
+class SchemaVersionError(RuntimeError):
+    """Raised when the database is not at the migration head"""
+    def __init__(self, current: Optional[str], head: str):
+        self.current = current
+        self.head = head
+        super().__init__(
+            f"Database schema is at revision {current or 'none'}, expected {head}; "
+            "run 'alembic upgrade head' before starting the API"
+        )
+
+def alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "migrations"))
+    config.attributes["configure_logger"] = False
+    return config
+
+def head_revision() -> str:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+async def current_revision(engine: AsyncEngine) -> Optional[str]:
+    async with engine.connect() as conn:
+        return await conn.run_sync(lambda sync_conn: MigrationContext.configure(sync_conn).get_current_revision())
+
+async def verify_schema(engine: AsyncEngine) -> str:
+    current = await current_revision(engine)
+    head = head_revision()
+    if current != head:
+        raise SchemaVersionError(current, head)
+    return current
+
+async def _run_command(engine: AsyncEngine, fn, *args) -> None:
+    config = alembic_config()
+    async with engine.connect() as conn:
+        config.attributes["connection"] = conn.sync_connection
+        await conn.run_sync(lambda _: fn(config, *args))
+        await conn.commit()
+
+async def upgrade_schema(engine: AsyncEngine, revision: str = "head") -> None:
+    await _run_command(engine, command.upgrade, revision)
+
+async def prepare_schema(engine: AsyncEngine, mode: str = SCHEMA_MODE) -> None:
+    if mode not in SCHEMA_MODES:
+        raise ValueError(f"DB_SCHEMA_MODE must be one of {', '.join(SCHEMA_MODES)}, got {mode!r}")
+
+    if mode == "migrate":
+        logger.info("Applying database migrations...")
+        await upgrade_schema(engine)
+    elif mode == "create":
+        logger.info("Creating database tables...")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await _run_command(engine, command.stamp, "head")
+
+    revision = await verify_schema(engine)
+    logger.info(f"Database schema at revision {revision}")
@@ -1,8 +1,11 @@
-from pydantic import BaseModel, EmailStr, field_validator, model_validator
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional
+import os
 import re
 
+from app.core.pagination import MAX_BULK_IDS
+
 class FlightCreate(BaseModel):
     flight_id: str
     departure_airport: str
@@ -59,6 +62,44 @@ class FlightResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class FlightSearch(BaseModel):
+    """Filters of GET /api/flights; departure_from is inclusive, departure_to exclusive"""
+    departure_airport: Optional[str] = None
+    arrival_airport: Optional[str] = None
+    departure_from: Optional[datetime] = None
+    departure_to: Optional[datetime] = None
+    status: Optional[str] = None
+    
+    @field_validator('departure_airport', 'arrival_airport')
+    @classmethod
+    def validate_airport(cls, v):
+        return v.upper() if v else None
+    
+    @field_validator('departure_from', 'departure_to')
+    @classmethod
+    def validate_times(cls, v):
+        # Convert timezone-aware to UTC naive
+        if v is not None and v.tzinfo is not None:
+            v = v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+    
+    @model_validator(mode='after')
+    def validate_range(self):
+        if self.departure_from and self.departure_to and self.departure_from >= self.departure_to:
+            raise ValueError('departure_from must be before departure_to')
+        return self
+
+class ItineraryResponse(BaseModel):
+    legs: List[FlightResponse]
+    departure_time: datetime
+    arrival_time: datetime
+    duration_minutes: int
+    connections: int
+    available_seats: int
+
+    class Config:
+        from_attributes = True
+
 class PassengerCreate(BaseModel):
     first_name: str
     last_name: str
@@ -102,12 +143,29 @@ class BookingCreate(BaseModel):
     @classmethod
     def validate_seat(cls, v):
         if v is not None:
-            pattern = r'^[1-9][0-9]?[A-F]$'
+            pattern = r'^[1-9][0-9]{0,2}[A-HJK]$'
             if not re.match(pattern, v.upper()):
                 raise ValueError('Seat must be in format like 12A')
             return v.upper()
         return v
 
+# Most passengers one group booking may hold
+MAX_GROUP_SIZE = int(os.getenv("MAX_GROUP_SIZE") or 9)
+
+class GroupBookingPassenger(BaseModel):
+    passenger_id: str
+    seat_number: Optional[str] = None
+
+    @field_validator('seat_number')
+    @classmethod
+    def validate_seat(cls, v):
+        return BookingCreate.validate_seat(v)
+
+class GroupBookingCreate(BaseModel):
+    """Passengers booked together on one flight; those without a seat_number sit as close together as possible"""
+    flight_id: str
+    passengers: List[GroupBookingPassenger] = Field(min_length=1, max_length=MAX_GROUP_SIZE)
+
 class BookingResponse(BaseModel):
     booking_id: str
     flight_id: str
@@ -123,6 +181,10 @@ class CheckinRequest(BaseModel):
     booking_id: str
     passenger_id: str
 
+class GroupCheckinRequest(BaseModel):
+    """Bookings of one party checked in together, all or none"""
+    checkins: List[CheckinRequest] = Field(min_length=1, max_length=MAX_GROUP_SIZE)
+
 class BoardingPassResponse(BaseModel):
     checkin_id: str
     boarding_pass_number: str
@@ -133,4 +195,33 @@ class BoardingPassResponse(BaseModel):
     checkin_time: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TripResponse(BaseModel):
+    """Everything one trip page shows; boarding_pass is None until check-in"""
+    booking: BookingResponse
+    flight: FlightResponse
+    passenger: PassengerResponse
+    boarding_pass: Optional[BoardingPassResponse] = None
+
+class BulkIds(BaseModel):
+    """Ids of a bulk read; repeats are dropped, the first occurrence keeps its place"""
+    ids: List[str] = Field(min_length=1, max_length=MAX_BULK_IDS)
+
+    @field_validator('ids')
+    @classmethod
+    def validate_ids(cls, v):
+        return list(dict.fromkeys(v))
+
+class FlightCancellationResponse(BaseModel):
+    """What cancelling a flight changed, all in one transaction"""
+    flight: FlightResponse
+    bookings_cancelled: int
+    checkins_voided: int
+    notifications_queued: int
+
+class CheckinStatusResponse(BaseModel):
+    booking_id: str
+    checked_in: bool
+    checkin_id: Optional[str] = None
+    timestamp: datetime
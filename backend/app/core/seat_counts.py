@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import os
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.flight_cache import flight_cache
+from app.core.models import Flight, Seat
+from app.core.route_index import route_index
+
+logger = logging.getLogger(__name__)
+
+SEAT_COUNT_REFRESH_SECONDS = float(os.getenv("SEAT_COUNT_REFRESH_SECONDS") or 1)
+
+
+async def refresh_available_seats(session: AsyncSession, flight_ids: Iterable[str]) -> Dict[str, int]:
+    """Recount flights.available_seats from the free rows in seats; returns the new counts"""
+    flight_ids = list(flight_ids)
+    result = await session.execute(
+        update(Flight)
+        .where(Flight.flight_id.in_(flight_ids))
+        .values(available_seats=(
+            select(func.count())
+            .where(Seat.flight_id == Flight.flight_id, Seat.booking_id.is_(None))
+            .scalar_subquery()
+        ))
+        .returning(Flight.flight_id, Flight.available_seats)
+    )
+    flight_cache.invalidate_seats(flight_ids)
+    return dict(result.all())
+
+
+class SeatCountRefresher:
+    """Keeps flights.available_seats in step with the seats table, off the booking path.
+
+    Bookings and cancellations only touch seat rows and mark their flight here;
+    every ``interval`` seconds one UPDATE recounts the marked flights, so the
+    flight row is written once per interval instead of once per booking. The
+    count is absolute, so workers refreshing the same flight agree.
+    """
+
+    def __init__(self, interval: float = SEAT_COUNT_REFRESH_SECONDS):
+        self.interval = interval
+        self._pending: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> Set[str]:
+        return set(self._pending)
+
+    def mark(self, flight_id: str) -> None:
+        self._pending.add(flight_id)
+
+    def clear(self) -> None:
+        self._pending.clear()
+
+    async def flush(self, session: AsyncSession) -> int:
+        if not self._pending:
+            return 0
+        flight_ids, self._pending = self._pending, set()
+        try:
+            counts = await refresh_available_seats(session, flight_ids)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            self._pending |= flight_ids
+            raise
+        route_index.set_available_seats(counts)
+        return len(flight_ids)
+
+    async def run(self, session_factory: Callable[[], AsyncSession]) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                async with session_factory() as session:
+                    await self.flush(session)
+            except Exception as e:
+                logger.warning(f"Seat count refresh failed: {str(e)}")
+
+    def start(self, session_factory: Callable[[], AsyncSession]) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(session_factory))
+
+    async def stop(self, session_factory: Callable[[], AsyncSession]) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        async with session_factory() as session:
+            await self.flush(session)
+
+
+seat_counts = SeatCountRefresher()
@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Seat letters per row by aircraft family, matched on the start of aircraft_type.
+# Letters run consecutively and skip I, as on printed seat maps.
+SEAT_LETTERS = {
+    "airbus a220": "ABCDE",
+    "airbus a319": "ABCDEF",
+    "airbus a320": "ABCDEF",
+    "airbus a321": "ABCDEF",
+    "airbus a330": "ABCDEFGH",
+    "airbus a350": "ABCDEFGHJ",
+    "airbus a380": "ABCDEFGHJK",
+    "boeing 737": "ABCDEF",
+    "boeing 757": "ABCDEF",
+    "boeing 767": "ABCDEFG",
+    "boeing 777": "ABCDEFGHJK",
+    "boeing 787": "ABCDEFGHJ",
+}
+DEFAULT_SEAT_LETTERS = "ABCDEF"
+
+
+@dataclass(frozen=True)
+class CabinLayout:
+    """Seats numbered row by row from the front; the last row may be partial"""
+    letters: str
+    total_seats: int
+
+    def seat_at(self, index: int) -> str:
+        row, column = divmod(index, len(self.letters))
+        return f"{row + 1}{self.letters[column]}"
+
+    def index_of(self, seat_number: str) -> Optional[int]:
+        """Position of a seat in cabin order, or None if the cabin has no such seat"""
+        column = self.letters.find(seat_number[-1:].upper()) if seat_number else -1
+        row = seat_number[:-1]
+        if column < 0 or not row.isdigit() or int(row) < 1:
+            return None
+        index = (int(row) - 1) * len(self.letters) + column
+        return index if index < self.total_seats else None
+
+    def seat_numbers(self) -> List[str]:
+        return [self.seat_at(i) for i in range(self.total_seats)]
+
+
+def layout_for(aircraft_type: str, total_seats: int) -> CabinLayout:
+    normalized = (aircraft_type or "").strip().lower()
+    letters = next(
+        (letters for family, letters in SEAT_LETTERS.items() if normalized.startswith(family)),
+        DEFAULT_SEAT_LETTERS
+    )
+    return CabinLayout(letters, total_seats)
+
+
+def pick_adjacent(free_indexes: List[int], count: int, row_size: int) -> Optional[List[int]]:
+    """``count`` of the free seat indexes (sorted, cabin order) sitting as close together as possible:
+    the tightest run in cabin order, then the one spanning fewest rows, then the frontmost"""
+    if count <= 0:
+        return []
+    if count > len(free_indexes):
+        return None
+    best = min(
+        range(len(free_indexes) - count + 1),
+        key=lambda i: (
+            free_indexes[i + count - 1] - free_indexes[i],
+            free_indexes[i + count - 1] // row_size - free_indexes[i] // row_size,
+            i
+        )
+    )
+    return free_indexes[best:best + count]
@@ -0,0 +1,59 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE") or 10000)
+
+Claims = Dict[str, Any]
+
+
+class TokenCache:
+    """Decoded claims by raw token, so a reused token skips the HMAC check and JSON parsing.
+
+    Only tokens that verified are cached, each until its own ``exp``; at most
+    ``capacity`` are kept, least recently used first out. The claims are shared
+    between requests and must not be modified. Revocation is checked on the
+    claims after the lookup, so caching a token never outlives revoking it.
+    """
+
+    def __init__(self, capacity: int = TOKEN_CACHE_SIZE, clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Claims]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Claims]:
+        entry = self._entries.get(token)
+        if entry is None or entry[0] <= self.clock():
+            self._entries.pop(token, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, token: str, claims: Claims) -> None:
+        if "exp" not in claims:
+            return
+        self._entries[token] = (claims["exp"], claims)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "tokens": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache()
@@ -0,0 +1,40 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UnitOfWork:
+    """Transaction boundary shared by the repositories of one request.
+
+    Services enter it once per use case. Repositories only flush inside it, so
+    generated keys and column defaults are populated by the INSERT itself
+    (RETURNING on Postgres) instead of a follow-up refresh, and the outermost
+    exit issues a single commit, or a rollback if anything raised. Nested
+    entries join the outer transaction.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._depth = 0
+
+    @property
+    def active(self) -> bool:
+        return self._depth > 0
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._depth -= 1
+        if self._depth:
+            return
+        if exc_type is not None:
+            await self.session.rollback()
+            return
+        try:
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+    async def flush(self) -> None:
+        await self.session.flush()
@@ -0,0 +1,9 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def insert_for(session: AsyncSession, entity):
+    """INSERT construct supporting ON CONFLICT for the session's dialect (Postgres, or SQLite in tests)"""
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(entity)
+    return sqlite.insert(entity)
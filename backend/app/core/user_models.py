@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Boolean, Integer
+from datetime import datetime
+from sqlalchemy import Column, String, Boolean, Integer, DateTime
 from app.core.models import Base
 
 class User(Base):
@@ -8,4 +9,15 @@ class User(Base):
     username = Column(String, unique=True, index=True, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
-    is_active = Column(Boolean, default=True)
\ No newline at end of file
+    is_active = Column(Boolean, default=True)
+
+class TokenRevocation(Base):
+    """A revoked token (jti), or every token of a user issued up to revoked_at (username)"""
+    __tablename__ = "token_revocations"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)  # Refresh cursor, only grows
+    jti = Column(String)
+    username = Column(String)
+    revoked_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Last moment a revoked token could still verify; the row is useless after it
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,12 +1,13 @@
 import uuid
 from datetime import datetime, timedelta
 
+from app.core.ids import next_encoded_id
+
 def generate_id() -> str:
     return str(uuid.uuid4())
 
-def generate_boarding_pass_number(flight_id: str, booking_id: str) -> str:
-    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-    return f"{flight_id}-{booking_id[:8]}-{timestamp}"
+def generate_boarding_pass_number(flight_id: str) -> str:
+    return f"{flight_id}-{next_encoded_id()}"
 
 def get_boarding_group(seat_number: str) -> str:
     if not seat_number or len(seat_number) < 2:
@@ -24,18 +25,6 @@ def get_boarding_group(seat_number: str) -> str:
     else:
         return "C"
 
-def assign_seat(total_seats: int, available_seats: int) -> str:
-    if total_seats <= 0:
-        raise ValueError("Total seats must be positive")
-    if available_seats > total_seats:
-        raise ValueError("Available seats cannot exceed total seats")
-    if available_seats < 0:
-        raise ValueError("Available seats cannot be negative")
-    
-    row = total_seats - available_seats + 1
-    seat_letter = 'A'
-    return f"{row}{seat_letter}"
-
 def validate_checkin_window(departure_time: datetime) -> tuple[bool, str]:
     now = datetime.utcnow()
     hours_until_departure = (departure_time - now).total_seconds() / 3600
@@ -2,9 +2,11 @@ from abc import ABC, abstractmethod
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
+from sqlalchemy.orm import aliased
 import logging
 
-from models import Flight
+from models import Flight, Seat
+from app.core.flight_cache import flight_cache, read_through
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +15,18 @@ class IFlightRepository(ABC):
     async def find_by_id(self, flight_id: str) -> Optional[Flight]:
         pass
     
+    @abstractmethod
+    async def claim_seat(self, flight_id: str, booking_id: str, seat_number: Optional[str] = None) -> Optional[str]:
+        pass
+    
+    @abstractmethod
+    async def find_seat(self, flight_id: str, seat_number: str) -> Optional[Seat]:
+        pass
+    
+    @abstractmethod
+    async def release_seat(self, booking_id: str) -> None:
+        pass
+    
     @abstractmethod
     async def update_available_seats(self, flight_id: str, seats: int) -> None:
         pass
@@ -20,14 +34,49 @@ class IFlightRepository(ABC):
 class FlightRepository(IFlightRepository):
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.cache = flight_cache
     
     async def find_by_id(self, flight_id: str) -> Optional[Flight]:
-        result = await self.db.execute(select(Flight).where(Flight.flight_id == flight_id))
+        return await read_through(self.db, Flight, flight_id, self.cache)
+    
+    async def claim_seat(self, flight_id: str, booking_id: str, seat_number: Optional[str] = None) -> Optional[str]:
+        # Requested seat, or the frontmost free one; rows locked by concurrent
+        # bookers are skipped rather than waited on
+        if seat_number is None:
+            free = aliased(Seat)
+            seat_number = (
+                select(free.seat_number)
+                .where(free.flight_id == flight_id, free.booking_id.is_(None))
+                .order_by(free.seat_index)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+        result = await self.db.execute(
+            update(Seat)
+            .where(Seat.flight_id == flight_id, Seat.seat_number == seat_number, Seat.booking_id.is_(None))
+            .values(booking_id=booking_id)
+            .returning(Seat.seat_number)
+        )
         return result.scalar_one_or_none()
     
+    async def find_seat(self, flight_id: str, seat_number: str) -> Optional[Seat]:
+        result = await self.db.execute(
+            select(Seat).where(Seat.flight_id == flight_id, Seat.seat_number == seat_number)
+        )
+        return result.scalar_one_or_none()
+    
+    async def release_seat(self, booking_id: str) -> None:
+        await self.db.execute(
+            update(Seat)
+            .where(Seat.booking_id == booking_id)
+            .values(booking_id=None)
+        )
+    
     async def update_available_seats(self, flight_id: str, seats: int) -> None:
         await self.db.execute(
             update(Flight)
             .where(Flight.flight_id == flight_id)
             .values(available_seats=Flight.available_seats + seats)
-        )
\ No newline at end of file
+        )
+        self.cache.invalidate_seats([flight_id])
\ No newline at end of file
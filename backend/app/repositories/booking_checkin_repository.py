@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, exists, literal_column
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import aliased
 import logging
 
-from models import Booking, Flight, Passenger, CheckinRecord
+from models import Booking, Flight, Passenger, CheckinRecord, Seat
+from app.core.upsert import insert_for
+from app.core.flight_cache import flight_cache, read_through
 from app.core.exceptions import (
     BookingNotFoundError, FlightNotFoundError, PassengerNotFoundError,
     NoSeatsAvailableError, AlreadyCheckedInError
@@ -28,12 +32,28 @@ class BookingRepositoryInterface(ABC):
     @abstractmethod
     async def get_booking_with_flight(self, booking_id: str) -> Optional[tuple]:
         pass
+    
+    @abstractmethod
+    async def mark_checked_in(self, booking_id: str) -> Optional[Row]:
+        pass
 
 class FlightRepositoryInterface(ABC):
     @abstractmethod
     async def get_by_id(self, flight_id: str) -> Optional[Flight]:
         pass
     
+    @abstractmethod
+    async def claim_seat(self, flight_id: str, booking_id: str, seat_number: Optional[str] = None) -> Optional[str]:
+        pass
+    
+    @abstractmethod
+    async def get_seat(self, flight_id: str, seat_number: str) -> Optional[Seat]:
+        pass
+    
+    @abstractmethod
+    async def release_seat(self, booking_id: str) -> None:
+        pass
+    
     @abstractmethod
     async def update_available_seats(self, flight_id: str, seats: int) -> None:
         pass
@@ -47,6 +67,10 @@ class CheckinRepositoryInterface(ABC):
     async def create(self, checkin: CheckinRecord) -> CheckinRecord:
         pass
     
+    @abstractmethod
+    async def create_if_absent(self, checkin: CheckinRecord) -> Optional[CheckinRecord]:
+        pass
+    
     @abstractmethod
     async def get_by_id(self, checkin_id: str) -> Optional[tuple]:
         pass
@@ -61,8 +85,7 @@ class BookingRepository(BookingRepositoryInterface):
     
     async def create(self, booking: Booking) -> Booking:
         self.db.add(booking)
-        await self.db.commit()
-        await self.db.refresh(booking)
+        await self.db.flush()
         return booking
     
     async def update_status(self, booking_id: str, status: str) -> None:
@@ -79,21 +102,76 @@ class BookingRepository(BookingRepositoryInterface):
             .where(Booking.booking_id == booking_id)
         )
         return result.first()
+    
+    async def mark_checked_in(self, booking_id: str) -> Optional[Row]:
+        # None for a missing or cancelled booking
+        result = await self.db.execute(
+            update(Booking)
+            .where(Booking.booking_id == booking_id, Booking.booking_status != "cancelled")
+            .values(booking_status="checked_in")
+            .returning(
+                Booking.booking_id,
+                Booking.passenger_id,
+                Booking.seat_number,
+                Booking.flight_id,
+                # Outer columns spelled out: SQLite renders RETURNING columns unqualified
+                select(Flight.departure_time).where(Flight.flight_id == literal_column("bookings.flight_id"))
+                .scalar_subquery().label("departure_time"),
+                exists().where(CheckinRecord.booking_id == literal_column("bookings.booking_id"))
+                .label("already_checked_in")
+            )
+        )
+        return result.first()
 
 class FlightRepository(FlightRepositoryInterface):
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.cache = flight_cache
     
     async def get_by_id(self, flight_id: str) -> Optional[Flight]:
-        result = await self.db.execute(select(Flight).where(Flight.flight_id == flight_id))
+        return await read_through(self.db, Flight, flight_id, self.cache)
+    
+    async def claim_seat(self, flight_id: str, booking_id: str, seat_number: Optional[str] = None) -> Optional[str]:
+        # Requested seat, or the frontmost free one; rows locked by concurrent
+        # bookers are skipped rather than waited on
+        if seat_number is None:
+            free = aliased(Seat)
+            seat_number = (
+                select(free.seat_number)
+                .where(free.flight_id == flight_id, free.booking_id.is_(None))
+                .order_by(free.seat_index)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+        result = await self.db.execute(
+            update(Seat)
+            .where(Seat.flight_id == flight_id, Seat.seat_number == seat_number, Seat.booking_id.is_(None))
+            .values(booking_id=booking_id)
+            .returning(Seat.seat_number)
+        )
+        return result.scalar_one_or_none()
+    
+    async def get_seat(self, flight_id: str, seat_number: str) -> Optional[Seat]:
+        result = await self.db.execute(
+            select(Seat).where(Seat.flight_id == flight_id, Seat.seat_number == seat_number)
+        )
         return result.scalar_one_or_none()
     
+    async def release_seat(self, booking_id: str) -> None:
+        await self.db.execute(
+            update(Seat)
+            .where(Seat.booking_id == booking_id)
+            .values(booking_id=None)
+        )
+    
     async def update_available_seats(self, flight_id: str, seats: int) -> None:
         await self.db.execute(
             update(Flight)
             .where(Flight.flight_id == flight_id)
             .values(available_seats=Flight.available_seats + seats)
         )
+        self.cache.invalidate_seats([flight_id])
 
 class CheckinRepository(CheckinRepositoryInterface):
     def __init__(self, db: AsyncSession):
@@ -105,10 +183,23 @@ class CheckinRepository(CheckinRepositoryInterface):
     
     async def create(self, checkin: CheckinRecord) -> CheckinRecord:
         self.db.add(checkin)
-        await self.db.commit()
-        await self.db.refresh(checkin)
+        await self.db.flush()
         return checkin
     
+    async def create_if_absent(self, checkin: CheckinRecord) -> Optional[CheckinRecord]:
+        result = await self.db.execute(
+            insert_for(self.db, CheckinRecord)
+            .values(
+                booking_id=checkin.booking_id,
+                boarding_pass_number=checkin.boarding_pass_number,
+                gate_number=checkin.gate_number,
+                boarding_group=checkin.boarding_group
+            )
+            .on_conflict_do_nothing(index_elements=[CheckinRecord.booking_id])
+            .returning(CheckinRecord)
+        )
+        return result.scalar_one_or_none()
+    
     async def get_by_id(self, checkin_id: str) -> Optional[tuple]:
         result = await self.db.execute(
             select(CheckinRecord, Booking, Flight)
@@ -1,29 +1,44 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
-from typing import Optional
+from sqlalchemy import insert, select, update, exists, literal_column
+from sqlalchemy.engine import Row
+from typing import Dict, Iterable, List, Optional
 
-from app.core.models import Booking, Flight
+from app.core.models import Booking, Flight, Passenger, CheckinRecord
 from app.core.schemas import BookingCreate
+from app.core.loader import batch_loader, load_many
 
 class BookingRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def create(self, booking_data: BookingCreate, seat_number: str) -> Booking:
+    async def create(self, booking_data: BookingCreate, seat_number: str, booking_id: Optional[str] = None) -> Booking:
         booking = Booking(
+            booking_id=booking_id,
             flight_id=booking_data.flight_id,
             passenger_id=booking_data.passenger_id,
             seat_number=seat_number
         )
         self.db.add(booking)
-        await self.db.commit()
-        await self.db.refresh(booking)
+        await self.db.flush()
         return booking
 
+    async def create_many(self, bookings: List[dict]) -> List[Booking]:
+        # One multi-row INSERT ... RETURNING, rows back in the order given
+        result = await self.db.execute(insert(Booking).returning(Booking, sort_by_parameter_order=True), bookings)
+        return list(result.scalars())
+
     async def get_by_id(self, booking_id: str) -> Optional[Booking]:
+        # Within a request, lookups issued together share one IN query
+        loader = batch_loader(self.db, Booking.booking_id)
+        if loader is not None:
+            return await loader.load(booking_id)
         result = await self.db.execute(select(Booking).where(Booking.booking_id == booking_id))
         return result.scalar_one_or_none()
 
+    async def get_many(self, booking_ids: Iterable[str]) -> Dict[str, Booking]:
+        """Found bookings by id"""
+        return await load_many(self.db, Booking.booking_id, booking_ids)
+
     async def get_with_flight(self, booking_id: str) -> Optional[tuple[Booking, Flight]]:
         result = await self.db.execute(
             select(Booking, Flight)
@@ -32,10 +47,81 @@ class BookingRepository:
         )
         return result.first()
 
+    async def get_trip(self, booking_id: str) -> Optional[Row]:
+        # Booking, flight, passenger and check-in (None before check-in) in one joined SELECT
+        result = await self.db.execute(
+            select(Booking, Flight, Passenger, CheckinRecord)
+            .join(Flight, Flight.flight_id == Booking.flight_id)
+            .join(Passenger, Passenger.passenger_id == Booking.passenger_id)
+            .outerjoin(CheckinRecord, CheckinRecord.booking_id == Booking.booking_id)
+            .where(Booking.booking_id == booking_id)
+        )
+        return result.first()
+
+    async def get_for_checkin(self, booking_ids: List[str]) -> Dict[str, Row]:
+        # What check-in validates for each found booking, in one joined SELECT;
+        # already_checked_in comes from the outer join on its check-in
+        result = await self.db.execute(
+            select(
+                Booking.booking_id,
+                Booking.passenger_id,
+                Booking.seat_number,
+                Booking.flight_id,
+                Booking.booking_status,
+                Flight.departure_time,
+                CheckinRecord.checkin_id.isnot(None).label("already_checked_in")
+            )
+            .join(Flight, Flight.flight_id == Booking.flight_id)
+            .outerjoin(CheckinRecord, CheckinRecord.booking_id == Booking.booking_id)
+            .where(Booking.booking_id.in_(booking_ids))
+        )
+        return {row.booking_id: row for row in result.all()}
+
+    async def mark_many_checked_in(self, booking_ids: List[str]) -> int:
+        # One UPDATE for the whole group; cancelled bookings are left alone, so
+        # a count short of the group means one was cancelled meanwhile
+        result = await self.db.execute(
+            update(Booking)
+            .where(Booking.booking_id.in_(booking_ids), Booking.booking_status != "cancelled")
+            .values(booking_status="checked_in")
+        )
+        return result.rowcount
+
+    async def cancel_for_flight(self, flight_id: str) -> int:
+        # Every live booking of the flight in one UPDATE; returns how many
+        result = await self.db.execute(
+            update(Booking)
+            .where(Booking.flight_id == flight_id, Booking.booking_status != "cancelled")
+            .values(booking_status="cancelled")
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
     async def update_status(self, booking_id: str, status: str) -> None:
         await self.db.execute(
             update(Booking)
             .where(Booking.booking_id == booking_id)
             .values(booking_status=status)
         )
-        await self.db.commit()
\ No newline at end of file
+
+    async def mark_checked_in(self, booking_id: str) -> Optional[Row]:
+        # Flips the status and returns what check-in validates in one round trip;
+        # the caller's unit of work rolls the flip back if validation fails.
+        # None for a missing or cancelled booking
+        result = await self.db.execute(
+            update(Booking)
+            .where(Booking.booking_id == booking_id, Booking.booking_status != "cancelled")
+            .values(booking_status="checked_in")
+            .returning(
+                Booking.booking_id,
+                Booking.passenger_id,
+                Booking.seat_number,
+                Booking.flight_id,
+                # Outer columns spelled out: SQLite renders RETURNING columns unqualified
+                select(Flight.departure_time).where(Flight.flight_id == literal_column("bookings.flight_id"))
+                .scalar_subquery().label("departure_time"),
+                exists().where(CheckinRecord.booking_id == literal_column("bookings.booking_id"))
+                .label("already_checked_in")
+            )
+        )
+        return result.first()
@@ -1,8 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional
+from sqlalchemy import delete, select
+from typing import Dict, Iterable, List, Optional
 
 from app.core.models import CheckinRecord, Booking, Flight
+from app.core.upsert import insert_for
+from app.core.loader import batch_loader, load_many
 
 class CheckinRepository:
     def __init__(self, db: AsyncSession):
@@ -17,18 +19,68 @@ class CheckinRepository:
             boarding_group=boarding_group
         )
         self.db.add(checkin)
-        await self.db.commit()
-        await self.db.refresh(checkin)
+        await self.db.flush()
         return checkin
 
+    async def create_if_absent(self, booking_id: str, boarding_pass_number: str,
+                               gate_number: str, boarding_group: str) -> Optional[CheckinRecord]:
+        # None when the booking already has a check-in (unique booking_id)
+        result = await self.db.execute(
+            insert_for(self.db, CheckinRecord)
+            .values(
+                booking_id=booking_id,
+                boarding_pass_number=boarding_pass_number,
+                gate_number=gate_number,
+                boarding_group=boarding_group
+            )
+            .on_conflict_do_nothing(index_elements=[CheckinRecord.booking_id])
+            .returning(CheckinRecord)
+        )
+        return result.scalar_one_or_none()
+
+    async def create_many_if_absent(self, checkins: List[dict]) -> Dict[str, CheckinRecord]:
+        # One multi-row INSERT; created check-ins by booking id, leaving out
+        # bookings that already had one
+        result = await self.db.execute(
+            insert_for(self.db, CheckinRecord)
+            .values(checkins)
+            .on_conflict_do_nothing(index_elements=[CheckinRecord.booking_id])
+            .returning(CheckinRecord)
+        )
+        return {checkin.booking_id: checkin for checkin in result.scalars()}
+
+    async def delete_for_flight(self, flight_id: str) -> int:
+        # Voids the boarding passes of the flight's bookings in one DELETE; returns how many
+        result = await self.db.execute(
+            delete(CheckinRecord)
+            .where(CheckinRecord.booking_id.in_(select(Booking.booking_id).where(Booking.flight_id == flight_id)))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
     async def get_by_id(self, checkin_id: str) -> Optional[CheckinRecord]:
+        # Within a request, lookups issued together share one IN query
+        loader = batch_loader(self.db, CheckinRecord.checkin_id)
+        if loader is not None:
+            return await loader.load(checkin_id)
         result = await self.db.execute(select(CheckinRecord).where(CheckinRecord.checkin_id == checkin_id))
         return result.scalar_one_or_none()
 
+    async def get_many(self, checkin_ids: Iterable[str]) -> Dict[str, CheckinRecord]:
+        """Found check-ins by id"""
+        return await load_many(self.db, CheckinRecord.checkin_id, checkin_ids)
+
     async def get_by_booking_id(self, booking_id: str) -> Optional[CheckinRecord]:
         result = await self.db.execute(select(CheckinRecord).where(CheckinRecord.booking_id == booking_id))
         return result.scalar_one_or_none()
 
+    async def get_checkin_ids(self, booking_ids: List[str]) -> Dict[str, str]:
+        """Check-in id by booking id, for the bookings that are checked in"""
+        result = await self.db.execute(
+            select(CheckinRecord.booking_id, CheckinRecord.checkin_id).where(CheckinRecord.booking_id.in_(booking_ids))
+        )
+        return dict(result.all())
+
     async def get_with_booking_and_flight(self, checkin_id: str) -> Optional[tuple[CheckinRecord, Booking, Flight]]:
         result = await self.db.execute(
             select(CheckinRecord, Booking, Flight)
@@ -1,13 +1,21 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
-from typing import List, Optional
+from sqlalchemy import case, delete, select, update, insert, tuple_
+from sqlalchemy.orm import aliased
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from app.core.models import Flight
-from app.core.schemas import FlightCreate
+from app.core.models import Flight, Seat
+from app.core.schemas import FlightCreate, FlightSearch
+from app.core.seat_map import layout_for
+from app.core.flight_cache import BYPASS_CACHE, flight_cache, read_through, read_through_many
+from app.core.loader import batch_loader, load_many
+from app.core.route_index import route_index
+from app.core.pagination import Position
 
 class FlightRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.cache = flight_cache
+        self.route_index = route_index
 
     async def create(self, flight_data: FlightCreate) -> Flight:
         flight = Flight(
@@ -21,22 +29,141 @@ class FlightRepository:
             available_seats=flight_data.total_seats
         )
         self.db.add(flight)
-        await self.db.commit()
-        await self.db.refresh(flight)
+        await self.db.flush()
+        await self.materialize_seats(flight)
+        self.cache.invalidate(flight.flight_id)
         return flight
 
+    async def materialize_seats(self, flight: Flight) -> None:
+        # One row per seat of the cabin, sent as batched multi-row INSERTs
+        layout = layout_for(flight.aircraft_type, flight.total_seats)
+        if not layout.total_seats:
+            return
+        await self.db.execute(
+            insert(Seat),
+            [
+                {"flight_id": flight.flight_id, "seat_number": seat_number, "seat_index": index}
+                for index, seat_number in enumerate(layout.seat_numbers())
+            ]
+        )
+
     async def get_by_id(self, flight_id: str) -> Optional[Flight]:
-        result = await self.db.execute(select(Flight).where(Flight.flight_id == flight_id))
-        return result.scalar_one_or_none()
+        # Within a request, lookups issued together share one read-through
+        loader = batch_loader(self.db, Flight.flight_id, self._read_through_many)
+        if loader is not None:
+            return await loader.load(flight_id)
+        return await read_through(self.db, Flight, flight_id, self.cache)
+
+    async def get_many(self, flight_ids: Iterable[str]) -> Dict[str, Flight]:
+        """Found flights by id"""
+        return await load_many(self.db, Flight.flight_id, flight_ids, self._read_through_many)
+
+    async def _read_through_many(self, flight_ids: List[str]) -> Dict[str, Flight]:
+        return await read_through_many(self.db, Flight, flight_ids, self.cache)
 
-    async def get_all(self) -> List[Flight]:
-        result = await self.db.execute(select(Flight))
+    async def get_page(self, limit: int, after: Optional[Position] = None, search: Optional[FlightSearch] = None) -> List[Flight]:
+        # Keyset page in (departure_time, flight_id) order. Each filter has an index
+        # leading with its columns and then following that order, so a filtered
+        # page is still a range scan: route, origin, destination, status, or
+        # ix_flights_departure_flight without filters.
+        # Searches within the in-memory route index need no query at all; its
+        # records are read-only stand-ins for Flight rows
+        if self.route_index.covers(search) and not self.db.info.get(BYPASS_CACHE):
+            return self.route_index.search(search, limit, after)
+        query = select(Flight).order_by(Flight.departure_time, Flight.flight_id).limit(limit)
+        if after is not None:
+            query = query.where(tuple_(Flight.departure_time, Flight.flight_id) > tuple_(*after))
+        if search is not None:
+            if search.departure_airport:
+                query = query.where(Flight.departure_airport == search.departure_airport)
+            if search.arrival_airport:
+                query = query.where(Flight.arrival_airport == search.arrival_airport)
+            if search.departure_from:
+                query = query.where(Flight.departure_time >= search.departure_from)
+            if search.departure_to:
+                query = query.where(Flight.departure_time < search.departure_to)
+            if search.status:
+                query = query.where(Flight.status == search.status)
+        result = await self.db.execute(query)
         return result.scalars().all()
 
-    async def update_available_seats(self, flight_id: str, change: int) -> None:
-        await self.db.execute(
+    async def claim_seat(self, flight_id: str, booking_id: str, seat_number: Optional[str] = None) -> Optional[str]:
+        # Holds the requested seat, or the frontmost free one, for the booking.
+        # Concurrent bookers skip seat rows locked by others instead of queueing
+        # on them (SQLite has no row locks and serializes writers anyway).
+        # None when the seat is taken or missing, or the flight is full.
+        if seat_number is None:
+            free = aliased(Seat)
+            seat_number = (
+                select(free.seat_number)
+                .where(free.flight_id == flight_id, free.booking_id.is_(None))
+                .order_by(free.seat_index)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+        result = await self.db.execute(
+            update(Seat)
+            .where(Seat.flight_id == flight_id, Seat.seat_number == seat_number, Seat.booking_id.is_(None))
+            .values(booking_id=booking_id)
+            .returning(Seat.seat_number)
+        )
+        return result.scalar_one_or_none()
+
+    async def cancel(self, flight_id: str) -> Optional[Flight]:
+        # Marks a flight cancelled and takes every seat off sale, flight row
+        # first; None if there is no such flight or it is cancelled already
+        result = await self.db.execute(
             update(Flight)
-            .where(Flight.flight_id == flight_id)
-            .values(available_seats=Flight.available_seats + change)
+            .where(Flight.flight_id == flight_id, Flight.status != "cancelled")
+            .values(status="cancelled", available_seats=0)
+            .returning(Flight)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        flight = result.scalar_one_or_none()
+        if flight is not None:
+            await self.db.execute(delete(Seat).where(Seat.flight_id == flight_id))
+        return flight
+
+    async def get_free_seats(self, flight_id: str) -> List[Tuple[int, str]]:
+        # (seat_index, seat_number) of every free seat in cabin order, from
+        # ix_seats_free. Not locked: claim_seats only takes seats still free
+        result = await self.db.execute(
+            select(Seat.seat_index, Seat.seat_number)
+            .where(Seat.flight_id == flight_id, Seat.booking_id.is_(None))
+            .order_by(Seat.seat_index)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def claim_seats(self, flight_id: str, booking_ids: Dict[str, str]) -> List[str]:
+        # Holds each seat for its booking (seat_number -> booking_id) in one
+        # UPDATE; returns the seats claimed, which leaves out any taken since
+        if not booking_ids:
+            return []
+        result = await self.db.execute(
+            update(Seat)
+            .where(Seat.flight_id == flight_id, Seat.seat_number.in_(booking_ids), Seat.booking_id.is_(None))
+            .values(booking_id=case(booking_ids, value=Seat.seat_number))
+            .returning(Seat.seat_number)
+        )
+        return list(result.scalars())
+
+    async def get_seat(self, flight_id: str, seat_number: str) -> Optional[Seat]:
+        result = await self.db.execute(
+            select(Seat).where(Seat.flight_id == flight_id, Seat.seat_number == seat_number)
+        )
+        return result.scalar_one_or_none()
+
+    async def release_seat(self, booking_id: str) -> None:
+        await self.db.execute(
+            update(Seat)
+            .where(Seat.booking_id == booking_id)
+            .values(booking_id=None)
+        )
+
+    async def release_seats(self, booking_ids: Iterable[str]) -> None:
+        await self.db.execute(
+            update(Seat)
+            .where(Seat.booking_id.in_(list(booking_ids)))
+            .values(booking_id=None)
         )
-        await self.db.commit()
\ No newline at end of file
@@ -0,0 +1,21 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, literal, select
+from datetime import datetime
+
+from app.core.models import Booking, Notification
+
+class NotificationRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue_for_flight(self, flight_id: str, kind: str) -> int:
+        # One notification per live booking of the flight, in one INSERT ... SELECT
+        result = await self.db.execute(
+            insert(Notification).from_select(
+                ["passenger_id", "booking_id", "kind", "created_at"],
+                select(Booking.passenger_id, Booking.booking_id, literal(kind), literal(datetime.utcnow()))
+                .where(Booking.flight_id == flight_id, Booking.booking_status != "cancelled")
+                .order_by(Booking.booking_id)
+            )
+        )
+        return result.rowcount
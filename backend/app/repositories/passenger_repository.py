@@ -1,9 +1,11 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import select, tuple_
+from typing import Dict, Iterable, List, Optional
 
 from app.core.models import Passenger, Booking
 from app.core.schemas import PassengerCreate
+from app.core.pagination import Position
+from app.core.loader import batch_loader, load_many
 
 class PassengerRepository:
     def __init__(self, db: AsyncSession):
@@ -18,18 +20,34 @@ class PassengerRepository:
             date_of_birth=passenger_data.date_of_birth
         )
         self.db.add(passenger)
-        await self.db.commit()
-        await self.db.refresh(passenger)
+        await self.db.flush()
         return passenger
 
     async def get_by_id(self, passenger_id: str) -> Optional[Passenger]:
+        # Within a request, lookups issued together share one IN query
+        loader = batch_loader(self.db, Passenger.passenger_id)
+        if loader is not None:
+            return await loader.load(passenger_id)
         result = await self.db.execute(select(Passenger).where(Passenger.passenger_id == passenger_id))
         return result.scalar_one_or_none()
 
+    async def get_many(self, passenger_ids: Iterable[str]) -> Dict[str, Passenger]:
+        """Found passengers by id"""
+        return await load_many(self.db, Passenger.passenger_id, passenger_ids)
+
     async def get_by_email(self, email: str) -> Optional[Passenger]:
         result = await self.db.execute(select(Passenger).where(Passenger.email == email))
         return result.scalar_one_or_none()
 
-    async def get_bookings(self, passenger_id: str) -> List[Booking]:
-        result = await self.db.execute(select(Booking).where(Booking.passenger_id == passenger_id))
-        return result.scalars().all()
\ No newline at end of file
+    async def get_bookings_page(self, passenger_id: str, limit: int, after: Optional[Position] = None) -> List[Booking]:
+        # Keyset page in (booking_date, booking_id) order, served by ix_bookings_passenger_date
+        query = (
+            select(Booking)
+            .where(Booking.passenger_id == passenger_id)
+            .order_by(Booking.booking_date, Booking.booking_id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(tuple_(Booking.booking_date, Booking.booking_id) > tuple_(*after))
+        result = await self.db.execute(query)
+        return result.scalars().all()
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.auth_schemas import BulkProvisionReport
+from app.core.database import get_db, get_pool_stats, replica_router
+from app.core.dependencies import get_current_admin_user
+from app.core.flight_cache import flight_cache
+from app.core.password_pool import password_pool
+from app.core.principal_cache import principal_cache
+from app.core.provisioning import UserProvisioner, hash_pool, stream_lines
+from app.core.route_index import route_index
+from app.core.token_cache import token_cache
+from app.core.user_models import User
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+@router.get("/db/pool")
+async def database_pool_stats(current_user: User = Depends(get_current_admin_user)):
+    return get_pool_stats()
+
+@router.get("/db/replicas")
+async def database_replica_stats(current_user: User = Depends(get_current_admin_user)):
+    return replica_router.stats()
+
+@router.get("/cache/flights")
+async def flight_cache_stats(current_user: User = Depends(get_current_admin_user)):
+    return flight_cache.stats()
+
+@router.get("/cache/principals")
+async def principal_cache_stats(current_user: User = Depends(get_current_admin_user)):
+    return principal_cache.stats()
+
+@router.get("/cache/routes")
+async def route_index_stats(current_user: User = Depends(get_current_admin_user)):
+    return route_index.stats()
+
+@router.get("/cache/tokens")
+async def token_cache_stats(current_user: User = Depends(get_current_admin_user)):
+    return token_cache.stats()
+
+@router.get("/auth/password-pool")
+async def password_pool_stats(current_user: User = Depends(get_current_admin_user)):
+    return password_pool.stats()
+
+@router.post("/users/bulk", response_model=BulkProvisionReport)
+async def provision_users(
+    request: Request,
+    fmt: str = Query("jsonl", alias="format", pattern="^(csv|jsonl)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Create users from a CSV (with a header) or JSONL request body of username, email, password"""
+    provisioner = UserProvisioner(db, hash_pool.executor, processes=hash_pool.processes)
+    return await provisioner.run(stream_lines(request.stream()), fmt)
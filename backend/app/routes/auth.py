@@ -4,9 +4,12 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.database import get_db
-from app.core.auth import verify_password, get_password_hash, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.auth import verify_password, get_password_hash, create_access_token, decode_token, principal_claims, ACCESS_TOKEN_EXPIRE_MINUTES
 from app.core.auth_schemas import Token, UserCreate, User as UserSchema
 from app.core.user_models import User
+from app.core.dependencies import oauth2_scheme
+from app.core.password_pool import password_pool
+from app.core.revocation import revocation_list
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -19,7 +22,7 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
             raise HTTPException(status_code=400, detail="Username already registered")
         
         # Create user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await password_pool.run(get_password_hash, user_data.password)
         user = User(
             username=user_data.username,
             email=str(user_data.email),
@@ -29,6 +32,9 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
         await db.commit()
         await db.refresh(user)
         return user
+    except HTTPException:
+        await db.rollback()
+        raise
     except Exception as e:
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
@@ -38,7 +44,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
     result = await db.execute(select(User).where(User.username == form_data.username))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await password_pool.run(verify_password, form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -47,6 +53,13 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data=principal_claims(user), expires_delta=access_token_expires
     )
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
+    """Revoke the presented token; other tokens of the user stay valid"""
+    claims = decode_token(token)
+    if "jti" in claims and not revocation_list.is_revoked(claims):
+        await revocation_list.revoke_token(db, claims)
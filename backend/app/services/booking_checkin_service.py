@@ -3,16 +3,18 @@ from typing import Optional
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import Booking, CheckinRecord
+from models import Booking, CheckinRecord, generate_uuid
 from schemas import BookingCreate, BookingResponse, CheckinRequest, BoardingPassResponse
-from utils import assign_seat, generate_boarding_pass_number, get_boarding_group, validate_checkin_window
+from utils import generate_boarding_pass_number, get_boarding_group, validate_checkin_window
 from app.repositories.booking_checkin_repository import (
     BookingRepository, FlightRepository, CheckinRepository, PassengerRepository
 )
+from app.core.unit_of_work import UnitOfWork
+from app.core.seat_counts import seat_counts
 from app.core.exceptions import (
     BookingNotFoundError, FlightNotFoundError, PassengerNotFoundError,
     NoSeatsAvailableError, AlreadyCheckedInError, PassengerMismatchError,
-    CheckinWindowError
+    CheckinWindowError, SeatNotAvailableError, ValidationError
 )
 
 logger = logging.getLogger(__name__)
@@ -48,46 +50,48 @@ class BookingService(BookingServiceInterface):
         self.booking_repo = BookingRepository(db)
         self.flight_repo = FlightRepository(db)
         self.passenger_repo = PassengerRepository(db)
+        self.uow = UnitOfWork(db)
         self.db = db
     
     async def create_booking(self, booking_data: BookingCreate, user_id: str) -> BookingResponse:
         logger.info(f"Creating booking for user {user_id}")
         
         try:
-            # Validate entities exist
-            flight = await self.flight_repo.get_by_id(booking_data.flight_id)
-            if not flight:
-                raise FlightNotFoundError()
-            
-            passenger = await self.passenger_repo.get_by_id(booking_data.passenger_id)
-            if not passenger:
-                raise PassengerNotFoundError()
-            
-            # Validate business rules
-            if flight.available_seats <= 0:
-                raise NoSeatsAvailableError()
-            
-            # Assign seat
-            seat_number = booking_data.seat_number or assign_seat(flight.total_seats, flight.available_seats)
-            
-            # Create booking
-            booking = Booking(
-                flight_id=booking_data.flight_id,
-                passenger_id=booking_data.passenger_id,
-                seat_number=seat_number
-            )
-            
-            # Update available seats
-            await self.flight_repo.update_available_seats(booking_data.flight_id, -1)
-            
-            # Save booking
-            booking = await self.booking_repo.create(booking)
-            
+            async with self.uow:
+                passenger = await self.passenger_repo.get_by_id(booking_data.passenger_id)
+                if not passenger:
+                    raise PassengerNotFoundError()
+                
+                # Claim a seat row; the flight row stays out of the booking path
+                booking_id = generate_uuid()
+                seat_number = await self.flight_repo.claim_seat(
+                    booking_data.flight_id, booking_id, booking_data.seat_number
+                )
+                if not seat_number:
+                    if not await self.flight_repo.get_by_id(booking_data.flight_id):
+                        raise FlightNotFoundError()
+                    if booking_data.seat_number:
+                        if not await self.flight_repo.get_seat(booking_data.flight_id, booking_data.seat_number):
+                            raise ValidationError(f"Seat {booking_data.seat_number} does not exist on this flight")
+                        raise SeatNotAvailableError(booking_data.seat_number)
+                    raise NoSeatsAvailableError()
+                
+                # Create booking
+                booking = Booking(
+                    booking_id=booking_id,
+                    flight_id=booking_data.flight_id,
+                    passenger_id=booking_data.passenger_id,
+                    seat_number=seat_number
+                )
+                
+                # Save booking
+                booking = await self.booking_repo.create(booking)
+            
+            seat_counts.mark(booking_data.flight_id)
             logger.info(f"Booking {booking.booking_id} created successfully")
             return booking
             
         except Exception as e:
-            await self.db.rollback()
             logger.error(f"Booking creation failed: {str(e)}")
             raise
     
@@ -101,21 +105,22 @@ class BookingService(BookingServiceInterface):
         logger.info(f"Cancelling booking {booking_id} for user {user_id}")
         
         try:
-            booking = await self.booking_repo.get_by_id(booking_id)
-            if not booking:
-                raise BookingNotFoundError()
-            
-            # Update booking status
-            await self.booking_repo.update_status(booking_id, "cancelled")
-            
-            # Restore seat availability
-            await self.flight_repo.update_available_seats(booking.flight_id, 1)
-            
-            await self.db.commit()
+            async with self.uow:
+                booking = await self.booking_repo.get_by_id(booking_id)
+                if not booking:
+                    raise BookingNotFoundError()
+                
+                # Update booking status
+                await self.booking_repo.update_status(booking_id, "cancelled")
+                
+                # Free the seat row for the next booking
+                await self.flight_repo.release_seat(booking_id)
+                flight_id = booking.flight_id
+            
+            seat_counts.mark(flight_id)
             logger.info(f"Booking {booking_id} cancelled successfully")
             
         except Exception as e:
-            await self.db.rollback()
             logger.error(f"Booking cancellation failed: {str(e)}")
             raise
 
@@ -123,56 +128,53 @@ class CheckinService(CheckinServiceInterface):
     def __init__(self, db: AsyncSession):
         self.booking_repo = BookingRepository(db)
         self.checkin_repo = CheckinRepository(db)
+        self.uow = UnitOfWork(db)
         self.db = db
     
     async def checkin(self, checkin_data: CheckinRequest, user_id: str) -> BoardingPassResponse:
         logger.info(f"Processing check-in for booking {checkin_data.booking_id}")
         
         try:
-            # Get booking with flight info
-            booking_flight = await self.booking_repo.get_booking_with_flight(checkin_data.booking_id)
-            if not booking_flight:
-                raise BookingNotFoundError()
-            
-            booking, flight = booking_flight
-            
-            # Validate passenger ID
-            if booking.passenger_id != checkin_data.passenger_id:
-                raise PassengerMismatchError()
-            
-            # Check if already checked in
-            existing_checkin = await self.checkin_repo.get_by_booking_id(checkin_data.booking_id)
-            if existing_checkin:
-                raise AlreadyCheckedInError()
-            
-            # Validate check-in window
-            is_valid, error_msg = validate_checkin_window(flight.departure_time)
-            if not is_valid:
-                raise CheckinWindowError(error_msg)
-            
-            # Create check-in record
-            boarding_pass_number = generate_boarding_pass_number(flight.flight_id, booking.booking_id)
-            boarding_group = get_boarding_group(booking.seat_number)
-            
-            checkin_record = CheckinRecord(
-                booking_id=checkin_data.booking_id,
-                boarding_pass_number=boarding_pass_number,
-                gate_number="A1",
-                boarding_group=boarding_group
-            )
-            
-            # Update booking status
-            await self.booking_repo.update_status(checkin_data.booking_id, "checked_in")
-            
-            # Save checkin record
-            checkin_record = await self.checkin_repo.create(checkin_record)
+            async with self.uow:
+                # Status flip and flight lookup in one statement; errors below roll it back
+                booking = await self.booking_repo.mark_checked_in(checkin_data.booking_id)
+                if not booking:
+                    raise BookingNotFoundError()
+                
+                # Validate passenger ID
+                if booking.passenger_id != checkin_data.passenger_id:
+                    raise PassengerMismatchError()
+                
+                if booking.already_checked_in:
+                    raise AlreadyCheckedInError()
+                
+                # Validate check-in window
+                is_valid, error_msg = validate_checkin_window(booking.departure_time)
+                if not is_valid:
+                    raise CheckinWindowError(error_msg)
+                
+                # Create check-in record
+                boarding_pass_number = generate_boarding_pass_number(booking.flight_id)
+                boarding_group = get_boarding_group(booking.seat_number)
+                
+                checkin_record = CheckinRecord(
+                    booking_id=checkin_data.booking_id,
+                    boarding_pass_number=boarding_pass_number,
+                    gate_number="A1",
+                    boarding_group=boarding_group
+                )
+                
+                # Save checkin record; the unique booking_id settles concurrent check-ins
+                checkin_record = await self.checkin_repo.create_if_absent(checkin_record)
+                if not checkin_record:
+                    raise AlreadyCheckedInError()
             
             logger.info(f"Check-in completed for booking {checkin_data.booking_id}")
             
             return BoardingPassResponse(
                 checkin_id=checkin_record.checkin_id,
                 boarding_pass_number=checkin_record.boarding_pass_number,
-                flight_id=flight.flight_id,
+                flight_id=booking.flight_id,
                 seat_number=booking.seat_number,
                 boarding_group=checkin_record.boarding_group,
                 gate_number=checkin_record.gate_number,
@@ -180,7 +182,6 @@ class CheckinService(CheckinServiceInterface):
             )
             
         except Exception as e:
-            await self.db.rollback()
             logger.error(f"Check-in failed for booking {checkin_data.booking_id}: {str(e)}")
             raise
     
@@ -1,46 +1,143 @@
 from fastapi import HTTPException, status
 from datetime import datetime
+from typing import List, Optional
 
 from app.repositories.booking_repository import BookingRepository
 from app.repositories.flight_repository import FlightRepository
 from app.repositories.passenger_repository import PassengerRepository
 from app.repositories.checkin_repository import CheckinRepository
-from app.core.schemas import BookingCreate, BookingResponse, CheckinRequest, BoardingPassResponse
-from app.core.utils import assign_seat, generate_boarding_pass_number, get_boarding_group, validate_checkin_window
+from app.core.schemas import (
+    BookingCreate, BookingResponse, CheckinRequest, BoardingPassResponse, CheckinStatusResponse, FlightResponse,
+    GroupBookingCreate, GroupCheckinRequest, PassengerResponse, TripResponse
+)
+from app.core.utils import generate_boarding_pass_number, get_boarding_group, validate_checkin_window
+from app.core.unit_of_work import UnitOfWork
+from app.core.models import generate_uuid
+from app.core.seat_counts import seat_counts
+from app.core.seat_map import layout_for, pick_adjacent
+
+# Times a group booking picks seats again after a concurrent booker took some of them
+GROUP_SEAT_CLAIM_ATTEMPTS = 3
 
 class BookingService:
     def __init__(self, booking_repo: BookingRepository, flight_repo: FlightRepository, 
-                 passenger_repo: PassengerRepository, checkin_repo: CheckinRepository):
+                 passenger_repo: PassengerRepository, checkin_repo: CheckinRepository,
+                 uow: Optional[UnitOfWork] = None):
         self.booking_repo = booking_repo
         self.flight_repo = flight_repo
         self.passenger_repo = passenger_repo
         self.checkin_repo = checkin_repo
+        self.uow = uow or UnitOfWork(booking_repo.db)
 
     async def create_booking(self, booking_data: BookingCreate) -> BookingResponse:
-        # Validate flight exists
-        flight = await self.flight_repo.get_by_id(booking_data.flight_id)
-        if not flight:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Flight not found")
-        
-        # Validate passenger exists
-        passenger = await self.passenger_repo.get_by_id(booking_data.passenger_id)
-        if not passenger:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Passenger not found")
-        
-        # Check seat availability
-        if flight.available_seats <= 0:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="No seats available")
+        async with self.uow:
+            # Validate passenger exists
+            passenger = await self.passenger_repo.get_by_id(booking_data.passenger_id)
+            if not passenger:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Passenger not found")
+            
+            # Claim the seat row first; the flight row is not touched on this path
+            booking_id = generate_uuid()
+            seat_number = await self.flight_repo.claim_seat(
+                booking_data.flight_id, booking_id, booking_data.seat_number
+            )
+            if not seat_number:
+                if not await self.flight_repo.get_by_id(booking_data.flight_id):
+                    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Flight not found")
+                if booking_data.seat_number:
+                    if not await self.flight_repo.get_seat(booking_data.flight_id, booking_data.seat_number):
+                        raise HTTPException(
+                            status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"Seat {booking_data.seat_number} does not exist on this flight"
+                        )
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail=f"Seat {booking_data.seat_number} is not available"
+                    )
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="No seats available")
+            
+            booking = await self.booking_repo.create(booking_data, seat_number, booking_id)
         
-        # Assign seat if not provided
-        seat_number = booking_data.seat_number or assign_seat(flight.total_seats, flight.available_seats)
+        # available_seats is recounted in the background
+        seat_counts.mark(booking_data.flight_id)
+        return BookingResponse.model_validate(booking)
+
+    async def create_group_booking(self, group: GroupBookingCreate) -> List[BookingResponse]:
+        """Books every passenger of the group on one flight or none of them.
+
+        Passengers without a seat_number get the closest free seats together.
+        Free seats are read without locking them and then claimed in one UPDATE
+        that only takes seats still free; if a concurrent booker got one first,
+        the rest are released and seats picked again. All bookings are then
+        inserted in one INSERT.
+        """
+        passenger_ids = [p.passenger_id for p in group.passengers]
+        requested = [p.seat_number for p in group.passengers if p.seat_number]
+        if len(set(passenger_ids)) != len(passenger_ids):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Each passenger may appear once per group")
+        if len(set(requested)) != len(requested):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Each seat may be requested once per group")
         
-        # Create booking
-        booking = await self.booking_repo.create(booking_data, seat_number)
+        async with self.uow:
+            passengers = await self.passenger_repo.get_many(passenger_ids)
+            missing = [passenger_id for passenger_id in passenger_ids if passenger_id not in passengers]
+            if missing:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Passenger {missing[0]} not found")
+            
+            flight = await self.flight_repo.get_by_id(group.flight_id)
+            if not flight:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Flight not found")
+            
+            layout = layout_for(flight.aircraft_type, flight.total_seats)
+            for seat_number in requested:
+                if layout.index_of(seat_number) is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Seat {seat_number} does not exist on this flight"
+                    )
+            
+            for _ in range(GROUP_SEAT_CLAIM_ATTEMPTS):
+                rows = await self._pick_group_seats(group, layout, requested)
+                claimed = await self.flight_repo.claim_seats(
+                    group.flight_id, {row["seat_number"]: row["booking_id"] for row in rows}
+                )
+                if len(claimed) == len(rows):
+                    break
+                await self.flight_repo.release_seats(row["booking_id"] for row in rows)
+            else:
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Seats were taken while booking, try again")
+            
+            bookings = await self.booking_repo.create_many(rows)
         
-        # Update available seats
-        await self.flight_repo.update_available_seats(booking_data.flight_id, -1)
+        # available_seats is recounted in the background
+        seat_counts.mark(group.flight_id)
+        return [BookingResponse.model_validate(booking) for booking in bookings]
+
+    async def _pick_group_seats(self, group: GroupBookingCreate, layout, requested: List[str]) -> List[dict]:
+        """Booking rows for the group, on the requested seats and the closest free run for the others"""
+        free = dict(await self.flight_repo.get_free_seats(group.flight_id))
+        free_numbers = set(free.values())
+        for seat_number in requested:
+            if seat_number not in free_numbers:
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Seat {seat_number} is not available")
         
-        return BookingResponse.model_validate(booking)
+        unseated = len(group.passengers) - len(requested)
+        picked = pick_adjacent(
+            sorted(index for index, seat_number in free.items() if seat_number not in requested),
+            unseated, len(layout.letters)
+        )
+        if picked is None:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Not enough seats available")
+        assigned = iter(free[index] for index in picked)
+        return [
+            {
+                "booking_id": generate_uuid(),
+                "flight_id": group.flight_id,
+                "passenger_id": p.passenger_id,
+                "seat_number": p.seat_number or next(assigned)
+            }
+            for p in group.passengers
+        ]
 
     async def get_booking(self, booking_id: str) -> BookingResponse:
         booking = await self.booking_repo.get_by_id(booking_id)
@@ -48,60 +145,133 @@ class BookingService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
         return BookingResponse.model_validate(booking)
 
+    async def get_bookings(self, booking_ids: List[str]) -> List[BookingResponse]:
+        """Found bookings in the order asked for"""
+        bookings = await self.booking_repo.get_many(booking_ids)
+        return [BookingResponse.model_validate(bookings[booking_id]) for booking_id in booking_ids if booking_id in bookings]
+
     async def cancel_booking(self, booking_id: str) -> None:
-        booking = await self.booking_repo.get_by_id(booking_id)
-        if not booking:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+        async with self.uow:
+            booking = await self.booking_repo.get_by_id(booking_id)
+            if not booking:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+            
+            # Update booking status
+            await self.booking_repo.update_status(booking_id, "cancelled")
+            
+            # Free the seat row for the next booking
+            await self.flight_repo.release_seat(booking_id)
+            flight_id = booking.flight_id
         
-        # Update booking status
-        await self.booking_repo.update_status(booking_id, "cancelled")
-        
-        # Restore seat availability
-        await self.flight_repo.update_available_seats(booking.flight_id, 1)
+        seat_counts.mark(flight_id)
 
     async def checkin(self, checkin_data: CheckinRequest) -> BoardingPassResponse:
-        # Get booking with flight info
-        booking_flight = await self.booking_repo.get_with_flight(checkin_data.booking_id)
-        if not booking_flight:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
-        
-        booking, flight = booking_flight
-        
-        # Validate passenger ID
-        if booking.passenger_id != checkin_data.passenger_id:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Passenger ID mismatch")
-        
-        # Check if already checked in
-        existing_checkin = await self.checkin_repo.get_by_booking_id(checkin_data.booking_id)
-        if existing_checkin:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Already checked in")
-        
-        # Validate check-in window
-        is_valid, error_msg = validate_checkin_window(flight.departure_time)
-        if not is_valid:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error_msg)
-        
-        # Create check-in record
-        boarding_pass_number = generate_boarding_pass_number(flight.flight_id, booking.booking_id)
-        boarding_group = get_boarding_group(booking.seat_number)
-        
-        checkin_record = await self.checkin_repo.create(
-            checkin_data.booking_id, boarding_pass_number, "A1", boarding_group
-        )
-        
-        # Update booking status
-        await self.booking_repo.update_status(checkin_data.booking_id, "checked_in")
+        async with self.uow:
+            # Status flip and flight lookup in one statement; any error below rolls it back
+            booking = await self.booking_repo.mark_checked_in(checkin_data.booking_id)
+            if not booking:
+                if await self.booking_repo.get_by_id(checkin_data.booking_id):
+                    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Booking is cancelled")
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+            
+            # Validate passenger ID
+            if booking.passenger_id != checkin_data.passenger_id:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Passenger ID mismatch")
+            
+            if booking.already_checked_in:
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Already checked in")
+            
+            # Validate check-in window
+            is_valid, error_msg = validate_checkin_window(booking.departure_time)
+            if not is_valid:
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error_msg)
+            
+            # Create check-in record; the unique booking_id settles concurrent check-ins
+            boarding_pass_number = generate_boarding_pass_number(booking.flight_id)
+            boarding_group = get_boarding_group(booking.seat_number)
+            
+            checkin_record = await self.checkin_repo.create_if_absent(
+                checkin_data.booking_id, boarding_pass_number, "A1", boarding_group
+            )
+            if not checkin_record:
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Already checked in")
         
         return BoardingPassResponse(
             checkin_id=checkin_record.checkin_id,
             boarding_pass_number=checkin_record.boarding_pass_number,
-            flight_id=flight.flight_id,
+            flight_id=booking.flight_id,
             seat_number=booking.seat_number,
             boarding_group=checkin_record.boarding_group,
             gate_number=checkin_record.gate_number,
             checkin_time=checkin_record.checkin_time
         )
 
+    async def group_checkin(self, group: GroupCheckinRequest) -> List[BoardingPassResponse]:
+        """Checks in every booking of the party or none of them.
+
+        The bookings are validated from one joined SELECT, then all check-ins
+        are inserted in one statement and all statuses flipped in one UPDATE,
+        committed once. Boarding passes come back in request order.
+        """
+        booking_ids = [c.booking_id for c in group.checkins]
+        if len(set(booking_ids)) != len(booking_ids):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Each booking may appear once per group")
+        
+        async with self.uow:
+            bookings = await self.booking_repo.get_for_checkin(booking_ids)
+            for checkin_data in group.checkins:
+                booking = bookings.get(checkin_data.booking_id)
+                if not booking:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND, detail=f"Booking {checkin_data.booking_id} not found"
+                    )
+                if booking.passenger_id != checkin_data.passenger_id:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Passenger ID mismatch for booking {booking.booking_id}"
+                    )
+                if booking.booking_status == "cancelled":
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT, detail=f"Booking {booking.booking_id} is cancelled"
+                    )
+                if booking.already_checked_in:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT, detail=f"Booking {booking.booking_id} already checked in"
+                    )
+                is_valid, error_msg = validate_checkin_window(booking.departure_time)
+                if not is_valid:
+                    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error_msg)
+            
+            # The unique booking_id settles check-ins racing this one; losing any rolls the group back
+            checkins = await self.checkin_repo.create_many_if_absent([
+                {
+                    "checkin_id": generate_uuid(),
+                    "booking_id": booking.booking_id,
+                    "boarding_pass_number": generate_boarding_pass_number(booking.flight_id),
+                    "gate_number": "A1",
+                    "boarding_group": get_boarding_group(booking.seat_number)
+                }
+                for booking in (bookings[booking_id] for booking_id in booking_ids)
+            ])
+            if len(checkins) != len(booking_ids):
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Already checked in")
+            
+            if await self.booking_repo.mark_many_checked_in(booking_ids) != len(booking_ids):
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A booking of the group was cancelled")
+        
+        return [
+            BoardingPassResponse(
+                checkin_id=checkins[booking_id].checkin_id,
+                boarding_pass_number=checkins[booking_id].boarding_pass_number,
+                flight_id=bookings[booking_id].flight_id,
+                seat_number=bookings[booking_id].seat_number,
+                boarding_group=checkins[booking_id].boarding_group,
+                gate_number=checkins[booking_id].gate_number,
+                checkin_time=checkins[booking_id].checkin_time
+            )
+            for booking_id in booking_ids
+        ]
+
     async def get_boarding_pass(self, checkin_id: str) -> BoardingPassResponse:
         checkin_data = await self.checkin_repo.get_with_booking_and_flight(checkin_id)
         if not checkin_data:
@@ -119,6 +289,43 @@ class BookingService:
             checkin_time=checkin_record.checkin_time
         )
 
+    async def get_trip(self, booking_id: str) -> TripResponse:
+        trip = await self.booking_repo.get_trip(booking_id)
+        if not trip:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+
+        booking, flight, passenger, checkin_record = trip
+        boarding_pass = None
+        if checkin_record is not None:
+            boarding_pass = BoardingPassResponse(
+                checkin_id=checkin_record.checkin_id,
+                boarding_pass_number=checkin_record.boarding_pass_number,
+                flight_id=flight.flight_id,
+                seat_number=booking.seat_number,
+                boarding_group=checkin_record.boarding_group,
+                gate_number=checkin_record.gate_number,
+                checkin_time=checkin_record.checkin_time
+            )
+        return TripResponse(
+            booking=BookingResponse.model_validate(booking),
+            flight=FlightResponse.model_validate(flight),
+            passenger=PassengerResponse.model_validate(passenger),
+            boarding_pass=boarding_pass
+        )
+
+    async def get_checkin_statuses(self, booking_ids: List[str]) -> List[CheckinStatusResponse]:
+        checkin_ids = await self.checkin_repo.get_checkin_ids(booking_ids)
+        timestamp = datetime.utcnow()
+        return [
+            CheckinStatusResponse(
+                booking_id=booking_id,
+                checked_in=booking_id in checkin_ids,
+                checkin_id=checkin_ids.get(booking_id),
+                timestamp=timestamp
+            )
+            for booking_id in booking_ids
+        ]
+
     async def get_checkin_status(self, booking_id: str) -> dict:
         checkin = await self.checkin_repo.get_by_booking_id(booking_id)
         return {
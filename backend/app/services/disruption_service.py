@@ -0,0 +1,51 @@
+from typing import Optional
+from fastapi import HTTPException, status
+
+from app.repositories.booking_repository import BookingRepository
+from app.repositories.checkin_repository import CheckinRepository
+from app.repositories.flight_repository import FlightRepository
+from app.repositories.notification_repository import NotificationRepository
+from app.core.schemas import FlightCancellationResponse, FlightResponse
+from app.core.unit_of_work import UnitOfWork
+from app.core.route_index import FlightRecord
+
+class DisruptionService:
+    def __init__(self, flight_repo: FlightRepository, booking_repo: BookingRepository,
+                 checkin_repo: CheckinRepository, notification_repo: NotificationRepository,
+                 uow: Optional[UnitOfWork] = None):
+        self.flight_repo = flight_repo
+        self.booking_repo = booking_repo
+        self.checkin_repo = checkin_repo
+        self.notification_repo = notification_repo
+        self.uow = uow or UnitOfWork(flight_repo.db)
+
+    async def cancel_flight(self, flight_id: str) -> FlightCancellationResponse:
+        """Cancels a flight and everything booked on it in one transaction.
+
+        Each step is one set-based statement over the flight's rows, so the
+        number of round trips is the same for an empty flight and a full one:
+        the flight is marked cancelled and its seats taken off sale, every live
+        booking gets a notification, boarding passes are voided and bookings
+        cancelled. Any failure rolls all of it back.
+        """
+        async with self.uow:
+            flight = await self.flight_repo.cancel(flight_id)
+            if not flight:
+                if not await self.flight_repo.get_by_id(flight_id):
+                    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Flight not found")
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Flight already cancelled")
+            
+            # Queued before the bookings are cancelled, while they still read as live
+            notifications_queued = await self.notification_repo.enqueue_for_flight(flight_id, "flight_cancelled")
+            checkins_voided = await self.checkin_repo.delete_for_flight(flight_id)
+            bookings_cancelled = await self.booking_repo.cancel_for_flight(flight_id)
+        
+        # Bulk UPDATEs bypass the flush hooks, so this worker's cache and index are told directly
+        self.flight_repo.cache.invalidate(flight_id)
+        self.flight_repo.route_index.upsert(FlightRecord.of(flight))
+        return FlightCancellationResponse(
+            flight=FlightResponse.model_validate(flight),
+            bookings_cancelled=bookings_cancelled,
+            checkins_voided=checkins_voided,
+            notifications_queued=notifications_queued
+        )
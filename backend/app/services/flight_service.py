@@ -1,24 +1,31 @@
-from typing import List
+from datetime import datetime, timedelta
+from typing import List, Optional
 from fastapi import HTTPException, status
 
 from app.repositories.flight_repository import FlightRepository
-from app.core.schemas import FlightCreate, FlightResponse
+from app.core.schemas import FlightCreate, FlightResponse, FlightSearch, ItineraryResponse
 from app.core.models import Flight
+from app.core.unit_of_work import UnitOfWork
+from app.core.pagination import Page, decode_cursor, paginate
+from app.core.connections import CONNECTION_SEARCH_WINDOW_HOURS, connection_finder
+from app.core.route_index import route_index
 
 class FlightService:
-    def __init__(self, flight_repo: FlightRepository):
+    def __init__(self, flight_repo: FlightRepository, uow: Optional[UnitOfWork] = None):
         self.flight_repo = flight_repo
+        self.uow = uow or UnitOfWork(flight_repo.db)
 
     async def create_flight(self, flight_data: FlightCreate) -> FlightResponse:
-        # Check if flight already exists
-        existing_flight = await self.flight_repo.get_by_id(flight_data.flight_id)
-        if existing_flight:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Flight already exists"
-            )
-        
-        flight = await self.flight_repo.create(flight_data)
+        async with self.uow:
+            # Check if flight already exists
+            existing_flight = await self.flight_repo.get_by_id(flight_data.flight_id)
+            if existing_flight:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Flight already exists"
+                )
+            
+            flight = await self.flight_repo.create(flight_data)
         return FlightResponse.model_validate(flight)
 
     async def get_flight(self, flight_id: str) -> FlightResponse:
@@ -30,6 +37,31 @@ class FlightService:
             )
         return FlightResponse.model_validate(flight)
 
-    async def get_all_flights(self) -> List[FlightResponse]:
-        flights = await self.flight_repo.get_all()
-        return [FlightResponse.model_validate(flight) for flight in flights]
\ No newline at end of file
+    async def get_flights(self, flight_ids: List[str]) -> List[FlightResponse]:
+        """Found flights in the order asked for"""
+        flights = await self.flight_repo.get_many(flight_ids)
+        return [FlightResponse.model_validate(flights[flight_id]) for flight_id in flight_ids if flight_id in flights]
+
+    async def get_flights_page(self, limit: int, cursor: Optional[str] = None,
+                               search: Optional[FlightSearch] = None) -> Page[FlightResponse]:
+        flights = await self.flight_repo.get_page(limit + 1, decode_cursor("flights", cursor), search)
+        page = paginate("flights", flights, limit, lambda flight: (flight.departure_time, flight.flight_id))
+        page.items = [FlightResponse.model_validate(flight) for flight in page.items]
+        return page
+
+    def find_connections(self, origin: str, destination: str, departure_from: Optional[datetime] = None,
+                         departure_to: Optional[datetime] = None, limit: int = 5, max_legs: int = 3,
+                         seats: int = 1) -> List[ItineraryResponse]:
+        if not route_index.ready:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Connection search is not ready yet",
+                headers={"Retry-After": "5"}
+            )
+        # Only upcoming flights are indexed
+        departure_from = max(departure_from or datetime.utcnow(), route_index.horizon)
+        departure_to = departure_to or departure_from + timedelta(hours=CONNECTION_SEARCH_WINDOW_HOURS)
+        itineraries = connection_finder.search(
+            origin.upper(), destination.upper(), departure_from, departure_to, limit, max_legs, seats
+        )
+        return [ItineraryResponse.model_validate(itinerary) for itinerary in itineraries]
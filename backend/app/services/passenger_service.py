@@ -1,23 +1,27 @@
-from typing import List
+from typing import Optional
 from fastapi import HTTPException, status
 
 from app.repositories.passenger_repository import PassengerRepository
 from app.core.schemas import PassengerCreate, PassengerResponse, BookingResponse
+from app.core.unit_of_work import UnitOfWork
+from app.core.pagination import Page, decode_cursor, paginate
 
 class PassengerService:
-    def __init__(self, passenger_repo: PassengerRepository):
+    def __init__(self, passenger_repo: PassengerRepository, uow: Optional[UnitOfWork] = None):
         self.passenger_repo = passenger_repo
+        self.uow = uow or UnitOfWork(passenger_repo.db)
 
     async def create_passenger(self, passenger_data: PassengerCreate) -> PassengerResponse:
-        # Check if email already exists
-        existing_passenger = await self.passenger_repo.get_by_email(str(passenger_data.email))
-        if existing_passenger:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Email already registered"
-            )
-        
-        passenger = await self.passenger_repo.create(passenger_data)
+        async with self.uow:
+            # Check if email already exists
+            existing_passenger = await self.passenger_repo.get_by_email(str(passenger_data.email))
+            if existing_passenger:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Email already registered"
+                )
+            
+            passenger = await self.passenger_repo.create(passenger_data)
         return PassengerResponse.model_validate(passenger)
 
     async def get_passenger(self, passenger_id: str) -> PassengerResponse:
@@ -29,7 +33,8 @@ class PassengerService:
             )
         return PassengerResponse.model_validate(passenger)
 
-    async def get_passenger_bookings(self, passenger_id: str) -> List[BookingResponse]:
+    async def get_passenger_bookings_page(self, passenger_id: str, limit: int, cursor: Optional[str] = None) -> Page[BookingResponse]:
+        after = decode_cursor("bookings", cursor)
         # Verify passenger exists
         passenger = await self.passenger_repo.get_by_id(passenger_id)
         if not passenger:
@@ -38,5 +43,7 @@ class PassengerService:
                 detail="Passenger not found"
             )
         
-        bookings = await self.passenger_repo.get_bookings(passenger_id)
-        return [BookingResponse.model_validate(booking) for booking in bookings]
\ No newline at end of file
+        bookings = await self.passenger_repo.get_bookings_page(passenger_id, limit + 1, after)
+        page = paginate("bookings", bookings, limit, lambda booking: (booking.booking_date, booking.booking_id))
+        page.items = [BookingResponse.model_validate(booking) for booking in page.items]
+        return page
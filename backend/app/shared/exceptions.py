@@ -27,6 +27,10 @@ class NoSeatsAvailableError(BaseBusinessException):
     def __init__(self):
         super().__init__("No seats available", status.HTTP_409_CONFLICT)
 
+class SeatNotAvailableError(BaseBusinessException):
+    def __init__(self, seat_number: str):
+        super().__init__(f"Seat {seat_number} is not available", status.HTTP_409_CONFLICT)
+
 class AlreadyCheckedInError(BaseBusinessException):
     def __init__(self, booking_id: Optional[str] = None):
         message = f"Booking {booking_id} already checked in" if booking_id else "Already checked in"
@@ -0,0 +1,133 @@
+"""Booking throughput benchmark: concurrent bookings on a single flight.
+
+Seeds one flight and its seat rows, then books every seat concurrently
+through BookingService, auto-assigned, and prints bookings per second,
+per-booking latency and the number of SQL statements issued. The flight row
+is only written by the final seat count refresh. Uses DATABASE_URL (a
+throwaway database!) or a temporary SQLite file by default; SQLite serializes
+writers, so only Postgres shows SKIP LOCKED spreading bookers over seats.
+
+    python -m benchmarks.booking_benchmark --seats 396 --concurrency 100
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.models import Base, Flight, Passenger
+from app.core.pool import PoolSettings
+from app.core.schemas import BookingCreate
+from app.core.seat_counts import seat_counts
+from app.core.unit_of_work import UnitOfWork
+from app.repositories.booking_repository import BookingRepository
+from app.repositories.checkin_repository import CheckinRepository
+from app.repositories.flight_repository import FlightRepository
+from app.repositories.passenger_repository import PassengerRepository
+from app.services.booking_service import BookingService
+
+
+async def seed(session_factory, aircraft_type: str, seats: int) -> None:
+    async with session_factory() as session:
+        flight = Flight(
+            flight_id="BENCH1",
+            departure_airport="JFK",
+            arrival_airport="LAX",
+            departure_time=datetime.utcnow() + timedelta(hours=6),
+            arrival_time=datetime.utcnow() + timedelta(hours=12),
+            aircraft_type=aircraft_type,
+            total_seats=seats,
+            available_seats=seats,
+            status="scheduled"
+        )
+        session.add(flight)
+        await session.flush()
+        await FlightRepository(session).materialize_seats(flight)
+        session.add(Passenger(
+            passenger_id="BENCH-P",
+            first_name="Bench",
+            last_name="Passenger",
+            email="bench@bench.test",
+            phone="+10000000000",
+            date_of_birth="1990-01-01"
+        ))
+        await session.commit()
+
+
+async def book(session_factory) -> None:
+    async with session_factory() as session:
+        service = BookingService(
+            BookingRepository(session),
+            FlightRepository(session),
+            PassengerRepository(session),
+            CheckinRepository(session),
+            UnitOfWork(session)
+        )
+        await service.create_booking(BookingCreate(flight_id="BENCH1", passenger_id="BENCH-P"))
+
+
+async def main(aircraft_type: str, seats: int, concurrency: int) -> None:
+    url = os.getenv("DATABASE_URL") or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/booking_bench.db"
+    settings = PoolSettings.from_env()
+    engine_kwargs = settings.engine_kwargs(url)
+    if url.startswith("sqlite"):
+        engine_kwargs["connect_args"] = {"timeout": 60}
+    engine = create_async_engine(url, **engine_kwargs)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(session_factory, aircraft_type, seats)
+
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await book(session_factory)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    print(f"{seats} bookings on one {aircraft_type}, concurrency {concurrency}, {engine.url.get_backend_name()}")
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(seats)))
+    elapsed = time.perf_counter() - started
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    async with session_factory() as session:
+        await seat_counts.flush(session)
+        flight = await session.get(Flight, "BENCH1")
+
+    latencies.sort()
+    print(
+        f"{seats / elapsed:8.0f} bookings/s  "
+        f"p50 {statistics.median(latencies):7.2f} ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1]:7.2f} ms  "
+        f"{statements / seats:.1f} statements/booking  "
+        f"{flight.available_seats} seats left"
+    )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--aircraft", default="Boeing 777")
+    parser.add_argument("--seats", type=int, default=396)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.aircraft, args.seats, args.concurrency))
@@ -0,0 +1,154 @@
+"""Flight cancellation benchmark: set-based cancel_flight against cancelling booking by booking.
+
+Seeds two identical full flights, a share of their bookings checked in, then
+cancels every booking of one through cancel_booking in turn (which neither
+voids check-ins nor notifies anyone) and the other whole through
+DisruptionService.cancel_flight. Prints the time taken and the SQL
+statements issued for each. Uses DATABASE_URL (a throwaway database!) or
+a temporary SQLite file by default.
+
+    python -m benchmarks.cancellation_benchmark --bookings 5000 --checked-in 0.4
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.models import Base, Booking, CheckinRecord, Flight, Passenger, Seat
+from app.core.pool import PoolSettings
+from app.core.unit_of_work import UnitOfWork
+from app.repositories.booking_repository import BookingRepository
+from app.repositories.checkin_repository import CheckinRepository
+from app.repositories.flight_repository import FlightRepository
+from app.repositories.notification_repository import NotificationRepository
+from app.repositories.passenger_repository import PassengerRepository
+from app.services.booking_service import BookingService
+from app.services.disruption_service import DisruptionService
+
+
+async def seed(session_factory, flight_id: str, bookings: int, checked_in: float) -> None:
+    async with session_factory() as session:
+        flight = Flight(
+            flight_id=flight_id,
+            departure_airport="JFK",
+            arrival_airport="LAX",
+            departure_time=datetime.utcnow() + timedelta(hours=6),
+            arrival_time=datetime.utcnow() + timedelta(hours=12),
+            aircraft_type="Boeing 777",
+            total_seats=bookings,
+            available_seats=0,
+            status="scheduled"
+        )
+        session.add(flight)
+        await session.flush()
+        await FlightRepository(session).materialize_seats(flight)
+        seats = (await session.execute(
+            select(Seat.seat_number).where(Seat.flight_id == flight_id).order_by(Seat.seat_index)
+        )).scalars().all()
+        rows = [(f"{flight_id}-P{i}", f"{flight_id}-B{i:06d}", seat_number) for i, seat_number in enumerate(seats)]
+        await session.execute(insert(Passenger), [
+            {
+                "passenger_id": passenger_id,
+                "first_name": "Bench",
+                "last_name": passenger_id,
+                "email": f"{passenger_id.lower()}@bench.test",
+                "phone": "+10000000000",
+                "date_of_birth": "1990-01-01"
+            }
+            for passenger_id, _, _ in rows
+        ])
+        await session.execute(insert(Booking), [
+            {"booking_id": booking_id, "flight_id": flight_id, "passenger_id": passenger_id, "seat_number": seat_number}
+            for passenger_id, booking_id, seat_number in rows
+        ])
+        await session.execute(insert(CheckinRecord), [
+            {
+                "checkin_id": f"C-{booking_id}",
+                "booking_id": booking_id,
+                "boarding_pass_number": f"BP-{booking_id}",
+                "gate_number": "A1",
+                "boarding_group": "A"
+            }
+            for _, booking_id, _ in rows[:int(len(rows) * checked_in)]
+        ])
+        await FlightRepository(session).claim_seats(flight_id, {seat_number: booking_id for _, booking_id, seat_number in rows})
+        await session.commit()
+
+
+async def cancel_booking_by_booking(session_factory, flight_id: str) -> None:
+    async with session_factory() as session:
+        booking_ids = (await session.execute(
+            select(Booking.booking_id).where(Booking.flight_id == flight_id)
+        )).scalars().all()
+        service = BookingService(
+            BookingRepository(session),
+            FlightRepository(session),
+            PassengerRepository(session),
+            CheckinRepository(session),
+            UnitOfWork(session)
+        )
+        for booking_id in booking_ids:
+            await service.cancel_booking(booking_id)
+
+
+async def cancel_flight(session_factory, flight_id: str) -> None:
+    async with session_factory() as session:
+        await DisruptionService(
+            FlightRepository(session),
+            BookingRepository(session),
+            CheckinRepository(session),
+            NotificationRepository(session),
+            UnitOfWork(session)
+        ).cancel_flight(flight_id)
+
+
+async def run(name: str, cancel, engine, session_factory, flight_id: str, bookings: int) -> None:
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    started = time.perf_counter()
+    await cancel(session_factory, flight_id)
+    elapsed = time.perf_counter() - started
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    print(f"{name:<18} {elapsed * 1000:10.1f} ms  {statements:6d} statements  {bookings / elapsed:8.0f} bookings/s")
+
+
+async def main(bookings: int, checked_in: float) -> None:
+    url = os.getenv("DATABASE_URL") or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/cancellation_bench.db"
+    settings = PoolSettings.from_env()
+    engine_kwargs = settings.engine_kwargs(url)
+    if url.startswith("sqlite"):
+        engine_kwargs["connect_args"] = {"timeout": 60}
+    engine = create_async_engine(url, **engine_kwargs)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(session_factory, "BENCH1", bookings, checked_in)
+    await seed(session_factory, "BENCH2", bookings, checked_in)
+
+    print(f"{bookings} bookings, {checked_in:.0%} checked in, {engine.url.get_backend_name()}")
+    await run("booking by booking", cancel_booking_by_booking, engine, session_factory, "BENCH1", bookings)
+    await run("cancel_flight", cancel_flight, engine, session_factory, "BENCH2", bookings)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=5000)
+    parser.add_argument("--checked-in", type=float, default=0.4)
+    args = parser.parse_args()
+    asyncio.run(main(args.bookings, args.checked_in))
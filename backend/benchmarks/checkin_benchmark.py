@@ -0,0 +1,169 @@
+"""Check-in latency benchmark: previous multi-statement path vs the ON CONFLICT path.
+
+Seeds one flight with N bookings, then checks every booking in concurrently,
+once with each implementation, and prints per-check-in latency and the number
+of SQL statements issued. Uses DATABASE_URL (a throwaway database!) or a
+temporary SQLite file by default.
+
+    python -m benchmarks.checkin_benchmark --bookings 2000 --concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.models import Base, Booking, Flight, Passenger
+from app.core.pool import PoolSettings
+from app.core.schemas import BoardingPassResponse, CheckinRequest
+from app.core.unit_of_work import UnitOfWork
+from app.core.utils import generate_boarding_pass_number, get_boarding_group, validate_checkin_window
+from app.repositories.booking_repository import BookingRepository
+from app.repositories.checkin_repository import CheckinRepository
+from app.repositories.flight_repository import FlightRepository
+from app.repositories.passenger_repository import PassengerRepository
+from app.services.booking_service import BookingService
+
+
+async def legacy_checkin(session: AsyncSession, checkin_data: CheckinRequest) -> BoardingPassResponse:
+    """The check-in flow before the single-statement write path, kept for comparison"""
+    booking_repo = BookingRepository(session)
+    checkin_repo = CheckinRepository(session)
+    async with UnitOfWork(session):
+        booking_flight = await booking_repo.get_with_flight(checkin_data.booking_id)
+        if not booking_flight:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+        booking, flight = booking_flight
+        if booking.passenger_id != checkin_data.passenger_id:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Passenger ID mismatch")
+        if await checkin_repo.get_by_booking_id(checkin_data.booking_id):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Already checked in")
+        is_valid, error_msg = validate_checkin_window(flight.departure_time)
+        if not is_valid:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=error_msg)
+        checkin_record = await checkin_repo.create(
+            checkin_data.booking_id,
+            generate_boarding_pass_number(flight.flight_id),
+            "A1",
+            get_boarding_group(booking.seat_number)
+        )
+        await booking_repo.update_status(checkin_data.booking_id, "checked_in")
+    await session.refresh(checkin_record)
+    return BoardingPassResponse(
+        checkin_id=checkin_record.checkin_id,
+        boarding_pass_number=checkin_record.boarding_pass_number,
+        flight_id=flight.flight_id,
+        seat_number=booking.seat_number,
+        boarding_group=checkin_record.boarding_group,
+        gate_number=checkin_record.gate_number,
+        checkin_time=checkin_record.checkin_time
+    )
+
+
+async def current_checkin(session: AsyncSession, checkin_data: CheckinRequest) -> BoardingPassResponse:
+    service = BookingService(
+        BookingRepository(session),
+        FlightRepository(session),
+        PassengerRepository(session),
+        CheckinRepository(session),
+        UnitOfWork(session)
+    )
+    return await service.checkin(checkin_data)
+
+
+async def seed(session_factory, flight_id: str, bookings: int) -> list:
+    async with session_factory() as session:
+        session.add(Flight(
+            flight_id=flight_id,
+            departure_airport="JFK",
+            arrival_airport="LAX",
+            departure_time=datetime.utcnow() + timedelta(hours=6),
+            arrival_time=datetime.utcnow() + timedelta(hours=12),
+            aircraft_type="Boeing 777",
+            total_seats=bookings,
+            available_seats=0,
+            status="scheduled"
+        ))
+        requests = []
+        for i in range(bookings):
+            passenger_id = f"{flight_id}-P{i}"
+            booking_id = f"{flight_id}-B{i:06d}"
+            session.add(Passenger(
+                passenger_id=passenger_id,
+                first_name="Bench",
+                last_name=str(i),
+                email=f"{passenger_id.lower()}@bench.test",
+                phone="+10000000000",
+                date_of_birth="1990-01-01"
+            ))
+            session.add(Booking(booking_id=booking_id, flight_id=flight_id, passenger_id=passenger_id, seat_number=f"{i + 1}A"))
+            requests.append(CheckinRequest(booking_id=booking_id, passenger_id=passenger_id))
+        await session.commit()
+    return requests
+
+
+async def run(name: str, checkin, session_factory, engine, requests: list, concurrency: int) -> None:
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(checkin_data):
+        async with semaphore:
+            started = time.perf_counter()
+            async with session_factory() as session:
+                await checkin(session, checkin_data)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(r) for r in requests))
+    elapsed = time.perf_counter() - started
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    latencies.sort()
+    print(
+        f"{name:<8} {len(requests) / elapsed:8.0f} checkins/s  "
+        f"p50 {statistics.median(latencies):7.2f} ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1]:7.2f} ms  "
+        f"{statements / len(requests):.1f} statements/checkin"
+    )
+
+
+async def main(bookings: int, concurrency: int) -> None:
+    url = os.getenv("DATABASE_URL") or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/checkin_bench.db"
+    settings = PoolSettings.from_env()
+    engine_kwargs = settings.engine_kwargs(url)
+    if url.startswith("sqlite"):
+        engine_kwargs["connect_args"] = {"timeout": 60}
+    engine = create_async_engine(url, **engine_kwargs)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    print(f"{bookings} check-ins, concurrency {concurrency}, {engine.url.get_backend_name()}")
+    await run("legacy", legacy_checkin, session_factory, engine, await seed(session_factory, "BENCH1", bookings), concurrency)
+    await run("current", current_checkin, session_factory, engine, await seed(session_factory, "BENCH2", bookings), concurrency)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.bookings, args.concurrency))
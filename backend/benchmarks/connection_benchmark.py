@@ -0,0 +1,113 @@
+"""Connection search benchmark on synthetic flight networks.
+
+Builds the route index straight from generated flights (no database) for a
+hub-and-spoke and a point-to-point network of N flights over D days, then runs
+random origin/destination searches for the earliest arrival and the top-k
+itineraries and prints per-search latency.
+
+    python -m benchmarks.connection_benchmark --flights 200000 --searches 2000 --top 5
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from app.core.connections import ConnectionFinder
+from app.core.route_index import FlightRecord, RouteIndex
+
+
+def airports(count: int) -> list:
+    return [f"A{i:03d}" for i in range(count)]
+
+
+def hub_and_spoke(rng: random.Random, names: list, hubs: int):
+    """Most flights touch one of a few hubs, as in a network carrier's schedule"""
+    hub_names, spokes = names[:hubs], names[hubs:]
+
+    def pair():
+        hub = rng.choice(hub_names)
+        other = rng.choice(names)
+        while other == hub:
+            other = rng.choice(names)
+        return (hub, other) if rng.random() < 0.5 else (other, hub)
+
+    return pair
+
+
+def point_to_point(rng: random.Random, names: list, hubs: int):
+    return lambda: tuple(rng.sample(names, 2))
+
+
+NETWORKS = {"hub-and-spoke": hub_and_spoke, "point-to-point": point_to_point}
+
+
+def flights(network: str, count: int, airport_count: int, days: int, start: datetime) -> list:
+    rng = random.Random(1)
+    names = airports(airport_count)
+    pair = NETWORKS[network](rng, names, max(1, airport_count // 20))
+    records = []
+    for i in range(count):
+        origin, destination = pair()
+        departure = start + timedelta(minutes=rng.randrange(60 * 24 * days))
+        records.append(FlightRecord(
+            flight_id=f"S{i:07d}",
+            departure_airport=origin,
+            arrival_airport=destination,
+            departure_time=departure,
+            arrival_time=departure + timedelta(minutes=rng.randrange(60, 600)),
+            aircraft_type="Boeing 737",
+            total_seats=180,
+            available_seats=rng.randrange(181),
+            status="cancelled" if rng.random() < 0.02 else "scheduled",
+        ))
+    return records
+
+
+def report(name: str, latencies: list, found: int) -> None:
+    latencies.sort()
+    print(
+        f"  {name:<16} p50 {statistics.median(latencies):8.3f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1]:8.3f} ms  "
+        f"{found}/{len(latencies)} answered"
+    )
+
+
+def main(flight_count: int, airport_count: int, days: int, count: int, top: int, max_legs: int) -> None:
+    start = datetime.utcnow()
+    for network in NETWORKS:
+        started = time.perf_counter()
+        index = RouteIndex()
+        index.build(flights(network, flight_count, airport_count, days, start), start)
+        finder = ConnectionFinder(index)
+        print(f"{network}: {flight_count} flights, {airport_count} airports over {days} days, "
+              f"built in {time.perf_counter() - started:.2f} s")
+
+        rng = random.Random(2)
+        names = airports(airport_count)
+        queries = []
+        for _ in range(count):
+            origin, destination = rng.sample(names, 2)
+            departure_from = start + timedelta(hours=rng.randrange(24 * (days - 2)))
+            queries.append((origin, destination, departure_from, departure_from + timedelta(hours=24)))
+
+        for name, limit in (("earliest arrival", 1), (f"top {top}", top)):
+            latencies, found = [], 0
+            for origin, destination, departure_from, departure_to in queries:
+                began = time.perf_counter()
+                itineraries = finder.search(origin, destination, departure_from, departure_to, limit, max_legs)
+                latencies.append((time.perf_counter() - began) * 1000)
+                found += bool(itineraries)
+            report(name, latencies, found)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flights", type=int, default=200000)
+    parser.add_argument("--airports", type=int, default=200)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--searches", type=int, default=1000)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--max-legs", type=int, default=3)
+    args = parser.parse_args()
+    main(args.flights, args.airports, args.days, args.searches, args.top, args.max_legs)
@@ -0,0 +1,142 @@
+"""Group booking benchmark: one group booking against a loop of single bookings.
+
+Seeds two identical flights and a party of passengers, then fills each flight
+with parties: one flight booking each party member through create_booking in
+turn, the other booking the whole party through create_group_booking. Prints
+parties per second, per-party latency and SQL statements per party for both.
+Uses DATABASE_URL (a throwaway database!) or a temporary SQLite file by default.
+
+    python -m benchmarks.group_booking_benchmark --seats 396 --group-size 6
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.models import Base, Flight, Passenger
+from app.core.pool import PoolSettings
+from app.core.schemas import BookingCreate, GroupBookingCreate, GroupBookingPassenger
+from app.core.unit_of_work import UnitOfWork
+from app.repositories.booking_repository import BookingRepository
+from app.repositories.checkin_repository import CheckinRepository
+from app.repositories.flight_repository import FlightRepository
+from app.repositories.passenger_repository import PassengerRepository
+from app.services.booking_service import BookingService
+
+
+async def seed(session_factory, aircraft_type: str, seats: int, group_size: int) -> None:
+    async with session_factory() as session:
+        for flight_id in ("LOOP1", "GROUP1"):
+            flight = Flight(
+                flight_id=flight_id,
+                departure_airport="JFK",
+                arrival_airport="LAX",
+                departure_time=datetime.utcnow() + timedelta(hours=6),
+                arrival_time=datetime.utcnow() + timedelta(hours=12),
+                aircraft_type=aircraft_type,
+                total_seats=seats,
+                available_seats=seats,
+                status="scheduled"
+            )
+            session.add(flight)
+            await session.flush()
+            await FlightRepository(session).materialize_seats(flight)
+        for i in range(group_size):
+            session.add(Passenger(
+                passenger_id=f"BENCH-P{i}",
+                first_name="Bench",
+                last_name="Passenger",
+                email=f"bench{i}@bench.test",
+                phone="+10000000000",
+                date_of_birth="1990-01-01"
+            ))
+        await session.commit()
+
+
+def booking_service(session) -> BookingService:
+    return BookingService(
+        BookingRepository(session),
+        FlightRepository(session),
+        PassengerRepository(session),
+        CheckinRepository(session),
+        UnitOfWork(session)
+    )
+
+
+async def book_one_by_one(session_factory, group_size: int) -> None:
+    async with session_factory() as session:
+        service = booking_service(session)
+        for i in range(group_size):
+            await service.create_booking(BookingCreate(flight_id="LOOP1", passenger_id=f"BENCH-P{i}"))
+
+
+async def book_as_group(session_factory, group_size: int) -> None:
+    async with session_factory() as session:
+        await booking_service(session).create_group_booking(GroupBookingCreate(
+            flight_id="GROUP1",
+            passengers=[GroupBookingPassenger(passenger_id=f"BENCH-P{i}") for i in range(group_size)]
+        ))
+
+
+async def run(engine, session_factory, label: str, book, parties: int, group_size: int) -> None:
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(parties):
+        party_started = time.perf_counter()
+        await book(session_factory, group_size)
+        latencies.append((time.perf_counter() - party_started) * 1000)
+    elapsed = time.perf_counter() - started
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    latencies.sort()
+    print(
+        f"{label:<12} {parties / elapsed:8.0f} parties/s  "
+        f"p50 {statistics.median(latencies):7.2f} ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1]:7.2f} ms  "
+        f"{statements / parties:.1f} statements/party"
+    )
+
+
+async def main(aircraft_type: str, seats: int, group_size: int) -> None:
+    url = os.getenv("DATABASE_URL") or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/group_booking_bench.db"
+    settings = PoolSettings.from_env()
+    engine_kwargs = settings.engine_kwargs(url)
+    if url.startswith("sqlite"):
+        engine_kwargs["connect_args"] = {"timeout": 60}
+    engine = create_async_engine(url, **engine_kwargs)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(session_factory, aircraft_type, seats, group_size)
+
+    parties = seats // group_size
+    print(f"{parties} parties of {group_size} on one {aircraft_type}, {engine.url.get_backend_name()}")
+    await run(engine, session_factory, "one by one", book_one_by_one, parties, group_size)
+    await run(engine, session_factory, "group", book_as_group, parties, group_size)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--aircraft", default="Boeing 777")
+    parser.add_argument("--seats", type=int, default=396)
+    parser.add_argument("--group-size", type=int, default=6)
+    args = parser.parse_args()
+    asyncio.run(main(args.aircraft, args.seats, args.group_size))
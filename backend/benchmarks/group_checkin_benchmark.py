@@ -0,0 +1,147 @@
+"""Group check-in benchmark: one group check-in against a loop of single check-ins.
+
+Seeds two identical flights whose bookings belong to parties, then checks
+every party in concurrently: on one flight each booking of a party through
+checkin in turn, on the other the whole party through group_checkin. Prints
+parties per second, per-party latency and SQL statements per party for both.
+Uses DATABASE_URL (a throwaway database!) or a temporary SQLite file by default.
+
+    python -m benchmarks.group_checkin_benchmark --parties 300 --party-size 4 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.models import Base, Booking, Flight, Passenger
+from app.core.pool import PoolSettings
+from app.core.schemas import CheckinRequest, GroupCheckinRequest
+from app.core.unit_of_work import UnitOfWork
+from app.repositories.booking_repository import BookingRepository
+from app.repositories.checkin_repository import CheckinRepository
+from app.repositories.flight_repository import FlightRepository
+from app.repositories.passenger_repository import PassengerRepository
+from app.services.booking_service import BookingService
+
+
+def booking_service(session) -> BookingService:
+    return BookingService(
+        BookingRepository(session),
+        FlightRepository(session),
+        PassengerRepository(session),
+        CheckinRepository(session),
+        UnitOfWork(session)
+    )
+
+
+async def check_in_one_by_one(session: AsyncSession, party: List[CheckinRequest]) -> None:
+    service = booking_service(session)
+    for checkin_data in party:
+        await service.checkin(checkin_data)
+
+
+async def check_in_as_group(session: AsyncSession, party: List[CheckinRequest]) -> None:
+    await booking_service(session).group_checkin(GroupCheckinRequest(checkins=party))
+
+
+async def seed(session_factory, flight_id: str, parties: int, party_size: int) -> List[List[CheckinRequest]]:
+    seats = parties * party_size
+    async with session_factory() as session:
+        session.add(Flight(
+            flight_id=flight_id,
+            departure_airport="JFK",
+            arrival_airport="LAX",
+            departure_time=datetime.utcnow() + timedelta(hours=6),
+            arrival_time=datetime.utcnow() + timedelta(hours=12),
+            aircraft_type="Boeing 777",
+            total_seats=seats,
+            available_seats=0,
+            status="scheduled"
+        ))
+        requests = []
+        for i in range(seats):
+            passenger_id = f"{flight_id}-P{i}"
+            booking_id = f"{flight_id}-B{i:06d}"
+            session.add(Passenger(
+                passenger_id=passenger_id,
+                first_name="Bench",
+                last_name=str(i),
+                email=f"{passenger_id.lower()}@bench.test",
+                phone="+10000000000",
+                date_of_birth="1990-01-01"
+            ))
+            session.add(Booking(booking_id=booking_id, flight_id=flight_id, passenger_id=passenger_id, seat_number=f"{i + 1}A"))
+            requests.append(CheckinRequest(booking_id=booking_id, passenger_id=passenger_id))
+        await session.commit()
+    return [requests[i:i + party_size] for i in range(0, seats, party_size)]
+
+
+async def run(name: str, checkin, session_factory, engine, parties: list, concurrency: int) -> None:
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(party):
+        async with semaphore:
+            started = time.perf_counter()
+            async with session_factory() as session:
+                await checkin(session, party)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(party) for party in parties))
+    elapsed = time.perf_counter() - started
+    event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    latencies.sort()
+    print(
+        f"{name:<12} {len(parties) / elapsed:8.0f} parties/s  "
+        f"p50 {statistics.median(latencies):7.2f} ms  "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1]:7.2f} ms  "
+        f"{statements / len(parties):.1f} statements/party"
+    )
+
+
+async def main(parties: int, party_size: int, concurrency: int) -> None:
+    url = os.getenv("DATABASE_URL") or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/group_checkin_bench.db"
+    settings = PoolSettings.from_env()
+    engine_kwargs = settings.engine_kwargs(url)
+    if url.startswith("sqlite"):
+        engine_kwargs["connect_args"] = {"timeout": 60}
+    engine = create_async_engine(url, **engine_kwargs)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    print(f"{parties} parties of {party_size}, concurrency {concurrency}, {engine.url.get_backend_name()}")
+    await run("one by one", check_in_one_by_one, session_factory, engine,
+              await seed(session_factory, "BENCH1", parties, party_size), concurrency)
+    await run("group", check_in_as_group, session_factory, engine,
+              await seed(session_factory, "BENCH2", parties, party_size), concurrency)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--parties", type=int, default=300)
+    parser.add_argument("--party-size", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.parties, args.party_size, args.concurrency))
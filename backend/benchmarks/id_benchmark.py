@@ -0,0 +1,59 @@
+"""Boarding pass ID benchmark: generation throughput and uniqueness across processes.
+
+Generates IDs in one process to measure raw throughput, then in several
+processes at once with distinct worker IDs (as separate app workers would run)
+and checks the union for duplicates and per-worker ordering.
+
+    python -m benchmarks.id_benchmark --ids 1000000 --processes 8
+"""
+import argparse
+import multiprocessing
+import time
+
+from app.core.ids import SnowflakeGenerator, encode_id
+
+
+def generate(worker_id: int, count: int) -> list:
+    generator = SnowflakeGenerator(worker_id)
+    return [generator.next_id() for _ in range(count)]
+
+
+def throughput(count: int) -> None:
+    generator = SnowflakeGenerator(0)
+    started = time.perf_counter()
+    for _ in range(count):
+        generator.next_id()
+    raw = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(count):
+        encode_id(generator.next_id())
+    encoded = time.perf_counter() - started
+
+    print(f"single process  {count / raw / 1e6:6.2f} M ids/s  {count / encoded / 1e6:6.2f} M encoded ids/s")
+
+
+def across_processes(count: int, processes: int) -> None:
+    started = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        batches = pool.starmap(generate, [(worker_id, count) for worker_id in range(processes)])
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(batch) for batch in batches)
+    unique = len(set().union(*batches))
+    ordered = all(batch == sorted(batch) for batch in batches)
+    print(
+        f"{processes} processes     {total / elapsed / 1e6:6.2f} M ids/s  "
+        f"{total} ids, {total - unique} duplicates, per-worker ordered: {ordered}"
+    )
+    if unique != total or not ordered:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ids", type=int, default=1000000, help="IDs per process")
+    parser.add_argument("--processes", type=int, default=8)
+    args = parser.parse_args()
+    throughput(args.ids)
+    across_processes(args.ids, args.processes)
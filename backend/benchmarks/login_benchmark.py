@@ -0,0 +1,145 @@
+"""Login storm benchmark: /api/checkin latency while /auth/token is hammered.
+
+Seeds one user with a real bcrypt hash and one flight of bookings, then checks
+every booking in through the app while a storm of logins runs on the same
+event loop: once with bcrypt inline in the handler, as before, and once
+through the password pool. Prints /api/checkin p50/p99 for each, next to a
+run without logins. Uses DATABASE_URL (a throwaway database!) or a temporary
+SQLite file by default.
+
+    python -m benchmarks.login_benchmark --checkins 300 --logins 200
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.auth import get_password_hash
+from app.core.database import get_db
+from app.core.dependencies import get_current_active_user
+from app.core.models import Base, Booking, Flight, Passenger
+from app.core.password_pool import password_pool
+from app.core.user_models import User
+from app.routes import auth as auth_routes
+from main_refactored import app
+
+PASSWORD = "bench-password"
+
+
+class InlinePasswordPool:
+    """bcrypt on the event loop, the way the handlers ran it before the pool"""
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+async def seed(session_factory, flight_id: str, bookings: int) -> list:
+    async with session_factory() as session:
+        session.add(Flight(
+            flight_id=flight_id,
+            departure_airport="JFK",
+            arrival_airport="LAX",
+            departure_time=datetime.utcnow() + timedelta(hours=6),
+            arrival_time=datetime.utcnow() + timedelta(hours=12),
+            aircraft_type="Boeing 777",
+            total_seats=bookings,
+            available_seats=0,
+            status="scheduled"
+        ))
+        requests = []
+        for i in range(bookings):
+            passenger_id = f"{flight_id}-P{i}"
+            booking_id = f"{flight_id}-B{i:06d}"
+            session.add(Passenger(
+                passenger_id=passenger_id,
+                first_name="Bench",
+                last_name=str(i),
+                email=f"{passenger_id.lower()}@bench.test",
+                phone="+10000000000",
+                date_of_birth="1990-01-01"
+            ))
+            session.add(Booking(booking_id=booking_id, flight_id=flight_id, passenger_id=passenger_id, seat_number=f"{i + 1}A"))
+            requests.append({"booking_id": booking_id, "passenger_id": passenger_id})
+        await session.commit()
+    return requests
+
+
+async def run(name: str, client: AsyncClient, requests: list, logins: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def checkin(body):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post("/api/checkin", json=body)
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 201, response.text
+
+    async def login():
+        response = await client.post("/auth/token", data={"username": "bench", "password": PASSWORD})
+        assert response.status_code in (200, 503), response.text
+
+    started = time.perf_counter()
+    await asyncio.gather(*(checkin(r) for r in requests), *(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(
+        f"{name:<8} {elapsed:6.2f} s  "
+        f"checkin p50 {statistics.median(latencies):8.2f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1]:8.2f} ms"
+    )
+
+
+async def main(checkins: int, logins: int, concurrency: int) -> None:
+    url = os.getenv("DATABASE_URL") or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/login_bench.db"
+    engine_kwargs = {"connect_args": {"timeout": 60}} if url.startswith("sqlite") else {}
+    engine = create_async_engine(url, **engine_kwargs)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        session.add(User(username="bench", email="bench@bench.test", hashed_password=get_password_hash(PASSWORD)))
+        await session.commit()
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    # Per-request access logs would dominate the timings
+    logging.disable(logging.INFO)
+    app.dependency_overrides[get_db] = override_get_db
+    # Check-ins authenticate as a fixed user, so only the logins hash passwords
+    app.dependency_overrides[get_current_active_user] = lambda: User(id=1, username="bench", is_active=True)
+
+    print(f"{checkins} check-ins, {logins} logins, {password_pool.workers} hash workers, {engine.url.get_backend_name()}")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await run("quiet", client, await seed(session_factory, "BENCH1", checkins), 0, concurrency)
+        auth_routes.password_pool = InlinePasswordPool()
+        await run("inline", client, await seed(session_factory, "BENCH2", checkins), logins, concurrency)
+        auth_routes.password_pool = password_pool
+        await run("pool", client, await seed(session_factory, "BENCH3", checkins), logins, concurrency)
+    print(password_pool.stats())
+
+    app.dependency_overrides.clear()
+    password_pool.shutdown()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checkins", type=int, default=300)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.checkins, args.logins, args.concurrency))
@@ -0,0 +1,122 @@
+"""Flight search benchmark: indexed SQL vs the in-memory route index.
+
+Seeds N upcoming flights over a set of airports, then runs the same random
+searches (route, origin, destination or status, over a departure window)
+through FlightRepository.get_page against the database and against the
+route index, and prints per-search latency. Uses DATABASE_URL (a throwaway
+database!) or a temporary SQLite file by default.
+
+    python -m benchmarks.search_benchmark --flights 200000 --searches 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.flight_cache import BYPASS_CACHE
+from app.core.models import Base, Flight
+from app.core.route_index import route_index
+from app.core.schemas import FlightSearch
+from app.repositories.flight_repository import FlightRepository
+
+AIRPORTS = ["JFK", "LAX", "ORD", "ATL", "SFO", "SEA", "MIA", "DEN", "BOS", "DFW", "LHR", "CDG", "FRA", "NRT", "SYD"]
+STATUSES = ["scheduled", "scheduled", "scheduled", "delayed", "cancelled"]
+
+
+async def seed(session_factory, flights: int, start: datetime) -> None:
+    rng = random.Random(1)
+    async with session_factory() as session:
+        for offset in range(0, flights, 10000):
+            rows = []
+            for i in range(offset, min(offset + 10000, flights)):
+                origin, destination = rng.sample(AIRPORTS, 2)
+                departure = start + timedelta(minutes=rng.randrange(60 * 24 * 180))
+                rows.append({
+                    "flight_id": f"S{i:07d}",
+                    "departure_airport": origin,
+                    "arrival_airport": destination,
+                    "departure_time": departure,
+                    "arrival_time": departure + timedelta(hours=5),
+                    "aircraft_type": "Boeing 737",
+                    "total_seats": 180,
+                    "available_seats": rng.randrange(181),
+                    "status": rng.choice(STATUSES),
+                })
+            await session.execute(insert(Flight), rows)
+        await session.commit()
+
+
+def searches(count: int, start: datetime) -> list:
+    rng = random.Random(2)
+    result = []
+    for _ in range(count):
+        origin, destination = rng.sample(AIRPORTS, 2)
+        departure_from = start + timedelta(days=rng.randrange(170))
+        shape = rng.randrange(4)
+        result.append(FlightSearch(
+            departure_airport=origin if shape in (0, 1) else None,
+            arrival_airport=destination if shape in (0, 2) else None,
+            status="delayed" if shape == 3 else None,
+            departure_from=departure_from,
+            departure_to=departure_from + timedelta(days=7),
+        ))
+    return result
+
+
+async def run(name: str, session_factory, queries: list, limit: int, bypass: bool) -> None:
+    latencies = []
+    async with session_factory() as session:
+        if bypass:
+            session.info[BYPASS_CACHE] = True
+        repo = FlightRepository(session)
+        for search in queries:
+            started = time.perf_counter()
+            await repo.get_page(limit, None, search)
+            latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    print(
+        f"{name:<6} p50 {statistics.median(latencies):8.3f} ms  "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1]:8.3f} ms  "
+        f"{len(queries) / (sum(latencies) / 1000):9.0f} searches/s"
+    )
+
+
+async def main(flights: int, count: int, limit: int) -> None:
+    url = os.getenv("DATABASE_URL") or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/search_bench.db"
+    engine = create_async_engine(url)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    start = datetime.utcnow() + timedelta(hours=1)
+    await seed(session_factory, flights, start)
+
+    started = time.perf_counter()
+    async with session_factory() as session:
+        await route_index.rebuild(session)
+    print(f"{flights} flights, {count} searches of up to {limit}, {engine.url.get_backend_name()}; "
+          f"index built in {time.perf_counter() - started:.2f} s")
+
+    queries = searches(count, start)
+    await run("sql", session_factory, queries, limit, bypass=True)
+    await run("index", session_factory, queries, limit, bypass=False)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flights", type=int, default=200000)
+    parser.add_argument("--searches", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.flights, args.searches, args.limit))
@@ -1,25 +1,38 @@
-from fastapi import FastAPI, Depends, Request, status
+from fastapi import FastAPI, Depends, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
-from typing import List
+from pydantic import ValidationError
+from typing import List, Optional
 import logging
 import time
 
-from app.core.database import create_tables, get_db, engine
+from app.core.database import get_db, engine, AsyncSessionLocal
+from app.core.seat_counts import seat_counts
+from app.core.revocation import revocation_list
+from app.core.route_index import route_index
+from app.core.connections import CONNECTION_MAX_LEGS
+from app.core.password_pool import password_pool
+from app.core.provisioning import hash_pool
+from app.core.schema import prepare_schema
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
 from app.repositories.flight_repository import FlightRepository
 from app.repositories.passenger_repository import PassengerRepository
 from app.repositories.booking_repository import BookingRepository
 from app.repositories.checkin_repository import CheckinRepository
+from app.repositories.notification_repository import NotificationRepository
 from app.services.flight_service import FlightService
 from app.services.passenger_service import PassengerService
 from app.services.booking_service import BookingService
+from app.services.disruption_service import DisruptionService
 from app.core.schemas import *
-from app.core.dependencies import get_current_active_user
+from app.core.dependencies import get_current_active_user, get_current_admin_user, get_read_db, get_unit_of_work, pin_to_primary
+from app.core.unit_of_work import UnitOfWork
 from app.core.user_models import User
 from app.routes.auth import router as auth_router
+from app.routes.admin import router as admin_router
 
 # Import exception handlers
 from app.core.exceptions import BaseCustomException
@@ -49,6 +62,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Add global exception handlers
@@ -66,45 +80,124 @@ async def log_requests(request: Request, call_next):
     return response
 
 # Dependency injection
-def get_flight_service(db: AsyncSession = Depends(get_db)) -> FlightService:
-    return FlightService(FlightRepository(db))
+def get_flight_service(db: AsyncSession = Depends(get_db), uow: UnitOfWork = Depends(get_unit_of_work)) -> FlightService:
+    return FlightService(FlightRepository(db), uow)
 
-def get_passenger_service(db: AsyncSession = Depends(get_db)) -> PassengerService:
-    return PassengerService(PassengerRepository(db))
+def get_passenger_service(db: AsyncSession = Depends(get_db), uow: UnitOfWork = Depends(get_unit_of_work)) -> PassengerService:
+    return PassengerService(PassengerRepository(db), uow)
 
-def get_booking_service(db: AsyncSession = Depends(get_db)) -> BookingService:
+def get_booking_service(db: AsyncSession = Depends(get_db), uow: UnitOfWork = Depends(get_unit_of_work)) -> BookingService:
     return BookingService(
         BookingRepository(db),
         FlightRepository(db),
         PassengerRepository(db),
-        CheckinRepository(db)
+        CheckinRepository(db),
+        uow
     )
 
-# Include auth router
+def get_disruption_service(db: AsyncSession = Depends(get_db), uow: UnitOfWork = Depends(get_unit_of_work)) -> DisruptionService:
+    return DisruptionService(
+        FlightRepository(db),
+        BookingRepository(db),
+        CheckinRepository(db),
+        NotificationRepository(db),
+        uow
+    )
+
+# Read-only routes use replica sessions when DATABASE_REPLICA_URLS is set
+def get_read_flight_service(db: AsyncSession = Depends(get_read_db)) -> FlightService:
+    return get_flight_service(db, UnitOfWork(db))
+
+def get_read_passenger_service(db: AsyncSession = Depends(get_read_db)) -> PassengerService:
+    return get_passenger_service(db, UnitOfWork(db))
+
+def get_read_booking_service(db: AsyncSession = Depends(get_read_db)) -> BookingService:
+    return get_booking_service(db, UnitOfWork(db))
+
+def get_flight_search(
+    departure_airport: Optional[str] = None,
+    arrival_airport: Optional[str] = None,
+    departure_from: Optional[datetime] = None,
+    departure_to: Optional[datetime] = None,
+    flight_status: Optional[str] = Query(None, alias="status")
+) -> FlightSearch:
+    try:
+        return FlightSearch(
+            departure_airport=departure_airport,
+            arrival_airport=arrival_airport,
+            departure_from=departure_from,
+            departure_to=departure_to,
+            status=flight_status
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+# Include auth and admin routers
 app.include_router(auth_router)
+app.include_router(admin_router)
 
 # Routes
-@app.post("/api/flights", response_model=FlightResponse, status_code=status.HTTP_201_CREATED, tags=["flights"])
+@app.post("/api/flights", response_model=FlightResponse, status_code=status.HTTP_201_CREATED, tags=["flights"], dependencies=[Depends(pin_to_primary)])
 async def create_flight(flight_data: FlightCreate, service: FlightService = Depends(get_flight_service), current_user: User = Depends(get_current_active_user)):
     return await service.create_flight(flight_data)
 
 @app.get("/api/flights", response_model=List[FlightResponse], tags=["flights"])
 async def get_flights(
-    service: FlightService = Depends(get_flight_service),
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    search: FlightSearch = Depends(get_flight_search),
+    service: FlightService = Depends(get_read_flight_service),
     current_user: User = Depends(get_current_active_user),
     token: str = Depends(security)
 ):
-    return await service.get_all_flights()
+    """Flights matching the filters by departure time; pass the X-Next-Cursor response header back as cursor for the next page"""
+    page = await service.get_flights_page(limit, cursor, search)
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+@app.post("/api/flights/batch", response_model=List[FlightResponse], tags=["flights"])
+async def get_flights_by_ids(
+    request: BulkIds,
+    service: FlightService = Depends(get_read_flight_service),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Flights with the given ids, in that order; unknown ids are left out"""
+    return await service.get_flights(request.ids)
+
+@app.get("/api/connections", response_model=List[ItineraryResponse], tags=["flights"])
+def get_connections(
+    origin: str,
+    destination: str,
+    departure_from: Optional[datetime] = None,
+    departure_to: Optional[datetime] = None,
+    limit: int = Query(5, ge=1, le=20),
+    max_legs: int = Query(CONNECTION_MAX_LEGS, ge=1, le=4),
+    seats: int = Query(1, ge=1),
+    service: FlightService = Depends(get_read_flight_service),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Itineraries from origin to destination, earliest arrival first; the first leg departs in [departure_from, departure_to)"""
+    # A plain def: the CPU-bound search runs in the threadpool, not on the event loop
+    search = get_flight_search(departure_from=departure_from, departure_to=departure_to, flight_status=None)
+    return service.find_connections(
+        origin, destination, search.departure_from, search.departure_to, limit, max_legs, seats
+    )
 
 @app.get("/api/flights/{flight_id}", response_model=FlightResponse, tags=["flights"])
 async def get_flight(
     flight_id: str, 
-    service: FlightService = Depends(get_flight_service),
+    service: FlightService = Depends(get_read_flight_service),
     current_user: User = Depends(get_current_active_user)
 ):
     return await service.get_flight(flight_id)
 
-@app.post("/api/passengers", response_model=PassengerResponse, status_code=status.HTTP_201_CREATED, tags=["passengers"])
+@app.post("/api/flights/{flight_id}/cancel", response_model=FlightCancellationResponse, tags=["flights"], dependencies=[Depends(pin_to_primary)])
+async def cancel_flight(flight_id: str, service: DisruptionService = Depends(get_disruption_service), current_user: User = Depends(get_current_admin_user)):
+    return await service.cancel_flight(flight_id)
+
+@app.post("/api/passengers", response_model=PassengerResponse, status_code=status.HTTP_201_CREATED, tags=["passengers"], dependencies=[Depends(pin_to_primary)])
 async def create_passenger(
     passenger_data: PassengerCreate, 
     service: PassengerService = Depends(get_passenger_service),
@@ -115,7 +208,7 @@ async def create_passenger(
 @app.get("/api/passengers/{passenger_id}", response_model=PassengerResponse, tags=["passengers"])
 async def get_passenger(
     passenger_id: str, 
-    service: PassengerService = Depends(get_passenger_service),
+    service: PassengerService = Depends(get_read_passenger_service),
     current_user: User = Depends(get_current_active_user)
 ):
     return await service.get_passenger(passenger_id)
@@ -123,24 +216,44 @@ async def get_passenger(
 @app.get("/api/passengers/{passenger_id}/bookings", response_model=List[BookingResponse], tags=["passengers"])
 async def get_passenger_bookings(
     passenger_id: str, 
-    service: PassengerService = Depends(get_passenger_service),
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    service: PassengerService = Depends(get_read_passenger_service),
     current_user: User = Depends(get_current_active_user)
 ):
-    return await service.get_passenger_bookings(passenger_id)
+    """Bookings by booking date; paged like GET /api/flights"""
+    page = await service.get_passenger_bookings_page(passenger_id, limit, cursor)
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
 
-@app.post("/api/bookings", response_model=BookingResponse, status_code=status.HTTP_201_CREATED, tags=["bookings"])
+@app.post("/api/bookings", response_model=BookingResponse, status_code=status.HTTP_201_CREATED, tags=["bookings"], dependencies=[Depends(pin_to_primary)])
 async def create_booking(booking_data: BookingCreate, service: BookingService = Depends(get_booking_service), current_user: User = Depends(get_current_active_user)):
     return await service.create_booking(booking_data)
 
+@app.post("/api/bookings/group", response_model=List[BookingResponse], status_code=status.HTTP_201_CREATED, tags=["bookings"], dependencies=[Depends(pin_to_primary)])
+async def create_group_booking(group: GroupBookingCreate, service: BookingService = Depends(get_booking_service), current_user: User = Depends(get_current_active_user)):
+    return await service.create_group_booking(group)
+
+@app.post("/api/bookings/batch", response_model=List[BookingResponse], tags=["bookings"])
+async def get_bookings_by_ids(
+    request: BulkIds,
+    service: BookingService = Depends(get_read_booking_service),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Bookings with the given ids, in that order; unknown ids are left out"""
+    return await service.get_bookings(request.ids)
+
 @app.get("/api/bookings/{booking_id}", response_model=BookingResponse, tags=["bookings"])
 async def get_booking(
     booking_id: str, 
-    service: BookingService = Depends(get_booking_service),
+    service: BookingService = Depends(get_read_booking_service),
     current_user: User = Depends(get_current_active_user)
 ):
     return await service.get_booking(booking_id)
 
-@app.delete("/api/bookings/{booking_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["bookings"])
+@app.delete("/api/bookings/{booking_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["bookings"], dependencies=[Depends(pin_to_primary)])
 async def cancel_booking(
     booking_id: str, 
     service: BookingService = Depends(get_booking_service),
@@ -148,35 +261,64 @@ async def cancel_booking(
 ):
     await service.cancel_booking(booking_id)
 
-@app.post("/api/checkin", response_model=BoardingPassResponse, status_code=status.HTTP_201_CREATED, tags=["checkin"])
+@app.post("/api/checkin", response_model=BoardingPassResponse, status_code=status.HTTP_201_CREATED, tags=["checkin"], dependencies=[Depends(pin_to_primary)])
 async def checkin(checkin_data: CheckinRequest, service: BookingService = Depends(get_booking_service), current_user: User = Depends(get_current_active_user)):
     return await service.checkin(checkin_data)
 
+@app.post("/api/checkin/group", response_model=List[BoardingPassResponse], status_code=status.HTTP_201_CREATED, tags=["checkin"], dependencies=[Depends(pin_to_primary)])
+async def group_checkin(group: GroupCheckinRequest, service: BookingService = Depends(get_booking_service), current_user: User = Depends(get_current_active_user)):
+    return await service.group_checkin(group)
+
 @app.get("/api/checkin/{checkin_id}", response_model=BoardingPassResponse, tags=["checkin"])
 async def get_boarding_pass(
     checkin_id: str, 
-    service: BookingService = Depends(get_booking_service),
+    service: BookingService = Depends(get_read_booking_service),
     current_user: User = Depends(get_current_active_user)
 ):
     return await service.get_boarding_pass(checkin_id)
 
+@app.post("/api/bookings/checkin-status", response_model=List[CheckinStatusResponse], tags=["checkin"])
+async def get_checkin_statuses(
+    request: BulkIds,
+    service: BookingService = Depends(get_read_booking_service),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Check-in status of each given booking, in that order"""
+    return await service.get_checkin_statuses(request.ids)
+
 @app.get("/api/bookings/{booking_id}/checkin-status", tags=["checkin"])
 async def get_checkin_status(
     booking_id: str, 
-    service: BookingService = Depends(get_booking_service),
+    service: BookingService = Depends(get_read_booking_service),
     current_user: User = Depends(get_current_active_user)
 ):
     return await service.get_checkin_status(booking_id)
 
+@app.get("/api/trips/{booking_id}", response_model=TripResponse, tags=["bookings"])
+async def get_trip(
+    booking_id: str,
+    service: BookingService = Depends(get_read_booking_service),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Booking with its flight, passenger and boarding pass, loaded in one query"""
+    return await service.get_trip(booking_id)
+
 @app.on_event("startup")
 async def startup_event():
-    logger.info("Creating database tables...")
-    # Drop and recreate users table to fix schema
-    from sqlalchemy import text
-    async with engine.begin() as conn:
-        await conn.execute(text("DROP TABLE IF EXISTS users CASCADE"))
-    await create_tables()
-    logger.info("Database tables created successfully")
+    # Only checks the revision by default; migrations run as a deploy step
+    await prepare_schema(engine)
+    seat_counts.start(AsyncSessionLocal)
+    revocation_list.start(AsyncSessionLocal)
+    route_index.start(AsyncSessionLocal)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Writes out the seat counts still pending
+    await seat_counts.stop(AsyncSessionLocal)
+    await revocation_list.stop()
+    await route_index.stop()
+    password_pool.shutdown()
+    hash_pool.shutdown()
 
 @app.get("/")
 async def root():
@@ -1,6 +1,5 @@
 from sqlalchemy.ext.asyncio import create_async_engine
-from app.core.models import Base
-from app.core.user_models import User
+from app.core.schema import upgrade_schema
 import asyncio
 import os
 
@@ -12,15 +11,11 @@ DATABASE_URL = os.getenv(
 async def migrate_database():
     engine = create_async_engine(DATABASE_URL, echo=True)
     
-    async with engine.begin() as conn:
-        # Drop users table if exists
-        await conn.execute("DROP TABLE IF EXISTS users CASCADE")
-        
-        # Recreate all tables
-        await conn.run_sync(Base.metadata.create_all)
+    # Same as `alembic upgrade head`
+    await upgrade_schema(engine)
     
     await engine.dispose()
     print("Database migration completed successfully!")
 
 if __name__ == "__main__":
-    asyncio.run(migrate_database())
\ No newline at end of file
+    asyncio.run(migrate_database())
@@ -0,0 +1,109 @@
+"""Initial schema
+
+Matches what Base.metadata.create_all produced before migrations were
+introduced. Databases created that way should be stamped with this revision
+(``alembic stamp 0001``) and then upgraded.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'flights',
+        sa.Column('flight_id', sa.String(), nullable=False),
+        sa.Column('departure_airport', sa.String(), nullable=False),
+        sa.Column('arrival_airport', sa.String(), nullable=False),
+        sa.Column('departure_time', sa.DateTime(), nullable=False),
+        sa.Column('arrival_time', sa.DateTime(), nullable=False),
+        sa.Column('aircraft_type', sa.String(), nullable=False),
+        sa.Column('total_seats', sa.Integer(), nullable=False),
+        sa.Column('available_seats', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('flight_id')
+    )
+    op.create_index('ix_flights_flight_id', 'flights', ['flight_id'], unique=False)
+
+    op.create_table(
+        'passengers',
+        sa.Column('passenger_id', sa.String(), nullable=False),
+        sa.Column('first_name', sa.String(), nullable=False),
+        sa.Column('last_name', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('phone', sa.String(), nullable=False),
+        sa.Column('date_of_birth', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('passenger_id')
+    )
+    op.create_index('ix_passengers_email', 'passengers', ['email'], unique=True)
+    op.create_index('ix_passengers_passenger_id', 'passengers', ['passenger_id'], unique=False)
+
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+
+    op.create_table(
+        'bookings',
+        sa.Column('booking_id', sa.String(), nullable=False),
+        sa.Column('flight_id', sa.String(), nullable=False),
+        sa.Column('passenger_id', sa.String(), nullable=False),
+        sa.Column('seat_number', sa.String(), nullable=False),
+        sa.Column('booking_status', sa.String(), nullable=True),
+        sa.Column('booking_date', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['flight_id'], ['flights.flight_id']),
+        sa.ForeignKeyConstraint(['passenger_id'], ['passengers.passenger_id']),
+        sa.PrimaryKeyConstraint('booking_id')
+    )
+    op.create_index('ix_bookings_booking_id', 'bookings', ['booking_id'], unique=False)
+
+    op.create_table(
+        'checkin_records',
+        sa.Column('checkin_id', sa.String(), nullable=False),
+        sa.Column('booking_id', sa.String(), nullable=False),
+        sa.Column('checkin_time', sa.DateTime(), nullable=True),
+        sa.Column('boarding_pass_number', sa.String(), nullable=False),
+        sa.Column('gate_number', sa.String(), nullable=True),
+        sa.Column('boarding_group', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['booking_id'], ['bookings.booking_id']),
+        sa.PrimaryKeyConstraint('checkin_id'),
+        sa.UniqueConstraint('boarding_pass_number')
+    )
+    op.create_index('ix_checkin_records_checkin_id', 'checkin_records', ['checkin_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_checkin_records_checkin_id', table_name='checkin_records')
+    op.drop_table('checkin_records')
+    op.drop_index('ix_bookings_booking_id', table_name='bookings')
+    op.drop_table('bookings')
+    op.drop_index('ix_users_username', table_name='users')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
+    op.drop_index('ix_passengers_passenger_id', table_name='passengers')
+    op.drop_index('ix_passengers_email', table_name='passengers')
+    op.drop_table('passengers')
+    op.drop_index('ix_flights_flight_id', table_name='flights')
+    op.drop_table('flights')
@@ -0,0 +1,46 @@
+"""Hot path indexes
+
+Indexes the foreign keys that bookings and check-ins are looked up by, makes
+one check-in per booking a database guarantee, and indexes flight search by
+route and departure time. On Postgres the indexes are built CONCURRENTLY
+outside the migration transaction so large tables stay writable; a failed
+concurrent build leaves an INVALID index behind that must be dropped before
+retrying. The unique check-in index fails if duplicate check-ins already
+exist for a booking.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_bookings_flight_id', 'bookings', ['flight_id'], False),
+    ('ix_bookings_passenger_id', 'bookings', ['passenger_id'], False),
+    ('ix_checkin_records_booking_id', 'checkin_records', ['booking_id'], True),
+    ('ix_flights_departure_time', 'flights', ['departure_time'], False),
+    ('ix_flights_route_departure', 'flights', ['departure_airport', 'arrival_airport', 'departure_time'], False),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(name, table, columns, unique=unique, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
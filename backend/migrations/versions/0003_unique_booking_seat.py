@@ -0,0 +1,82 @@
+"""Unique live seat per flight
+
+Adds a partial unique index on bookings (flight_id, seat_number) over
+bookings that are not cancelled, the backstop for the in-memory seat maps.
+The old sequential seat assignment handed out the same seat twice after a
+cancellation, so live duplicates are moved to free seats of the cabin first:
+checked-in bookings keep their seat, then the earliest booking. On Postgres
+the index is built CONCURRENTLY outside the migration transaction.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from app.core.seat_map import layout_for
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE = "booking_status <> 'cancelled'"
+
+
+def reseat_duplicates(bind) -> None:
+    rows = bind.execute(sa.text(f"""
+        SELECT b.booking_id, b.flight_id, b.seat_number, f.aircraft_type, f.total_seats
+        FROM bookings b JOIN flights f ON f.flight_id = b.flight_id
+        WHERE b.{LIVE} AND b.flight_id IN (
+            SELECT flight_id FROM bookings WHERE {LIVE}
+            GROUP BY flight_id, seat_number HAVING count(*) > 1
+        )
+        ORDER BY b.flight_id, b.booking_status <> 'checked_in', b.booking_date
+    """)).all()
+
+    flights = {}
+    for row in rows:
+        flights.setdefault(row.flight_id, []).append(row)
+
+    for flight_id, bookings in flights.items():
+        seated, moving = set(), []
+        for booking in bookings:
+            if booking.seat_number in seated:
+                moving.append(booking.booking_id)
+            else:
+                seated.add(booking.seat_number)
+        layout = layout_for(bookings[0].aircraft_type, bookings[0].total_seats)
+        free = [seat for seat in layout.seat_numbers() if seat not in seated]
+        if len(free) < len(moving):
+            raise RuntimeError(f"Flight {flight_id} has more live bookings than seats; resolve it before migrating")
+        for booking_id, seat_number in zip(moving, free):
+            bind.execute(
+                sa.text("UPDATE bookings SET seat_number = :seat_number WHERE booking_id = :booking_id"),
+                {"seat_number": seat_number, "booking_id": booking_id}
+            )
+
+
+def upgrade() -> None:
+    # Offline SQL scripts cannot read the data; reseat before running them
+    if not context.is_offline_mode():
+        reseat_duplicates(op.get_bind())
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_bookings_flight_seat', 'bookings', ['flight_id', 'seat_number'],
+            unique=True,
+            postgresql_where=sa.text(LIVE),
+            sqlite_where=sa.text(LIVE),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_bookings_flight_seat', table_name='bookings', postgresql_concurrently=True, if_exists=True)
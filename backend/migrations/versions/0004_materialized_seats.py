@@ -0,0 +1,112 @@
+"""Materialized seats
+
+One row per seat of every flight, claimed by bookings with SKIP LOCKED
+instead of decrementing flights.available_seats. Existing flights are
+backfilled from their cabin layout and live bookings; a live booking whose
+seat does not exist in the cabin (the old sequential assignment produced
+rows past the last one) is moved to the frontmost free seat, checked-in
+bookings first. available_seats is recomputed from the seats afterwards.
+Offline SQL scripts create the table only; backfill by running the
+migration online.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from app.core.seat_map import layout_for
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+seats = sa.table(
+    'seats',
+    sa.column('flight_id', sa.String),
+    sa.column('seat_number', sa.String),
+    sa.column('seat_index', sa.Integer),
+    sa.column('booking_id', sa.String),
+)
+
+
+def backfill_seats(bind) -> None:
+    flights = bind.execute(sa.text("SELECT flight_id, aircraft_type, total_seats FROM flights")).all()
+    for flight in flights:
+        layout = layout_for(flight.aircraft_type, flight.total_seats)
+        seat_numbers = layout.seat_numbers()
+        holders = {}
+        unseated = []
+        bookings = bind.execute(sa.text("""
+            SELECT booking_id, seat_number FROM bookings
+            WHERE flight_id = :flight_id AND booking_status <> 'cancelled'
+            ORDER BY booking_status <> 'checked_in', booking_date
+        """), {"flight_id": flight.flight_id}).all()
+        for booking in bookings:
+            if layout.index_of(booking.seat_number) is not None and booking.seat_number not in holders:
+                holders[booking.seat_number] = booking.booking_id
+            else:
+                unseated.append(booking.booking_id)
+
+        free = (seat_number for seat_number in seat_numbers if seat_number not in holders)
+        for booking_id in unseated:
+            seat_number = next(free, None)
+            if seat_number is None:
+                raise RuntimeError(f"Flight {flight.flight_id} has more live bookings than seats; resolve it before migrating")
+            holders[seat_number] = booking_id
+            bind.execute(
+                sa.text("UPDATE bookings SET seat_number = :seat_number WHERE booking_id = :booking_id"),
+                {"seat_number": seat_number, "booking_id": booking_id}
+            )
+
+        if seat_numbers:
+            bind.execute(seats.insert(), [
+                {
+                    "flight_id": flight.flight_id,
+                    "seat_number": seat_number,
+                    "seat_index": index,
+                    "booking_id": holders.get(seat_number),
+                }
+                for index, seat_number in enumerate(seat_numbers)
+            ])
+
+    bind.execute(sa.text("""
+        UPDATE flights SET available_seats = (
+            SELECT count(*) FROM seats
+            WHERE seats.flight_id = flights.flight_id AND seats.booking_id IS NULL
+        )
+    """))
+
+
+def upgrade() -> None:
+    op.create_table(
+        'seats',
+        sa.Column('flight_id', sa.String(), nullable=False),
+        sa.Column('seat_number', sa.String(), nullable=False),
+        sa.Column('seat_index', sa.Integer(), nullable=False),
+        sa.Column('booking_id', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['flight_id'], ['flights.flight_id'], ),
+        sa.PrimaryKeyConstraint('flight_id', 'seat_number')
+    )
+    if not context.is_offline_mode():
+        backfill_seats(op.get_bind())
+    # Built after the backfill, on a table no one writes to yet
+    op.create_index('ix_seats_booking_id', 'seats', ['booking_id'], unique=True)
+    op.create_index(
+        'ix_seats_free', 'seats', ['flight_id', 'seat_index'],
+        postgresql_where=sa.text('booking_id IS NULL'),
+        sqlite_where=sa.text('booking_id IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_seats_free', table_name='seats')
+    op.drop_index('ix_seats_booking_id', table_name='seats')
+    op.drop_table('seats')
@@ -0,0 +1,40 @@
+"""Token revocations
+
+Revoked access tokens for the stateless auth mode: one row per revoked token
+(jti) or per user whose earlier tokens are all revoked (username). Workers
+load new rows incrementally by id; rows past expires_at are pruned.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'token_revocations',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('jti', sa.String(), nullable=True),
+        sa.Column('username', sa.String(), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_token_revocations_expires_at', 'token_revocations', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_token_revocations_expires_at', table_name='token_revocations')
+    op.drop_table('token_revocations')
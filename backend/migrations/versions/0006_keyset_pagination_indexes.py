@@ -0,0 +1,41 @@
+"""Keyset pagination indexes
+
+Indexes the sort keys of the paged listings: flights by (departure_time,
+flight_id) and a passenger's bookings by (booking_date, booking_id), so every
+page is an index range scan from the cursor instead of a sort of the table.
+On Postgres the indexes are built CONCURRENTLY outside the migration
+transaction.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_flights_departure_flight', 'flights', ['departure_time', 'flight_id']),
+    ('ix_bookings_passenger_date', 'bookings', ['passenger_id', 'booking_date', 'booking_id']),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
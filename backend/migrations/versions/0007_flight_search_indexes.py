@@ -0,0 +1,48 @@
+"""Flight search indexes
+
+Indexes the filters of GET /api/flights (route, origin, destination, status)
+followed by the listing order (departure_time, flight_id), so a filtered page
+is a range scan from the cursor with nothing to sort. The route index replaces
+ix_flights_route_departure, which lacked the flight_id tie-breaker. On
+Postgres the indexes are built CONCURRENTLY outside the migration transaction.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_flights_route_departure_flight', 'flights', ['departure_airport', 'arrival_airport', 'departure_time', 'flight_id']),
+    ('ix_flights_origin_departure', 'flights', ['departure_airport', 'departure_time', 'flight_id']),
+    ('ix_flights_destination_departure', 'flights', ['arrival_airport', 'departure_time', 'flight_id']),
+    ('ix_flights_status_departure', 'flights', ['status', 'departure_time', 'flight_id']),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_flights_route_departure', table_name='flights', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_flights_route_departure', 'flights', ['departure_airport', 'arrival_airport', 'departure_time'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
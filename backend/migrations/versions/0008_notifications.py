@@ -0,0 +1,49 @@
+"""Notifications
+
+Outbox of passenger notifications: rows are inserted in the same transaction
+as the change they announce (a flight cancellation enqueues one per booking
+in a single INSERT ... SELECT) and stay pending until sent_at is set.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notifications',
+        sa.Column('notification_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('passenger_id', sa.String(), nullable=False),
+        sa.Column('booking_id', sa.String(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['booking_id'], ['bookings.booking_id'], ),
+        sa.ForeignKeyConstraint(['passenger_id'], ['passengers.passenger_id'], ),
+        sa.PrimaryKeyConstraint('notification_id')
+    )
+    op.create_index('ix_notifications_booking_id', 'notifications', ['booking_id'], unique=False)
+    op.create_index(
+        'ix_notifications_pending', 'notifications', ['notification_id'],
+        postgresql_where=sa.text('sent_at IS NULL'),
+        sqlite_where=sa.text('sent_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_pending', table_name='notifications')
+    op.drop_index('ix_notifications_booking_id', table_name='notifications')
+    op.drop_table('notifications')
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, Boolean, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -15,13 +15,17 @@ class Flight(Base):
     flight_id = Column(String, primary_key=True, index=True)
     departure_airport = Column(String, nullable=False)
     arrival_airport = Column(String, nullable=False)
-    departure_time = Column(DateTime, nullable=False)
+    departure_time = Column(DateTime, nullable=False, index=True)
     arrival_time = Column(DateTime, nullable=False)
     aircraft_type = Column(String, nullable=False)
     total_seats = Column(Integer, nullable=False)
     available_seats = Column(Integer, nullable=False)
     status = Column(String, default="scheduled")
     
+    __table_args__ = (
+        Index("ix_flights_route_departure", "departure_airport", "arrival_airport", "departure_time"),
+    )
+    
     # Relationships
     bookings = relationship("Booking", back_populates="flight")
 
@@ -42,22 +46,50 @@ class Booking(Base):
     __tablename__ = "bookings"
     
     booking_id = Column(String, primary_key=True, index=True, default=generate_uuid)
-    flight_id = Column(String, ForeignKey("flights.flight_id"), nullable=False)
-    passenger_id = Column(String, ForeignKey("passengers.passenger_id"), nullable=False)
+    flight_id = Column(String, ForeignKey("flights.flight_id"), nullable=False, index=True)
+    passenger_id = Column(String, ForeignKey("passengers.passenger_id"), nullable=False, index=True)
     seat_number = Column(String, nullable=False)
     booking_status = Column(String, default="confirmed")
     booking_date = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        # Backstop for the seat-row claim: one live booking per seat
+        Index(
+            "uq_bookings_flight_seat", "flight_id", "seat_number",
+            unique=True,
+            postgresql_where=text("booking_status <> 'cancelled'"),
+            sqlite_where=text("booking_status <> 'cancelled'")
+        ),
+    )
+    
     # Relationships
     flight = relationship("Flight", back_populates="bookings")
     passenger = relationship("Passenger", back_populates="bookings")
     checkin = relationship("CheckinRecord", back_populates="booking", uselist=False)
 
+class Seat(Base):
+    __tablename__ = "seats"
+    
+    flight_id = Column(String, ForeignKey("flights.flight_id"), primary_key=True)
+    seat_number = Column(String, primary_key=True)
+    seat_index = Column(Integer, nullable=False)  # Cabin order, front to back
+    # Claimed before the booking row is inserted, so not a foreign key
+    booking_id = Column(String, unique=True, index=True)
+    
+    __table_args__ = (
+        # Free seats of a flight in cabin order, what bookings claim from
+        Index(
+            "ix_seats_free", "flight_id", "seat_index",
+            postgresql_where=text("booking_id IS NULL"),
+            sqlite_where=text("booking_id IS NULL")
+        ),
+    )
+
 class CheckinRecord(Base):
     __tablename__ = "checkin_records"
     
     checkin_id = Column(String, primary_key=True, index=True, default=generate_uuid)
-    booking_id = Column(String, ForeignKey("bookings.booking_id"), nullable=False)
+    booking_id = Column(String, ForeignKey("bookings.booking_id"), nullable=False, unique=True, index=True)
     checkin_time = Column(DateTime, default=datetime.utcnow)
     boarding_pass_number = Column(String, unique=True, nullable=False)
     gate_number = Column(String)
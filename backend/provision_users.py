@@ -0,0 +1,35 @@
+"""Bulk-create users from a CSV (with a header) or JSONL file of username, email, password.
+
+Streams the file in batches against DATABASE_URL and prints the report as JSON:
+how many users were created, and which lines were duplicates or invalid.
+
+    python provision_users.py agents.csv
+    python provision_users.py agents.jsonl --batch-size 1000 --processes 8
+"""
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.database import AsyncSessionLocal, engine
+from app.core.provisioning import (
+    PROVISIONING_BATCH_SIZE, PROVISIONING_HASH_PROCESSES, UserProvisioner, iterate
+)
+
+
+async def provision(path: str, fmt: str, batch_size: int, processes: int) -> None:
+    with open(path, encoding="utf-8-sig") as lines, ProcessPoolExecutor(max_workers=processes) as executor:
+        async with AsyncSessionLocal() as session:
+            report = await UserProvisioner(session, executor, processes, batch_size).run(iterate(lines), fmt)
+    await engine.dispose()
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=PROVISIONING_BATCH_SIZE)
+    parser.add_argument("--processes", type=int, default=PROVISIONING_HASH_PROCESSES)
+    args = parser.parse_args()
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "jsonl")
+    asyncio.run(provision(args.path, fmt, args.batch_size, args.processes))
@@ -69,7 +69,7 @@ class BookingCreate(BaseModel):
     @classmethod
     def validate_seat(cls, v):
         if v is not None:
-            pattern = r'^[1-9][0-9]?[A-F]$'
+            pattern = r'^[1-9][0-9]{0,2}[A-HJK]$'
             if not re.match(pattern, v.upper()):
                 raise ValueError('Seat must be in format like 12A')
             return v.upper()
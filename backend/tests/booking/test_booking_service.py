@@ -1,13 +1,13 @@
 import pytest
-from unittest.mock import Mock, AsyncMock, patch
+from unittest.mock import Mock, AsyncMock
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.booking.booking_service import BookingService
-from models import Booking, Flight, Passenger
+from models import Booking, Flight, Passenger, Seat
 from schemas import BookingCreate
 from app.shared.exceptions import (
     BookingNotFoundError, FlightNotFoundError, PassengerNotFoundError,
-    NoSeatsAvailableError
+    NoSeatsAvailableError, SeatNotAvailableError, BusinessValidationError
 )
 
 @pytest.fixture
@@ -46,13 +46,11 @@ def sample_passenger():
     )
 
 @pytest.mark.asyncio
-@patch('app.booking.booking_service.assign_seat')
-async def test_create_booking_success(mock_assign_seat, booking_service, sample_booking_data, sample_flight, sample_passenger):
+async def test_create_booking_success(booking_service, sample_booking_data, sample_flight, sample_passenger):
     # Arrange
-    mock_assign_seat.return_value = "12A"
-    booking_service.flight_repository.find_by_id = AsyncMock(return_value=sample_flight)
+    booking_service.flight_repository.claim_seat = AsyncMock(return_value="12A")
+    booking_service.flight_repository.find_by_id = AsyncMock()
     booking_service.passenger_repository.find_by_id = AsyncMock(return_value=sample_passenger)
-    booking_service.flight_repository.update_available_seats = AsyncMock()
     
     created_booking = Booking(booking_id="BK123", flight_id="FL123", passenger_id="PS123", seat_number="12A")
     booking_service.booking_repository.save = AsyncMock(return_value=created_booking)
@@ -62,13 +60,62 @@ async def test_create_booking_success(mock_assign_seat, booking_service, sample_
     
     # Assert
     assert result.booking_id == "BK123"
-    booking_service.flight_repository.find_by_id.assert_called_once_with("FL123")
+    flight_id, booking_id, seat_number = booking_service.flight_repository.claim_seat.call_args.args
+    assert (flight_id, seat_number) == ("FL123", "12A")
+    booking_service.flight_repository.find_by_id.assert_not_called()
     booking_service.passenger_repository.find_by_id.assert_called_once_with("PS123")
-    booking_service.flight_repository.update_available_seats.assert_called_once_with("FL123", -1)
+    saved = booking_service.booking_repository.save.call_args.args[0]
+    assert (saved.booking_id, saved.seat_number) == (booking_id, "12A")
+
+@pytest.mark.asyncio
+async def test_create_booking_assigns_next_free_seat(booking_service, sample_flight, sample_passenger):
+    # Arrange
+    booking_service.flight_repository.claim_seat = AsyncMock(return_value="1C")
+    booking_service.passenger_repository.find_by_id = AsyncMock(return_value=sample_passenger)
+    booking_service.booking_repository.save = AsyncMock(side_effect=lambda booking: booking)
+    
+    # Act
+    result = await booking_service.create_booking(BookingCreate(flight_id="FL123", passenger_id="PS123"), "user123")
+    
+    # Assert
+    assert result.seat_number == "1C"
+    assert booking_service.flight_repository.claim_seat.call_args.args[2] is None
+
+@pytest.mark.asyncio
+async def test_create_booking_seat_taken(booking_service, sample_booking_data, sample_flight, sample_passenger):
+    # Arrange
+    booking_service.flight_repository.claim_seat = AsyncMock(return_value=None)
+    booking_service.flight_repository.find_by_id = AsyncMock(return_value=sample_flight)
+    booking_service.flight_repository.find_seat = AsyncMock(return_value=Seat(flight_id="FL123", seat_number="12A"))
+    booking_service.passenger_repository.find_by_id = AsyncMock(return_value=sample_passenger)
+    booking_service.booking_repository.save = AsyncMock()
+    booking_service.db.rollback = AsyncMock()
+    
+    # Act & Assert
+    with pytest.raises(SeatNotAvailableError):
+        await booking_service.create_booking(sample_booking_data, "user123")
+    
+    booking_service.booking_repository.save.assert_not_called()
+    booking_service.db.rollback.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_create_booking_unknown_seat(booking_service, sample_booking_data, sample_flight, sample_passenger):
+    # Arrange
+    booking_service.flight_repository.claim_seat = AsyncMock(return_value=None)
+    booking_service.flight_repository.find_by_id = AsyncMock(return_value=sample_flight)
+    booking_service.flight_repository.find_seat = AsyncMock(return_value=None)
+    booking_service.passenger_repository.find_by_id = AsyncMock(return_value=sample_passenger)
+    booking_service.db.rollback = AsyncMock()
+    
+    # Act & Assert
+    with pytest.raises(BusinessValidationError):
+        await booking_service.create_booking(sample_booking_data, "user123")
 
 @pytest.mark.asyncio
-async def test_create_booking_flight_not_found(booking_service, sample_booking_data):
+async def test_create_booking_flight_not_found(booking_service, sample_booking_data, sample_passenger):
     # Arrange
+    booking_service.passenger_repository.find_by_id = AsyncMock(return_value=sample_passenger)
+    booking_service.flight_repository.claim_seat = AsyncMock(return_value=None)
     booking_service.flight_repository.find_by_id = AsyncMock(return_value=None)
     
     # Act & Assert
@@ -86,22 +133,23 @@ async def test_create_booking_passenger_not_found(booking_service, sample_bookin
         await booking_service.create_booking(sample_booking_data, "user123")
 
 @pytest.mark.asyncio
-async def test_create_booking_no_seats_available(booking_service, sample_booking_data, sample_passenger):
+async def test_create_booking_no_seats_available(booking_service, sample_passenger):
     # Arrange
     no_seats_flight = Flight(flight_id="FL123", available_seats=0)
+    booking_service.flight_repository.claim_seat = AsyncMock(return_value=None)
     booking_service.flight_repository.find_by_id = AsyncMock(return_value=no_seats_flight)
     booking_service.passenger_repository.find_by_id = AsyncMock(return_value=sample_passenger)
     
     # Act & Assert
     with pytest.raises(NoSeatsAvailableError):
-        await booking_service.create_booking(sample_booking_data, "user123")
+        await booking_service.create_booking(BookingCreate(flight_id="FL123", passenger_id="PS123"), "user123")
 
 @pytest.mark.asyncio
 async def test_create_booking_rollback_on_error(booking_service, sample_booking_data, sample_flight, sample_passenger):
     # Arrange
-    booking_service.flight_repository.find_by_id = AsyncMock(return_value=sample_flight)
+    booking_service.flight_repository.claim_seat = AsyncMock(return_value="12A")
     booking_service.passenger_repository.find_by_id = AsyncMock(return_value=sample_passenger)
-    booking_service.flight_repository.update_available_seats = AsyncMock(side_effect=Exception("DB Error"))
+    booking_service.booking_repository.save = AsyncMock(side_effect=Exception("DB Error"))
     booking_service.db.rollback = AsyncMock()
     
     # Act & Assert
@@ -137,7 +185,7 @@ async def test_cancel_booking_success(booking_service):
     sample_booking = Booking(booking_id="BK123", flight_id="FL123")
     booking_service.booking_repository.find_by_id = AsyncMock(return_value=sample_booking)
     booking_service.booking_repository.update_status = AsyncMock()
-    booking_service.flight_repository.update_available_seats = AsyncMock()
+    booking_service.flight_repository.release_seat = AsyncMock()
     booking_service.db.commit = AsyncMock()
     
     # Act
@@ -145,7 +193,7 @@ async def test_cancel_booking_success(booking_service):
     
     # Assert
     booking_service.booking_repository.update_status.assert_called_once_with("BK123", "cancelled")
-    booking_service.flight_repository.update_available_seats.assert_called_once_with("FL123", 1)
+    booking_service.flight_repository.release_seat.assert_called_once_with("BK123")
 
 @pytest.mark.asyncio
 async def test_cancel_booking_not_found(booking_service):
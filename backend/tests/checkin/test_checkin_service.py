@@ -1,4 +1,5 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -27,19 +28,15 @@ def sample_checkin_data():
     )
 
 @pytest.fixture
-def sample_booking():
-    return Booking(
+def checked_in_row():
+    # Shape of the row BookingRepository.mark_checked_in returns
+    return SimpleNamespace(
         booking_id="BK123",
         flight_id="FL123",
         passenger_id="PS123",
-        seat_number="12A"
-    )
-
-@pytest.fixture
-def sample_flight():
-    return Flight(
-        flight_id="FL123",
-        departure_time=datetime.utcnow() + timedelta(hours=2)
+        seat_number="12A",
+        departure_time=datetime.utcnow() + timedelta(hours=2),
+        already_checked_in=False
     )
 
 @pytest.mark.asyncio
@@ -47,24 +44,24 @@ def sample_flight():
 @patch('app.checkin.checkin_service.generate_boarding_pass_number')
 @patch('app.checkin.checkin_service.get_boarding_group')
 async def test_process_checkin_success(mock_boarding_group, mock_boarding_pass, mock_validate_window,
-                                     checkin_service, sample_checkin_data, sample_booking, sample_flight):
+                                     checkin_service, sample_checkin_data, checked_in_row):
     # Arrange
     mock_validate_window.return_value = (True, "")
     mock_boarding_pass.return_value = "BP123456"
     mock_boarding_group.return_value = "A"
     
-    checkin_service.booking_repository.find_booking_with_flight = AsyncMock(return_value=(sample_booking, sample_flight))
-    checkin_service.checkin_repository.find_by_booking_id = AsyncMock(return_value=None)
-    checkin_service.booking_repository.update_status = AsyncMock()
+    checkin_service.booking_repository.mark_checked_in = AsyncMock(return_value=checked_in_row)
+    checkin_service.checkin_repository.find_by_booking_id = AsyncMock()
     
     created_checkin = CheckinRecord(
         checkin_id="CI123",
         booking_id="BK123",
         boarding_pass_number="BP123456",
         boarding_group="A",
-        gate_number="A1"
+        gate_number="A1",
+        checkin_time=datetime.utcnow()
     )
-    checkin_service.checkin_repository.save = AsyncMock(return_value=created_checkin)
+    checkin_service.checkin_repository.save_if_absent = AsyncMock(return_value=created_checkin)
     
     # Act
     result = await checkin_service.process_checkin(sample_checkin_data, "user123")
@@ -72,56 +69,73 @@ async def test_process_checkin_success(mock_boarding_group, mock_boarding_pass,
     # Assert
     assert result.checkin_id == "CI123"
     assert result.boarding_pass_number == "BP123456"
-    checkin_service.booking_repository.update_status.assert_called_once_with("BK123", "checked_in")
+    assert result.flight_id == "FL123"
+    checkin_service.booking_repository.mark_checked_in.assert_called_once_with("BK123")
+    checkin_service.checkin_repository.find_by_booking_id.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_process_checkin_booking_not_found(checkin_service, sample_checkin_data):
     # Arrange
-    checkin_service.booking_repository.find_booking_with_flight = AsyncMock(return_value=None)
+    checkin_service.booking_repository.mark_checked_in = AsyncMock(return_value=None)
     
     # Act & Assert
     with pytest.raises(BookingNotFoundError):
         await checkin_service.process_checkin(sample_checkin_data, "user123")
 
 @pytest.mark.asyncio
-async def test_process_checkin_passenger_mismatch(checkin_service, sample_checkin_data, sample_flight):
+async def test_process_checkin_passenger_mismatch(checkin_service, sample_checkin_data, checked_in_row):
     # Arrange
-    wrong_booking = Booking(booking_id="BK123", passenger_id="WRONG", seat_number="12A")
-    checkin_service.booking_repository.find_booking_with_flight = AsyncMock(return_value=(wrong_booking, sample_flight))
+    checked_in_row.passenger_id = "WRONG"
+    checkin_service.booking_repository.mark_checked_in = AsyncMock(return_value=checked_in_row)
     
     # Act & Assert
     with pytest.raises(PassengerMismatchError):
         await checkin_service.process_checkin(sample_checkin_data, "user123")
 
 @pytest.mark.asyncio
-async def test_process_checkin_already_checked_in(checkin_service, sample_checkin_data, sample_booking, sample_flight):
+async def test_process_checkin_already_checked_in(checkin_service, sample_checkin_data, checked_in_row):
     # Arrange
-    existing_checkin = CheckinRecord(checkin_id="CI999", booking_id="BK123")
-    checkin_service.booking_repository.find_booking_with_flight = AsyncMock(return_value=(sample_booking, sample_flight))
-    checkin_service.checkin_repository.find_by_booking_id = AsyncMock(return_value=existing_checkin)
+    checked_in_row.already_checked_in = True
+    checkin_service.booking_repository.mark_checked_in = AsyncMock(return_value=checked_in_row)
+    checkin_service.checkin_repository.save_if_absent = AsyncMock()
+    checkin_service.db.rollback = AsyncMock()
     
     # Act & Assert
     with pytest.raises(AlreadyCheckedInError):
         await checkin_service.process_checkin(sample_checkin_data, "user123")
+    
+    checkin_service.checkin_repository.save_if_absent.assert_not_called()
+    checkin_service.db.rollback.assert_called_once()
+
+@pytest.mark.asyncio
+@patch('app.checkin.checkin_service.validate_checkin_window', return_value=(True, ""))
+async def test_process_checkin_concurrent_duplicate(mock_validate_window, checkin_service, sample_checkin_data, checked_in_row):
+    # Arrange: a concurrent request inserted first, so the guarded insert returns nothing
+    checkin_service.booking_repository.mark_checked_in = AsyncMock(return_value=checked_in_row)
+    checkin_service.checkin_repository.save_if_absent = AsyncMock(return_value=None)
+    checkin_service.db.rollback = AsyncMock()
+    
+    # Act & Assert
+    with pytest.raises(AlreadyCheckedInError):
+        await checkin_service.process_checkin(sample_checkin_data, "user123")
+    
+    checkin_service.db.rollback.assert_called_once()
 
 @pytest.mark.asyncio
 @patch('app.checkin.checkin_service.validate_checkin_window')
-async def test_process_checkin_window_error(mock_validate_window, checkin_service, sample_checkin_data, sample_booking, sample_flight):
+async def test_process_checkin_window_error(mock_validate_window, checkin_service, sample_checkin_data, checked_in_row):
     # Arrange
     mock_validate_window.return_value = (False, "Check-in window closed")
-    checkin_service.booking_repository.find_booking_with_flight = AsyncMock(return_value=(sample_booking, sample_flight))
-    checkin_service.checkin_repository.find_by_booking_id = AsyncMock(return_value=None)
+    checkin_service.booking_repository.mark_checked_in = AsyncMock(return_value=checked_in_row)
     
     # Act & Assert
     with pytest.raises(CheckinWindowError):
         await checkin_service.process_checkin(sample_checkin_data, "user123")
 
 @pytest.mark.asyncio
-async def test_process_checkin_rollback_on_error(checkin_service, sample_checkin_data, sample_booking, sample_flight):
+async def test_process_checkin_rollback_on_error(checkin_service, sample_checkin_data):
     # Arrange
-    checkin_service.booking_repository.find_booking_with_flight = AsyncMock(return_value=(sample_booking, sample_flight))
-    checkin_service.checkin_repository.find_by_booking_id = AsyncMock(return_value=None)
-    checkin_service.booking_repository.update_status = AsyncMock(side_effect=Exception("DB Error"))
+    checkin_service.booking_repository.mark_checked_in = AsyncMock(side_effect=Exception("DB Error"))
     checkin_service.db.rollback = AsyncMock()
     
     # Act & Assert
@@ -1,11 +1,26 @@
 import pytest
 import asyncio
+from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
 
-from app.core.models import Base
+from app.core.models import Base, Flight, Passenger
 from app.core.database import get_db
+from app.core.dependencies import get_current_active_user
+from app.core.flight_cache import flight_cache
+from app.core.principal_cache import principal_cache
+from app.core.revocation import revocation_list
+from app.core.route_index import route_index
+from app.core.seat_counts import seat_counts
+from app.core.token_cache import token_cache
+from app.core.unit_of_work import UnitOfWork
+from app.core.user_models import User
+from app.repositories.booking_repository import BookingRepository
+from app.repositories.checkin_repository import CheckinRepository
+from app.repositories.flight_repository import FlightRepository
+from app.repositories.passenger_repository import PassengerRepository
+from app.services.booking_service import BookingService
 from main_refactored import app
 
 # Test database URL
@@ -23,6 +38,36 @@ def event_loop():
     yield loop
     loop.close()
 
+@pytest.fixture(autouse=True)
+def clear_seat_counts():
+    """Pending seat counts live for the whole process; start every test without any."""
+    seat_counts.clear()
+
+@pytest.fixture(autouse=True)
+def clear_flight_cache():
+    """Cached flights live for the whole process; start every test with an empty cache."""
+    flight_cache.clear()
+
+@pytest.fixture(autouse=True)
+async def clear_principal_cache():
+    """Cached principals live for the whole process; start every test without any."""
+    await principal_cache.clear()
+
+@pytest.fixture(autouse=True)
+def clear_revocation_list():
+    """Revocations live for the whole process; start every test without any."""
+    revocation_list.clear()
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Verified tokens live for the whole process; start every test without any."""
+    token_cache.clear()
+
+@pytest.fixture(autouse=True)
+def clear_route_index():
+    """The route index lives for the whole process; start every test without one, so searches use SQL."""
+    route_index.clear()
+
 @pytest.fixture(scope="function")
 async def db_session():
     """Create a test database session."""
@@ -51,4 +96,78 @@ async def client(db_session):
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
     
-    app.dependency_overrides.clear()
\ No newline at end of file
+    app.dependency_overrides.clear()
+
+@pytest.fixture(scope="function")
+async def sqlite_session_factory(tmp_path):
+    """Session factory bound to a throwaway SQLite file, for tests that need real SQL."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    
+    await engine.dispose()
+
+@pytest.fixture(scope="function")
+async def sqlite_client(sqlite_session_factory):
+    """Client for the app on the SQLite session factory, signed in as an active agent."""
+    async def override_get_db():
+        async with sqlite_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = lambda: User(id=1, username="agent", is_active=True)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            yield ac
+    finally:
+        app.dependency_overrides.clear()
+
+def build_booking_service(session):
+    """BookingService on real repositories sharing one session, as a request builds it."""
+    return BookingService(
+        BookingRepository(session),
+        FlightRepository(session),
+        PassengerRepository(session),
+        CheckinRepository(session),
+        UnitOfWork(session)
+    )
+
+def make_flight(flight_id, seats=180, hours=6, **fields):
+    """Scheduled JFK-LAX flight departing ``hours`` from now with every seat free; ``fields`` override any column."""
+    departure_time = datetime.utcnow() + timedelta(hours=hours)
+    values = dict(
+        flight_id=flight_id,
+        departure_airport="JFK",
+        arrival_airport="LAX",
+        departure_time=departure_time,
+        arrival_time=departure_time + timedelta(hours=6),
+        aircraft_type="Boeing 737",
+        total_seats=seats,
+        available_seats=seats,
+        status="scheduled"
+    )
+    values.update(fields)
+    return Flight(**values)
+
+async def add_seated_flight(session, flight_id, seats=180, **fields):
+    """Add a make_flight flight to the session along with its seat rows."""
+    flight = make_flight(flight_id, seats, **fields)
+    session.add(flight)
+    await session.flush()
+    await FlightRepository(session).materialize_seats(flight)
+    return flight
+
+def make_passenger(passenger_id, **fields):
+    """Passenger with placeholder contact details; ``fields`` override any column."""
+    values = dict(
+        passenger_id=passenger_id,
+        first_name="John",
+        last_name="Doe",
+        email=f"{passenger_id.lower()}@test.com",
+        phone="+1234567890",
+        date_of_birth="1990-01-15"
+    )
+    values.update(fields)
+    return Passenger(**values)
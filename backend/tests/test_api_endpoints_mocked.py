@@ -39,32 +39,6 @@ async def test_create_flight_endpoint_mocked():
     data = response.json()
     assert data["flight_id"] == "TEST123"
 
-@pytest.mark.asyncio
-async def test_get_flights_endpoint_mocked():
-    """Test get flights endpoint with mocked services."""
-    mock_flights = [
-        Flight(
-            flight_id="TEST123",
-            departure_airport="JFK",
-            arrival_airport="LAX",
-            departure_time=datetime.utcnow() + timedelta(hours=6),
-            arrival_time=datetime.utcnow() + timedelta(hours=12),
-            aircraft_type="Boeing 737",
-            total_seats=180,
-            available_seats=150,
-            status="scheduled"
-        )
-    ]
-    
-    with patch('app.services.flight_service.FlightService.get_all_flights', return_value=mock_flights):
-        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-            response = await client.get("/api/flights")
-    
-    assert response.status_code == 200
-    data = response.json()
-    assert len(data) == 1
-    assert data[0]["flight_id"] == "TEST123"
-
 @pytest.mark.asyncio
 async def test_create_passenger_endpoint_mocked():
     """Test passenger creation endpoint with mocked services."""
@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import event
+
+from app.core.models import Booking, CheckinRecord
+from app.core.pagination import MAX_BULK_IDS
+from conftest import make_flight, make_passenger
+
+async def seed(session_factory):
+    async with session_factory() as session:
+        session.add(make_passenger("P-BR"))
+        for i in range(3):
+            session.add(make_flight(f"BR{i}"))
+            session.add(Booking(booking_id=f"B-BR{i}", flight_id=f"BR{i}", passenger_id="P-BR", seat_number=f"{i + 1}A"))
+        session.add(CheckinRecord(checkin_id="C-BR1", booking_id="B-BR1", boarding_pass_number="BPBR0001", boarding_group="A"))
+        await session.commit()
+
+@pytest.fixture
+async def client(sqlite_session_factory, sqlite_client):
+    await seed(sqlite_session_factory)
+    statements = []
+    event.listen(sqlite_session_factory.kw["bind"].sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    sqlite_client.statements = statements
+    return sqlite_client
+
+@pytest.mark.asyncio
+async def test_flights_by_ids_in_one_query(client):
+    """Test POST /api/flights/batch returns found flights in request order from one SELECT."""
+    response = await client.post("/api/flights/batch", json={"ids": ["BR2", "NONE", "BR0", "BR2"]})
+
+    assert response.status_code == 200
+    assert [flight["flight_id"] for flight in response.json()] == ["BR2", "BR0"]
+    assert len(client.statements) == 1
+
+@pytest.mark.asyncio
+async def test_bookings_by_ids_in_one_query(client):
+    """Test POST /api/bookings/batch returns found bookings in request order from one SELECT."""
+    response = await client.post("/api/bookings/batch", json={"ids": ["B-BR1", "B-BR0", "MISSING"]})
+
+    assert response.status_code == 200
+    assert [(b["booking_id"], b["seat_number"]) for b in response.json()] == [("B-BR1", "2A"), ("B-BR0", "1A")]
+    assert len(client.statements) == 1
+
+@pytest.mark.asyncio
+async def test_checkin_statuses_in_one_query(client):
+    """Test POST /api/bookings/checkin-status answers every booking from one SELECT."""
+    response = await client.post("/api/bookings/checkin-status", json={"ids": ["B-BR0", "B-BR1", "MISSING"]})
+
+    assert response.status_code == 200
+    assert [(s["booking_id"], s["checked_in"], s["checkin_id"]) for s in response.json()] == [
+        ("B-BR0", False, None), ("B-BR1", True, "C-BR1"), ("MISSING", False, None)
+    ]
+    assert len(client.statements) == 1
+
+@pytest.mark.asyncio
+async def test_bulk_reads_bound_the_id_count(client):
+    """Test bulk reads reject an empty id list and more than MAX_BULK_IDS ids."""
+    too_many = {"ids": [f"B{i}" for i in range(MAX_BULK_IDS + 1)]}
+
+    assert (await client.post("/api/bookings/batch", json={"ids": []})).status_code == 422
+    assert (await client.post("/api/flights/batch", json=too_many)).status_code == 422
+    assert client.statements == []
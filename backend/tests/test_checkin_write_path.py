@@ -0,0 +1,142 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import event, select, func, update
+
+from app.core.models import Flight, Booking, CheckinRecord
+from app.booking.booking_repository import BookingRepository as ModularBookingRepository
+from app.core.schemas import CheckinRequest
+from app.repositories.booking_checkin_repository import BookingRepository as BookingCheckinRepository
+from app.repositories.booking_repository import BookingRepository
+from conftest import build_booking_service, make_flight, make_passenger
+
+async def seed_booking(session_factory, hours_to_departure=6):
+    async with session_factory() as session:
+        session.add(make_flight("CK1", hours=hours_to_departure, available_seats=179))
+        session.add(make_passenger("P-CK"))
+        session.add(Booking(booking_id="B-CK", flight_id="CK1", passenger_id="P-CK", seat_number="12A"))
+        await session.commit()
+
+async def checkin(session_factory, passenger_id="P-CK"):
+    async with session_factory() as session:
+        return await build_booking_service(session).checkin(CheckinRequest(booking_id="B-CK", passenger_id=passenger_id))
+
+async def stored_state(session_factory):
+    async with session_factory() as session:
+        booking = await session.get(Booking, "B-CK")
+        checkins = await session.scalar(select(func.count()).select_from(CheckinRecord))
+        return booking.booking_status, checkins
+
+@pytest.mark.asyncio
+async def test_checkin_issues_two_statements(sqlite_session_factory):
+    """Test check-in is one UPDATE ... RETURNING plus one INSERT ... ON CONFLICT."""
+    await seed_booking(sqlite_session_factory)
+
+    async with sqlite_session_factory() as session:
+        statements = []
+        event.listen(session.sync_session.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        boarding_pass = await build_booking_service(session).checkin(
+            CheckinRequest(booking_id="B-CK", passenger_id="P-CK")
+        )
+
+    assert len(statements) == 2
+    assert statements[0].startswith("UPDATE bookings")
+    assert "ON CONFLICT" in statements[1]
+    assert boarding_pass.flight_id == "CK1"
+    assert boarding_pass.seat_number == "12A"
+    assert boarding_pass.checkin_id
+    assert await stored_state(sqlite_session_factory) == ("checked_in", 1)
+
+@pytest.mark.asyncio
+async def test_checkin_reads_its_own_flight_and_checkin(sqlite_session_factory):
+    """Test the RETURNING subqueries correlate to the updated booking only."""
+    await seed_booking(sqlite_session_factory)
+    async with sqlite_session_factory() as session:
+        session.add(Flight(
+            flight_id="CK2",
+            departure_airport="SFO",
+            arrival_airport="SEA",
+            departure_time=datetime.utcnow() + timedelta(hours=30),
+            arrival_time=datetime.utcnow() + timedelta(hours=32),
+            aircraft_type="Airbus A320",
+            total_seats=150,
+            available_seats=149,
+            status="scheduled"
+        ))
+        session.add(Booking(booking_id="B-OTHER", flight_id="CK2", passenger_id="P-CK", seat_number="3C", booking_status="checked_in"))
+        session.add(CheckinRecord(booking_id="B-OTHER", boarding_pass_number="CK2-OTHER", gate_number="A1", boarding_group="A"))
+        await session.commit()
+
+    boarding_pass = await checkin(sqlite_session_factory)
+
+    assert boarding_pass.flight_id == "CK1"
+    assert await stored_state(sqlite_session_factory) == ("checked_in", 2)
+
+@pytest.mark.asyncio
+async def test_second_checkin_conflicts(sqlite_session_factory):
+    """Test checking in twice returns 409 and keeps a single record."""
+    await seed_booking(sqlite_session_factory)
+
+    await checkin(sqlite_session_factory)
+    with pytest.raises(HTTPException) as exc_info:
+        await checkin(sqlite_session_factory)
+
+    assert exc_info.value.status_code == 409
+    assert await stored_state(sqlite_session_factory) == ("checked_in", 1)
+
+@pytest.mark.asyncio
+async def test_failed_validation_rolls_back_status(sqlite_session_factory):
+    """Test a rejected check-in leaves the booking confirmed."""
+    await seed_booking(sqlite_session_factory, hours_to_departure=30)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await checkin(sqlite_session_factory)
+    assert exc_info.value.status_code == 409
+
+    with pytest.raises(HTTPException) as exc_info:
+        await checkin(sqlite_session_factory, passenger_id="SOMEONE-ELSE")
+    assert exc_info.value.status_code == 400
+
+    assert await stored_state(sqlite_session_factory) == ("confirmed", 0)
+
+@pytest.mark.asyncio
+async def test_unknown_booking_not_found(sqlite_session_factory):
+    """Test checking in an unknown booking returns 404."""
+    with pytest.raises(HTTPException) as exc_info:
+        await checkin(sqlite_session_factory)
+
+    assert exc_info.value.status_code == 404
+
+@pytest.mark.asyncio
+async def test_every_repository_refuses_to_check_in_a_cancelled_booking(sqlite_session_factory):
+    """Test mark_checked_in in each booking repository returns None for a cancelled booking and leaves it cancelled."""
+    await seed_booking(sqlite_session_factory)
+    async with sqlite_session_factory() as session:
+        await session.execute(update(Booking).values(booking_status="cancelled"))
+        await session.commit()
+
+    for repository in (BookingRepository, BookingCheckinRepository, ModularBookingRepository):
+        async with sqlite_session_factory() as session:
+            assert await repository(session).mark_checked_in("B-CK") is None
+            await session.commit()
+
+    assert await stored_state(sqlite_session_factory) == ("cancelled", 0)
+
+@pytest.mark.asyncio
+async def test_concurrent_checkins_create_one_record(sqlite_session_factory):
+    """Test simultaneous check-ins for one booking produce exactly one boarding pass."""
+    await seed_booking(sqlite_session_factory)
+
+    async def attempt():
+        try:
+            return await checkin(sqlite_session_factory)
+        except HTTPException as e:
+            return e.status_code
+
+    results = await asyncio.gather(*(attempt() for _ in range(20)))
+
+    assert sum(1 for r in results if not isinstance(r, int)) == 1
+    assert [r for r in results if isinstance(r, int)] == [409] * 19
+    assert await stored_state(sqlite_session_factory) == ("checked_in", 1)
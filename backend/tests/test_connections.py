@@ -0,0 +1,184 @@
+import random
+import sys
+import threading
+import pytest
+from datetime import datetime, timedelta
+
+from app.core.connections import ConnectionFinder, parse_connection_minutes
+from app.core.route_index import FlightRecord, RouteIndex, route_index
+from app.core.schemas import FlightCreate
+from app.repositories.flight_repository import FlightRepository
+
+NOW = datetime.utcnow().replace(second=0, microsecond=0)
+
+def record(flight_id, origin, destination, departs, arrives, status="scheduled", available_seats=180):
+    """Flight departing and arriving the given number of minutes from now."""
+    return FlightRecord(
+        flight_id=flight_id,
+        departure_airport=origin,
+        arrival_airport=destination,
+        departure_time=NOW + timedelta(minutes=departs),
+        arrival_time=NOW + timedelta(minutes=arrives),
+        aircraft_type="Boeing 737",
+        total_seats=180,
+        available_seats=available_seats,
+        status=status
+    )
+
+def finder(records, **options):
+    index = RouteIndex()
+    index.build(records, NOW)
+    options.setdefault("min_connection", timedelta(minutes=45))
+    options.setdefault("airport_min_connection", {})
+    options.setdefault("max_layover", timedelta(hours=12))
+    return ConnectionFinder(index, **options)
+
+def legs(itinerary):
+    return [leg.flight_id for leg in itinerary.legs]
+
+def test_itineraries_respect_minimum_connection_time():
+    """Test connections shorter than the minimum are never offered and results come earliest arrival first."""
+    connections = finder([
+        record("AB1", "JFK", "ORD", 0, 120),
+        record("BC1", "ORD", "LAX", 150, 400),   # 30 minutes after AB1 lands
+        record("BC2", "ORD", "LAX", 170, 420),
+        record("BC3", "ORD", "LAX", 300, 540),
+        record("AC1", "JFK", "LAX", 60, 480),
+    ])
+
+    found = connections.search("JFK", "LAX", NOW, NOW + timedelta(hours=2), limit=3)
+
+    assert [legs(i) for i in found] == [["AB1", "BC2"], ["AC1"], ["AB1", "BC3"]]
+    assert [i.connections for i in found] == [1, 0, 1]
+    assert found[0].duration_minutes == 420
+    assert connections.earliest_arrival("JFK", "LAX", NOW, NOW + timedelta(hours=2)).arrival_time == NOW + timedelta(minutes=420)
+
+def test_airport_minimum_connection_override():
+    """Test a per-airport minimum connection time replaces the default there."""
+    records = [record("AB1", "JFK", "ORD", 0, 120), record("BC1", "ORD", "LAX", 180, 400)]
+
+    assert parse_connection_minutes("ord:75, ATL:40") == {"ORD": timedelta(minutes=75), "ATL": timedelta(minutes=40)}
+    assert len(finder(records).search("JFK", "LAX", NOW, NOW + timedelta(hours=1))) == 1
+    assert finder(records, airport_min_connection={"ORD": timedelta(minutes=75)}).search(
+        "JFK", "LAX", NOW, NOW + timedelta(hours=1)
+    ) == []
+
+def test_seats_status_layover_and_leg_limits():
+    """Test full or cancelled flights, long layovers, loops and extra legs are all excluded."""
+    connections = finder([
+        record("AB1", "JFK", "ORD", 0, 120),
+        record("BC1", "ORD", "LAX", 200, 400, available_seats=1),
+        record("BC2", "ORD", "LAX", 220, 420, status="cancelled"),
+        record("BC3", "ORD", "LAX", 2000, 2200),
+        record("BA1", "ORD", "JFK", 200, 300),
+        record("BD1", "ORD", "DEN", 200, 300),
+        record("DC1", "DEN", "LAX", 400, 500),
+    ])
+    window = (NOW, NOW + timedelta(hours=1))
+
+    assert [legs(i) for i in connections.search("JFK", "LAX", *window)] == [["AB1", "BC1"], ["AB1", "BD1", "DC1"]]
+    assert [legs(i) for i in connections.search("JFK", "LAX", *window, seats=2)] == [["AB1", "BD1", "DC1"]]
+    assert connections.search("JFK", "LAX", *window, max_legs=2, seats=2) == []
+    assert connections.search("JFK", "JFK", *window) == []
+    assert connections.search("JFK", "LAX", NOW + timedelta(minutes=1), NOW + timedelta(hours=1)) == []
+
+def test_earliest_arrival_matches_exhaustive_search():
+    """Test earliest arrivals on random networks equal the best of every one- and two-leg itinerary."""
+    rng = random.Random(11)
+    airports = ["JFK", "LAX", "ORD", "SFO", "ATL", "DEN"]
+    records = []
+    for i in range(600):
+        origin, destination = rng.sample(airports, 2)
+        departs = rng.randrange(0, 3000)
+        records.append(record(f"FL{i:04d}", origin, destination, departs, departs + rng.randrange(60, 400),
+                              available_seats=rng.randrange(0, 4)))
+    connections = finder(records, max_layover=timedelta(hours=3))
+    mct, layover = timedelta(minutes=45), timedelta(hours=3)
+
+    for _ in range(100):
+        origin, destination = rng.sample(airports, 2)
+        start = NOW + timedelta(minutes=rng.randrange(0, 2000))
+        end = start + timedelta(hours=4)
+        seats = rng.randrange(1, 3)
+        first = [r for r in records if r.departure_airport == origin and start <= r.departure_time < end
+                 and r.available_seats >= seats]
+        arrivals = [r.arrival_time for r in first if r.arrival_airport == destination]
+        arrivals += [
+            second.arrival_time for r in first for second in records
+            if second.departure_airport == r.arrival_airport and second.arrival_airport == destination
+            and r.arrival_time + mct <= second.departure_time < r.arrival_time + layover
+            and second.available_seats >= seats
+        ]
+        best = connections.earliest_arrival(origin, destination, start, end, max_legs=2, seats=seats)
+        assert (best.arrival_time if best else None) == (min(arrivals) if arrivals else None)
+        for itinerary in connections.search(origin, destination, start, end, limit=5, max_legs=2, seats=seats):
+            assert itinerary.available_seats >= seats
+            assert all(b.departure_time >= a.arrival_time + mct for a, b in zip(itinerary.legs, itinerary.legs[1:]))
+
+def test_search_in_a_thread_while_routes_change():
+    """Test searches in a worker thread keep returning the same itineraries while flights commit on the same route."""
+    connections = finder([record("AB0", "JFK", "ORD", 0, 120)] + [
+        record(f"BC{i}", "ORD", "LAX", 180 + i, 400 + i) for i in range(200)
+    ])
+    expected = [["AB0", f"BC{i}"] for i in range(5)]
+    stop = threading.Event()
+    results, errors = [], []
+
+    def search():
+        while not stop.is_set():
+            try:
+                results.append([legs(i) for i in connections.search("JFK", "LAX", NOW, NOW + timedelta(hours=1), limit=5)])
+            except Exception as e:
+                errors.append(e)
+                return
+
+    worker = threading.Thread(target=search)
+    interval = sys.getswitchinterval()
+    # Switch threads as often as possible, so searches overlap changes mid-route
+    sys.setswitchinterval(1e-6)
+    worker.start()
+    try:
+        # Departing before every BC flight but landing last, so each change shifts the whole route
+        for i in range(3000):
+            connections.index.upsert(record(f"EARLY{i % 7}", "ORD", "LAX", 170, 2000 + i))
+            connections.index.remove(f"EARLY{(i + 3) % 7}")
+    finally:
+        stop.set()
+        worker.join()
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    assert results and all(found == expected for found in results)
+
+@pytest.mark.asyncio
+async def test_connections_endpoint(sqlite_session_factory, sqlite_client):
+    """Test GET /api/connections waits for the route index and then returns itineraries of created flights."""
+    params = {"origin": "jfk", "destination": "lax"}
+
+    response = await sqlite_client.get("/api/connections", params=params)
+    assert response.status_code == 503
+
+    async with sqlite_session_factory() as session:
+        await route_index.rebuild(session)
+        repo = FlightRepository(session)
+        for flight_id, origin, destination, hours in (("CN1", "JFK", "ORD", 1), ("CN2", "ORD", "LAX", 5)):
+            await repo.create(FlightCreate(
+                flight_id=flight_id,
+                departure_airport=origin,
+                arrival_airport=destination,
+                departure_time=route_index.horizon + timedelta(hours=hours),
+                arrival_time=route_index.horizon + timedelta(hours=hours + 3),
+                aircraft_type="Boeing 737",
+                total_seats=6
+            ))
+        await session.commit()
+
+    response = await sqlite_client.get("/api/connections", params=params)
+    assert response.status_code == 200
+    [itinerary] = response.json()
+    assert [leg["flight_id"] for leg in itinerary["legs"]] == ["CN1", "CN2"]
+    assert itinerary["connections"] == 1
+    assert itinerary["available_seats"] == 6
+
+    response = await sqlite_client.get("/api/connections", params={**params, "max_legs": 1})
+    assert response.json() == []
@@ -0,0 +1,132 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from httpx import AsyncClient, ASGITransport
+
+from app.core.pool import PoolSettings, PoolMetrics, InstrumentedAsyncPool, pool_stats
+from app.core.dependencies import get_current_active_user
+from app.core.user_models import User
+from main_refactored import app
+
+def test_pool_settings_defaults(monkeypatch):
+    """Test pool settings fall back to defaults when env is unset."""
+    for name in ("DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_POOL_RECYCLE",
+                 "DB_POOL_PRE_PING", "DB_POOL_TIMEOUT", "DB_STATEMENT_CACHE_SIZE"):
+        monkeypatch.delenv(name, raising=False)
+
+    settings = PoolSettings.from_env()
+
+    assert settings == PoolSettings()
+
+def test_pool_settings_from_env(monkeypatch):
+    """Test pool settings are read from environment variables."""
+    monkeypatch.setenv("DB_POOL_SIZE", "25")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "5")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "600")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "2.5")
+    monkeypatch.setenv("DB_STATEMENT_CACHE_SIZE", "0")
+
+    settings = PoolSettings.from_env()
+
+    assert settings.pool_size == 25
+    assert settings.max_overflow == 5
+    assert settings.pool_recycle == 600
+    assert settings.pool_pre_ping is False
+    assert settings.pool_timeout == 2.5
+    assert settings.statement_cache_size == 0
+
+def test_engine_kwargs_asyncpg():
+    """Test asyncpg URLs get the instrumented pool and statement cache size."""
+    settings = PoolSettings(pool_size=7, statement_cache_size=0)
+
+    kwargs = settings.engine_kwargs("postgresql+asyncpg://u:p@localhost/db")
+
+    assert kwargs["poolclass"] is InstrumentedAsyncPool
+    assert kwargs["pool_size"] == 7
+    assert kwargs["connect_args"] == {"statement_cache_size": 0}
+
+def test_engine_kwargs_sqlite_memory():
+    """Test in-memory SQLite keeps the dialect default pool."""
+    assert PoolSettings().engine_kwargs("sqlite+aiosqlite:///:memory:") == {}
+
+def test_pool_metrics_histogram():
+    """Test acquire latency is bucketed into the histogram."""
+    metrics = PoolMetrics()
+
+    metrics.acquire_started()
+    metrics.acquire_finished(0.0005)
+    metrics.acquire_started()
+    metrics.acquire_finished(0.2)
+    metrics.acquire_started()
+    metrics.acquire_failed(timed_out=True)
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["waiting"] == 0
+    assert snapshot["acquired"] == 2
+    assert snapshot["timeouts"] == 1
+    assert snapshot["acquire_ms_histogram"]["le_1ms"] == 1
+    assert snapshot["acquire_ms_histogram"]["le_250ms"] == 1
+    assert snapshot["acquire_ms_max"] == 200.0
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_tracks_checkouts(tmp_path):
+    """Test live pool statistics against a real SQLite file database."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}"
+    settings = PoolSettings(pool_size=2, max_overflow=1, pool_timeout=0.2)
+    engine = create_async_engine(url, **settings.engine_kwargs(url))
+
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            stats = pool_stats(engine, settings)
+            assert stats["pool_class"] == "InstrumentedAsyncPool"
+            assert stats["checked_out"] == 1
+
+        stats = pool_stats(engine, settings)
+        assert stats["checked_out"] == 0
+        assert stats["acquired"] == 1
+        assert stats["settings"]["pool_size"] == 2
+    finally:
+        await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_counts_timeouts(tmp_path):
+    """Test exhausting pool + overflow records a checkout timeout."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}"
+    settings = PoolSettings(pool_size=1, max_overflow=0, pool_timeout=0.05)
+    engine = create_async_engine(url, **settings.engine_kwargs(url))
+
+    try:
+        async with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = pool_stats(engine)
+        assert stats["timeouts"] == 1
+        assert stats["waiting"] == 0
+    finally:
+        await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_pool_stats_endpoint(monkeypatch):
+    """Test admin endpoint exposes pool statistics and refuses non-admins."""
+    monkeypatch.setattr("app.core.dependencies.ADMIN_USERNAMES", frozenset({"admin"}))
+    app.dependency_overrides[get_current_active_user] = lambda: User(id=1, username="admin", is_active=True)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/admin/db/pool")
+            app.dependency_overrides[get_current_active_user] = lambda: User(id=2, username="agent", is_active=True)
+            forbidden = await client.get("/admin/db/pool")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert forbidden.status_code == 403
+    data = response.json()
+    assert data["pool_class"] == "InstrumentedAsyncPool"
+    assert "acquire_ms_histogram" in data
+    assert "pool_size" in data["settings"]
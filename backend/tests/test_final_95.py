@@ -45,7 +45,7 @@ async def test_booking_repository_update_status_lines():
     # This covers lines 36-41
     await repo.update_status("BOOK123", "cancelled")
     mock_session.execute.assert_called_once()
-    mock_session.commit.assert_called_once()
+    mock_session.commit.assert_not_called()
 
 # Cover remaining lines in checkin_repository.py (lines 13-22, 29-30)
 @pytest.mark.asyncio
@@ -85,6 +85,7 @@ async def test_booking_service_all_error_paths():
     
     # Line 23: Flight not found
     mock_flight_repo.get_by_id = AsyncMock(return_value=None)
+    mock_flight_repo.claim_seat = AsyncMock(return_value=None)
     booking_data = BookingCreate(flight_id="FL123", passenger_id="P123")
     
     with pytest.raises(HTTPException):
@@ -112,24 +113,23 @@ async def test_booking_service_all_error_paths():
         await service.cancel_booking("BOOK123")
     
     # Line 66: Booking not found in checkin
-    mock_booking_repo.get_with_flight = AsyncMock(return_value=None)
+    mock_booking_repo.mark_checked_in = AsyncMock(return_value=None)
     checkin_data = CheckinRequest(booking_id="BOOK123", passenger_id="P123")
     
     with pytest.raises(HTTPException):
         await service.checkin(checkin_data)
     
     # Line 72: Passenger ID mismatch
-    mock_booking = Booking(booking_id="BOOK123", flight_id="FL123", passenger_id="P456", 
-                          seat_number="12A", booking_status="confirmed")
-    mock_booking_repo.get_with_flight = AsyncMock(return_value=(mock_booking, mock_flight))
+    checkin_row = MagicMock(booking_id="BOOK123", flight_id="FL123", passenger_id="P456", seat_number="12A",
+                            departure_time=mock_flight.departure_time, already_checked_in=False)
+    mock_booking_repo.mark_checked_in = AsyncMock(return_value=checkin_row)
     
     with pytest.raises(HTTPException):
         await service.checkin(checkin_data)
     
     # Line 82: Check-in window invalid
-    mock_booking.passenger_id = "P123"
-    mock_flight.departure_time = datetime.utcnow() + timedelta(hours=30)  # Too far
-    mock_checkin_repo.get_by_booking_id = AsyncMock(return_value=None)
+    checkin_row.passenger_id = "P123"
+    checkin_row.departure_time = datetime.utcnow() + timedelta(hours=30)  # Too far
     
     with pytest.raises(HTTPException):
         await service.checkin(checkin_data)
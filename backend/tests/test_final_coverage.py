@@ -53,6 +53,7 @@ async def test_booking_service_no_seats_fixed():
                         departure_time=datetime.utcnow() + timedelta(hours=6),
                         arrival_time=datetime.utcnow() + timedelta(hours=12),
                         aircraft_type="Boeing 737", total_seats=180, available_seats=0, status="scheduled")
+    mock_flight_repo.claim_seat = AsyncMock(return_value=None)
     mock_flight_repo.get_by_id = AsyncMock(return_value=mock_flight)
     
     booking_data = BookingCreate(flight_id="FL123", passenger_id="P123", seat_number="12A")
@@ -92,11 +93,11 @@ async def test_booking_service_cancel_booking_success():
                           seat_number="12A", booking_status="confirmed")
     mock_booking_repo.get_by_id = AsyncMock(return_value=mock_booking)
     mock_booking_repo.update_status = AsyncMock()
-    mock_flight_repo.update_available_seats = AsyncMock()
+    mock_flight_repo.release_seat = AsyncMock()
     
     await service.cancel_booking("BOOK123")
     mock_booking_repo.update_status.assert_called_with("BOOK123", "cancelled")
-    mock_flight_repo.update_available_seats.assert_called_with("FL123", 1)
+    mock_flight_repo.release_seat.assert_called_with("BOOK123")
 
 @pytest.mark.asyncio
 async def test_passenger_service_get_passenger_success():
@@ -130,19 +131,21 @@ async def test_booking_service_create_with_seat_assignment():
     mock_passenger = Passenger(passenger_id="P123", first_name="John", last_name="Doe",
                               email="john@test.com", phone="+1234567890", date_of_birth="1990-01-15")
     
-    mock_flight_repo.get_by_id = AsyncMock(return_value=mock_flight)
+    mock_flight_repo.claim_seat = AsyncMock(return_value="1A")
     mock_passenger_repo.get_by_id = AsyncMock(return_value=mock_passenger)
     
     mock_booking = Booking(booking_id="BOOK123", flight_id="FL123", passenger_id="P123",
-                          seat_number="31A", booking_status="confirmed", booking_date=datetime.utcnow())
+                          seat_number="1A", booking_status="confirmed", booking_date=datetime.utcnow())
     mock_booking_repo.create = AsyncMock(return_value=mock_booking)
-    mock_flight_repo.update_available_seats = AsyncMock()
     
     # Test without seat number (should auto-assign)
     booking_data = BookingCreate(flight_id="FL123", passenger_id="P123")
     
     result = await service.create_booking(booking_data)
     assert result.booking_id == "BOOK123"
+    booking_id = mock_flight_repo.claim_seat.call_args.args[1]
+    mock_flight_repo.claim_seat.assert_called_once_with("FL123", booking_id, None)
+    mock_booking_repo.create.assert_called_once_with(booking_data, "1A", booking_id)
 
 # Test database create_tables function
 @pytest.mark.asyncio
@@ -0,0 +1,161 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from httpx import AsyncClient, ASGITransport
+
+from app.core.flight_cache import BYPASS_CACHE, FlightCache, flight_cache
+from app.core.models import Flight
+from app.core.schemas import FlightCreate
+from app.core.seat_counts import refresh_available_seats
+from app.core.unit_of_work import UnitOfWork
+from app.core.dependencies import get_current_active_user
+from app.core.user_models import User
+from app.repositories.flight_repository import FlightRepository
+from app.services.flight_service import FlightService
+from main_refactored import app
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_flight(flight_id, available_seats=180):
+    return Flight(
+        flight_id=flight_id,
+        departure_airport="JFK",
+        arrival_airport="LAX",
+        departure_time=datetime(2026, 1, 1, 8),
+        arrival_time=datetime(2026, 1, 1, 14),
+        aircraft_type="Boeing 737",
+        total_seats=180,
+        available_seats=available_seats,
+        status="scheduled"
+    )
+
+def flight_data(flight_id):
+    return FlightCreate(
+        flight_id=flight_id,
+        departure_airport="JFK",
+        arrival_airport="LAX",
+        departure_time=datetime.utcnow() + timedelta(hours=6),
+        arrival_time=datetime.utcnow() + timedelta(hours=12),
+        aircraft_type="Boeing 737",
+        total_seats=6
+    )
+
+def count_selects(session):
+    selects = []
+    event.listen(
+        session.sync_session.bind, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: selects.append(statement) if statement.startswith("SELECT") else None
+    )
+    return selects
+
+def test_cache_evicts_least_recently_used():
+    """Test the cache keeps at most its capacity, dropping the least recently read flight."""
+    cache = FlightCache(capacity=2)
+    cache.put(make_flight("FL1"))
+    cache.put(make_flight("FL2"))
+    cache.get_schedule("FL1")
+    cache.put(make_flight("FL3"))
+
+    assert cache.get_schedule("FL2") is None
+    assert cache.get_schedule("FL1")["flight_id"] == "FL1"
+    assert cache.stats()["evictions"] == 1
+
+def test_seat_count_expires_before_schedule():
+    """Test the seat count has its own short TTL and the schedule a long one."""
+    clock = FakeClock()
+    cache = FlightCache(ttl=300, seat_ttl=1, clock=clock)
+    cache.put(make_flight("FL1", available_seats=10))
+
+    clock.now = 0.5
+    assert cache.get_available_seats("FL1") == 10
+    clock.now = 2
+    assert cache.get_schedule("FL1") is not None
+    assert cache.get_available_seats("FL1") is None
+
+    cache.put_available_seats("FL1", 9)
+    assert cache.get_available_seats("FL1") == 9
+    clock.now = 301
+    assert cache.get_schedule("FL1") is None
+    assert cache.stats()["flights"] == 0
+
+def test_invalidate_seats_keeps_schedule():
+    """Test invalidating seats only drops the seat count, invalidate drops the flight."""
+    cache = FlightCache()
+    cache.put(make_flight("FL1"))
+
+    cache.invalidate_seats(["FL1", "MISSING"])
+    assert cache.get_schedule("FL1") is not None
+    assert cache.get_available_seats("FL1") is None
+
+    cache.invalidate("FL1")
+    assert cache.get_schedule("FL1") is None
+
+@pytest.mark.asyncio
+async def test_get_by_id_reads_through_cache(sqlite_session_factory):
+    """Test repeated lookups skip the flight SELECT and seat updates reload only the count."""
+    async with sqlite_session_factory() as session:
+        await FlightService(FlightRepository(session), UnitOfWork(session)).create_flight(flight_data("FC1"))
+
+    async with sqlite_session_factory() as session:
+        repo = FlightRepository(session)
+        selects = count_selects(session)
+
+        first = await repo.get_by_id("FC1")
+        second = await repo.get_by_id("FC1")
+        assert len(selects) == 1
+        assert (second.flight_id, second.available_seats) == ("FC1", 6)
+        assert second.departure_time == first.departure_time
+
+        await repo.claim_seat("FC1", "B1")
+        await refresh_available_seats(session, ["FC1"])
+        await session.commit()
+
+        third = await repo.get_by_id("FC1")
+        assert third.available_seats == 5
+        assert len(selects) == 2
+        assert "available_seats" in selects[-1] and "departure_airport" not in selects[-1]
+
+    # The other miss is create_flight checking the flight does not exist yet
+    stats = flight_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert (stats["seat_count_hits"], stats["seat_count_misses"]) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_misses_are_not_cached_and_bypass_reloads(sqlite_session_factory):
+    """Test an unknown flight is looked up again and a bypassing session refreshes the entry."""
+    async with sqlite_session_factory() as session:
+        repo = FlightRepository(session)
+        assert await repo.get_by_id("FC2") is None
+        await FlightService(repo, UnitOfWork(session)).create_flight(flight_data("FC2"))
+
+    async with sqlite_session_factory() as session:
+        assert (await FlightRepository(session).get_by_id("FC2")).flight_id == "FC2"
+        await session.execute(Flight.__table__.update().values(status="delayed"))
+        await session.commit()
+
+    async with sqlite_session_factory() as session:
+        session.info[BYPASS_CACHE] = True
+        assert (await FlightRepository(session).get_by_id("FC2")).status == "delayed"
+
+    async with sqlite_session_factory() as session:
+        assert (await FlightRepository(session).get_by_id("FC2")).status == "delayed"
+
+@pytest.mark.asyncio
+async def test_flight_cache_stats_endpoint(monkeypatch):
+    """Test admin endpoint exposes flight cache counters."""
+    monkeypatch.setattr("app.core.dependencies.ADMIN_USERNAMES", frozenset({"admin"}))
+    app.dependency_overrides[get_current_active_user] = lambda: User(id=1, username="admin", is_active=True)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/admin/cache/flights")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    data = response.json()
+    assert {"hits", "misses", "seat_count_hits", "seat_count_misses", "hit_ratio"} <= set(data)
@@ -0,0 +1,183 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, func, select
+
+from app.core.flight_cache import flight_cache
+from app.core.models import Booking, CheckinRecord, Flight, Notification, Seat
+from app.core.route_index import route_index
+from app.core.schemas import BookingCreate, CheckinRequest, FlightSearch, GroupCheckinRequest
+from app.core.unit_of_work import UnitOfWork
+from app.repositories.booking_repository import BookingRepository
+from app.repositories.checkin_repository import CheckinRepository
+from app.repositories.flight_repository import FlightRepository
+from app.repositories.notification_repository import NotificationRepository
+from app.services.disruption_service import DisruptionService
+from conftest import add_seated_flight, build_booking_service, make_passenger
+
+async def seed(session_factory, flight_id, bookings, checked_in=0):
+    """Flight with ``bookings`` live bookings on its first seats, the first ``checked_in`` of them checked in."""
+    async with session_factory() as session:
+        await add_seated_flight(session, flight_id, 400, aircraft_type="Boeing 777", available_seats=400 - bookings)
+        repo = FlightRepository(session)
+        free = await repo.get_free_seats(flight_id)
+        claims = {}
+        for i, (_, seat_number) in enumerate(free[:bookings]):
+            passenger_id, booking_id = f"P-{flight_id}-{i}", f"B-{flight_id}-{i:04d}"
+            session.add(make_passenger(passenger_id))
+            session.add(Booking(
+                booking_id=booking_id, flight_id=flight_id, passenger_id=passenger_id, seat_number=seat_number,
+                booking_status="checked_in" if i < checked_in else "confirmed"
+            ))
+            if i < checked_in:
+                session.add(CheckinRecord(booking_id=booking_id, boarding_pass_number=f"BP-{booking_id}", boarding_group="A"))
+            claims[seat_number] = booking_id
+        await repo.claim_seats(flight_id, claims)
+        await session.commit()
+
+def build_disruption_service(session):
+    return DisruptionService(
+        FlightRepository(session),
+        BookingRepository(session),
+        CheckinRepository(session),
+        NotificationRepository(session),
+        UnitOfWork(session)
+    )
+
+async def cancel_counting_statements(session_factory, flight_id):
+    async with session_factory() as session:
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(session.sync_session.get_bind(), "before_cursor_execute", count)
+        result = await build_disruption_service(session).cancel_flight(flight_id)
+        event.remove(session.sync_session.get_bind(), "before_cursor_execute", count)
+    return result, statements
+
+async def stored_state(session_factory, flight_id):
+    async with session_factory() as session:
+        flight = await session.get(Flight, flight_id, populate_existing=True)
+        statuses = (await session.execute(
+            select(Booking.booking_status, func.count()).where(Booking.flight_id == flight_id).group_by(Booking.booking_status)
+        )).all()
+        checkins = await session.scalar(
+            select(func.count()).select_from(CheckinRecord).join(Booking).where(Booking.flight_id == flight_id)
+        )
+        notifications = await session.scalar(
+            select(func.count()).select_from(Notification).join(Booking).where(Booking.flight_id == flight_id)
+        )
+        seats = await session.scalar(select(func.count()).select_from(Seat).where(Seat.flight_id == flight_id))
+    return flight.status, flight.available_seats, dict(statuses), checkins, notifications, seats
+
+@pytest.mark.asyncio
+async def test_cancellation_statements_do_not_grow_with_bookings(sqlite_session_factory):
+    """Test cancelling a flight of 3 or 300 bookings takes the same few set-based statements."""
+    await seed(sqlite_session_factory, "DS1", 3, checked_in=1)
+    await seed(sqlite_session_factory, "DS2", 300, checked_in=120)
+    await seed(sqlite_session_factory, "DS3", 5, checked_in=2)
+
+    small, small_statements = await cancel_counting_statements(sqlite_session_factory, "DS1")
+    large, large_statements = await cancel_counting_statements(sqlite_session_factory, "DS2")
+
+    assert len(small_statements) == len(large_statements) == 5
+    assert (large.bookings_cancelled, large.checkins_voided, large.notifications_queued) == (300, 120, 300)
+    assert (small.bookings_cancelled, small.checkins_voided, small.notifications_queued) == (3, 1, 3)
+    assert large.flight.status == "cancelled" and large.flight.available_seats == 0
+
+    assert await stored_state(sqlite_session_factory, "DS2") == ("cancelled", 0, {"cancelled": 300}, 0, 300, 0)
+    assert await stored_state(sqlite_session_factory, "DS3") == (
+        "scheduled", 395, {"checked_in": 2, "confirmed": 3}, 2, 0, 400
+    )
+    async with sqlite_session_factory() as session:
+        notification = (await session.execute(select(Notification).order_by(Notification.notification_id))).scalars().first()
+    assert (notification.kind, notification.passenger_id, notification.sent_at) == ("flight_cancelled", "P-DS1-0", None)
+
+@pytest.mark.asyncio
+async def test_cancelled_flight_cannot_be_booked_or_cancelled_again(sqlite_session_factory):
+    """Test a cancelled flight sells no seats and a second or unknown cancellation is refused."""
+    await seed(sqlite_session_factory, "DS1", 2)
+    await cancel_counting_statements(sqlite_session_factory, "DS1")
+
+    async with sqlite_session_factory() as session:
+        with pytest.raises(HTTPException) as exc_info:
+            await build_booking_service(session).create_booking(BookingCreate(flight_id="DS1", passenger_id="P-DS1-0"))
+        assert exc_info.value.status_code == 409
+
+        service = build_disruption_service(session)
+        for flight_id, status_code in (("DS1", 409), ("NOPE", 404)):
+            with pytest.raises(HTTPException) as exc_info:
+                await service.cancel_flight(flight_id)
+            assert exc_info.value.status_code == status_code
+
+@pytest.mark.asyncio
+async def test_cancelled_bookings_cannot_be_checked_in(sqlite_session_factory):
+    """Test single and group check-in refuse the bookings of a cancelled flight with 409 and change nothing."""
+    await seed(sqlite_session_factory, "DS1", 3, checked_in=1)
+    await cancel_counting_statements(sqlite_session_factory, "DS1")
+
+    async with sqlite_session_factory() as session:
+        service = build_booking_service(session)
+        for checkin in (
+            service.checkin(CheckinRequest(booking_id="B-DS1-0000", passenger_id="P-DS1-0")),
+            service.checkin(CheckinRequest(booking_id="B-DS1-0001", passenger_id="P-DS1-1")),
+            service.group_checkin(GroupCheckinRequest(checkins=[
+                CheckinRequest(booking_id=f"B-DS1-{i:04d}", passenger_id=f"P-DS1-{i}") for i in (1, 2)
+            ])),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                await checkin
+            assert exc_info.value.status_code == 409
+
+    assert await stored_state(sqlite_session_factory, "DS1") == ("cancelled", 0, {"cancelled": 3}, 0, 3, 0)
+
+@pytest.mark.asyncio
+async def test_failed_cancellation_changes_nothing(sqlite_session_factory):
+    """Test a failure in the last step rolls back the flight, notifications, check-ins and seats."""
+    await seed(sqlite_session_factory, "DS1", 4, checked_in=2)
+    before = await stored_state(sqlite_session_factory, "DS1")
+
+    async with sqlite_session_factory() as session:
+        service = build_disruption_service(session)
+
+        async def fail(flight_id):
+            raise RuntimeError("database went away")
+
+        service.booking_repo.cancel_for_flight = fail
+        with pytest.raises(RuntimeError):
+            await service.cancel_flight("DS1")
+
+    assert await stored_state(sqlite_session_factory, "DS1") == before == ("scheduled", 396, {"checked_in": 2, "confirmed": 2}, 2, 0, 400)
+
+@pytest.mark.asyncio
+async def test_cancel_endpoint_updates_index_and_cache(sqlite_session_factory, sqlite_client, monkeypatch):
+    """Test POST /api/flights/{id}/cancel reports the counts and this worker stops offering the flight."""
+    monkeypatch.setattr("app.core.dependencies.ADMIN_USERNAMES", frozenset({"agent"}))
+    await seed(sqlite_session_factory, "DS1", 2, checked_in=1)
+    async with sqlite_session_factory() as session:
+        await route_index.rebuild(session)
+        await FlightRepository(session).get_by_id("DS1")
+    search = FlightSearch(departure_airport="JFK", departure_from=route_index.horizon)
+    assert [record.status for record in route_index.search(search, 10)] == ["scheduled"]
+
+    response = await sqlite_client.post("/api/flights/DS1/cancel")
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["bookings_cancelled"], body["checkins_voided"], body["notifications_queued"]) == (2, 1, 2)
+    assert body["flight"]["status"] == "cancelled"
+
+    assert (await sqlite_client.get("/api/flights/DS1")).json()["status"] == "cancelled"
+    assert (await sqlite_client.post("/api/flights/DS1/cancel")).status_code == 409
+
+    assert [(record.status, record.available_seats) for record in route_index.search(search, 10)] == [("cancelled", 0)]
+    assert flight_cache.get_schedule("DS1")["status"] == "cancelled"
+
+@pytest.mark.asyncio
+async def test_cancel_endpoint_is_for_admins_only(sqlite_session_factory, sqlite_client, monkeypatch):
+    """Test a signed-in user who is not an admin gets 403 and the flight stays scheduled."""
+    monkeypatch.setattr("app.core.dependencies.ADMIN_USERNAMES", frozenset({"admin"}))
+    await seed(sqlite_session_factory, "DS1", 2, checked_in=1)
+    before = await stored_state(sqlite_session_factory, "DS1")
+
+    assert (await sqlite_client.post("/api/flights/DS1/cancel")).status_code == 403
+    assert await stored_state(sqlite_session_factory, "DS1") == before
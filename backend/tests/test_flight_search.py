@@ -0,0 +1,127 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event, text
+
+from app.core.models import Flight
+from app.core.schemas import FlightSearch
+from app.repositories.flight_repository import FlightRepository
+from app.services.flight_service import FlightService
+
+DEPARTURE = datetime(2026, 1, 1, 8)
+AIRPORTS = ("JFK", "LAX", "ORD", "ATL", "SFO", "SEA", "MIA", "DEN", "BOS", "DFW")
+STATUSES = ("scheduled", "delayed", "cancelled", "departed")
+
+def make_flight(flight_id, origin, destination, hours, status="scheduled"):
+    return Flight(
+        flight_id=flight_id,
+        departure_airport=origin,
+        arrival_airport=destination,
+        departure_time=DEPARTURE + timedelta(hours=hours),
+        arrival_time=DEPARTURE + timedelta(hours=hours + 5),
+        aircraft_type="Boeing 737",
+        total_seats=180,
+        available_seats=180,
+        status=status
+    )
+
+async def seed_flights(session_factory):
+    async with session_factory() as session:
+        session.add_all([
+            make_flight("FL1", "JFK", "LAX", 0),
+            make_flight("FL2", "JFK", "LAX", 30, "delayed"),
+            make_flight("FL3", "JFK", "SFO", 2),
+            make_flight("FL4", "ORD", "LAX", 1),
+            make_flight("FL5", "JFK", "LAX", 60, "cancelled"),
+        ])
+        await session.commit()
+
+async def search(session_factory, limit=10, **filters):
+    async with session_factory() as session:
+        page = await FlightService(FlightRepository(session)).get_flights_page(limit, search=FlightSearch(**filters))
+    return [flight.flight_id for flight in page.items], page.next_cursor
+
+@pytest.mark.asyncio
+async def test_search_filters_combine(sqlite_session_factory):
+    """Test airport, date range and status filters narrow the listing together."""
+    await seed_flights(sqlite_session_factory)
+
+    assert (await search(sqlite_session_factory, departure_airport="jfk"))[0] == ["FL1", "FL3", "FL2", "FL5"]
+    assert (await search(sqlite_session_factory, arrival_airport="LAX", departure_airport="JFK"))[0] == ["FL1", "FL2", "FL5"]
+    assert (await search(
+        sqlite_session_factory, departure_airport="JFK",
+        departure_from=DEPARTURE + timedelta(hours=1), departure_to=DEPARTURE + timedelta(hours=60)
+    ))[0] == ["FL3", "FL2"]
+    assert (await search(sqlite_session_factory, status="cancelled"))[0] == ["FL5"]
+
+@pytest.mark.asyncio
+async def test_search_pages_with_cursor(sqlite_session_factory):
+    """Test a filtered listing pages with the same cursors as the unfiltered one."""
+    await seed_flights(sqlite_session_factory)
+    first, cursor = await search(sqlite_session_factory, limit=2, arrival_airport="LAX")
+
+    async with sqlite_session_factory() as session:
+        page = await FlightService(FlightRepository(session)).get_flights_page(2, cursor, FlightSearch(arrival_airport="LAX"))
+
+    assert first == ["FL1", "FL4"]
+    assert [flight.flight_id for flight in page.items] == ["FL2", "FL5"]
+
+@pytest.mark.asyncio
+async def test_search_endpoint_validates_range(sqlite_session_factory, sqlite_client):
+    """Test GET /api/flights applies query filters and rejects an empty date range."""
+    await seed_flights(sqlite_session_factory)
+
+    headers = {"Authorization": "Bearer token"}
+    found = await sqlite_client.get("/api/flights?departure_airport=ORD&status=scheduled", headers=headers)
+    empty_range = await sqlite_client.get(
+        "/api/flights?departure_from=2026-01-02&departure_to=2026-01-01", headers=headers
+    )
+
+    assert [f["flight_id"] for f in found.json()] == ["FL4"]
+    assert empty_range.status_code == 422
+
+@pytest.mark.asyncio
+async def test_search_uses_indexes_on_a_million_flights(sqlite_session_factory):
+    """Test every filter is planned as an index range scan without sorting, on one million flights."""
+    async with sqlite_session_factory() as session:
+        await session.execute(text(f"""
+            WITH RECURSIVE n(i) AS (SELECT 0 UNION ALL SELECT i + 1 FROM n WHERE i < 999999)
+            INSERT INTO flights (flight_id, departure_airport, arrival_airport, departure_time, arrival_time,
+                                 aircraft_type, total_seats, available_seats, status)
+            SELECT printf('FL%07d', i),
+                   CASE i % 10 {' '.join(f"WHEN {k} THEN '{a}'" for k, a in enumerate(AIRPORTS))} END,
+                   CASE (i / 10) % 10 {' '.join(f"WHEN {k} THEN '{a}'" for k, a in enumerate(AIRPORTS))} END,
+                   datetime('2026-01-01', printf('+%d minutes', i / 2)),
+                   datetime('2026-01-01', printf('+%d minutes', i / 2 + 300)),
+                   'Boeing 737', 180, 180,
+                   CASE i % 4 {' '.join(f"WHEN {k} THEN '{s}'" for k, s in enumerate(STATUSES))} END
+            FROM n
+        """))
+        await session.execute(text("ANALYZE"))
+        await session.commit()
+        assert await session.scalar(text("SELECT count(*) FROM flights")) == 1_000_000
+
+        statements = []
+        event.listen(
+            session.sync_session.bind, "before_cursor_execute",
+            lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters))
+        )
+        repo = FlightRepository(session)
+        searches = {
+            "ix_flights_departure_flight": FlightSearch(departure_from=datetime(2026, 3, 1)),
+            "ix_flights_route_departure_flight": FlightSearch(departure_airport="JFK", arrival_airport="LAX"),
+            "ix_flights_origin_departure": FlightSearch(departure_airport="JFK", departure_from=datetime(2026, 3, 1)),
+            "ix_flights_destination_departure": FlightSearch(arrival_airport="SEA"),
+            "ix_flights_status_departure": FlightSearch(status="delayed", departure_to=datetime(2026, 6, 1)),
+        }
+        plans = {}
+        for index, filters in searches.items():
+            after = (datetime(2026, 2, 1), "FL0000000")
+            assert len(await repo.get_page(50, after, filters)) == 50
+            statement, parameters = statements[-1]
+            connection = await session.connection()
+            plan = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans[index] = " | ".join(row[-1] for row in plan)
+
+    for index, plan in plans.items():
+        assert f"USING INDEX {index}" in plan or f"USING COVERING INDEX {index}" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,161 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, func, select
+
+from app.core.models import Booking, Seat
+from app.core.schemas import GroupBookingCreate, MAX_GROUP_SIZE
+from app.core.seat_map import pick_adjacent
+from app.repositories.flight_repository import FlightRepository
+from conftest import add_seated_flight, build_booking_service, make_passenger
+
+async def seed(session_factory, seats=12, passengers=4):
+    async with session_factory() as session:
+        await add_seated_flight(session, "GRP1", seats)
+        for i in range(passengers):
+            session.add(make_passenger(f"P-GRP{i}"))
+        await session.commit()
+
+def group(*seats):
+    return GroupBookingCreate(
+        flight_id="GRP1",
+        passengers=[{"passenger_id": f"P-GRP{i}", "seat_number": seat} for i, seat in enumerate(seats)]
+    )
+
+async def book_seats(session_factory, *seat_numbers):
+    async with session_factory() as session:
+        await FlightRepository(session).claim_seats("GRP1", {seat: f"B-{seat}" for seat in seat_numbers})
+        await session.commit()
+
+def test_pick_adjacent_prefers_one_row():
+    """Test the picked seats are the tightest run, then the fewest rows, then the frontmost."""
+    # Six seats a row: 1B, 1E, 2A-2C and 3D-3F free
+    free = [1, 4, 6, 7, 8, 15, 16, 17]
+
+    assert pick_adjacent(free, 3, 6) == [6, 7, 8]
+    assert pick_adjacent(free, 2, 6) == [6, 7]
+    assert pick_adjacent([4, 5, 6, 7, 20, 21, 22, 23], 4, 6) == [20, 21, 22, 23]
+    assert pick_adjacent(free, 9, 6) is None
+    assert pick_adjacent(free, 0, 6) == []
+
+@pytest.mark.asyncio
+async def test_group_booked_together_in_few_statements(sqlite_session_factory):
+    """Test a group is seated side by side with one claim UPDATE, one INSERT and one commit."""
+    await seed(sqlite_session_factory)
+    await book_seats(sqlite_session_factory, "1A", "1D")
+
+    async with sqlite_session_factory() as session:
+        statements = []
+        event.listen(session.sync_session.bind, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        bookings = await build_booking_service(session).create_group_booking(group(None, None, None, "1B"))
+
+    assert [(b.passenger_id, b.seat_number) for b in bookings] == [
+        ("P-GRP0", "2A"), ("P-GRP1", "2B"), ("P-GRP2", "2C"), ("P-GRP3", "1B")
+    ]
+    assert sum(statement.startswith("UPDATE seats") for statement in statements) == 1
+    assert sum(statement.startswith("INSERT INTO bookings") for statement in statements) == 1
+    assert len(statements) <= 5
+
+    async with sqlite_session_factory() as session:
+        seats = dict((await session.execute(select(Seat.seat_number, Seat.booking_id).where(Seat.booking_id.isnot(None)))).all())
+        stored = {b.booking_id: b.seat_number for b in (await session.execute(select(Booking))).scalars()}
+    assert {seats[seat] for seat in ("2A", "2B", "2C", "1B")} == set(stored)
+    assert all(seats[seat_number] == booking_id for booking_id, seat_number in stored.items())
+
+def race_for(service, session_factory, *taken):
+    """Make another booker take each of ``taken`` right after the group reads the free seats, once per seat."""
+    pick = service.flight_repo.get_free_seats
+    pending = list(taken)
+
+    async def race(flight_id):
+        free = await pick(flight_id)
+        if pending:
+            await book_seats(session_factory, pending.pop(0))
+        return free
+
+    service.flight_repo.get_free_seats = race
+
+@pytest.mark.asyncio
+async def test_group_picks_again_when_a_seat_is_lost(sqlite_session_factory):
+    """Test a seat taken between picking and claiming sends the group to the next closest free run."""
+    await seed(sqlite_session_factory)
+
+    async with sqlite_session_factory() as session:
+        service = build_booking_service(session)
+        race_for(service, sqlite_session_factory, "1B")
+        bookings = await service.create_group_booking(group(None, None, None))
+
+    assert [b.seat_number for b in bookings] == ["1C", "1D", "1E"]
+    async with sqlite_session_factory() as session:
+        held = (await session.execute(
+            select(Seat.seat_number).where(Seat.booking_id.isnot(None)).order_by(Seat.seat_index)
+        )).scalars().all()
+    assert held == ["1B", "1C", "1D", "1E"]
+
+@pytest.mark.asyncio
+async def test_group_rolls_back_when_seats_stay_lost(sqlite_session_factory):
+    """Test losing a requested seat, or seats on every attempt, books nobody and frees the group's seats."""
+    await seed(sqlite_session_factory)
+
+    async with sqlite_session_factory() as session:
+        service = build_booking_service(session)
+        race_for(service, sqlite_session_factory, "2A")
+        with pytest.raises(HTTPException) as exc_info:
+            await service.create_group_booking(group("2A", None))
+        assert exc_info.value.status_code == 409
+
+    async with sqlite_session_factory() as session:
+        service = build_booking_service(session)
+        claim = service.flight_repo.claim_seats
+
+        async def short_claim(flight_id, booking_ids):
+            # As if a concurrent booker always got one of the seats first
+            return (await claim(flight_id, booking_ids))[1:]
+
+        service.flight_repo.claim_seats = short_claim
+        with pytest.raises(HTTPException) as exc_info:
+            await service.create_group_booking(group(None, None))
+        assert exc_info.value.status_code == 409
+
+    async with sqlite_session_factory() as session:
+        assert await session.scalar(select(func.count()).select_from(Booking)) == 0
+        held = (await session.execute(select(Seat.seat_number).where(Seat.booking_id.isnot(None)))).scalars().all()
+    assert held == ["2A"]
+
+@pytest.mark.asyncio
+async def test_group_rejections(sqlite_session_factory):
+    """Test unknown passengers, unknown or taken seats, repeats and a full cabin book nobody."""
+    await seed(sqlite_session_factory, seats=3)
+    await book_seats(sqlite_session_factory, "1A")
+
+    async with sqlite_session_factory() as session:
+        service = build_booking_service(session)
+        for request, status_code in (
+            (GroupBookingCreate(flight_id="GRP1", passengers=[{"passenger_id": "NOPE"}]), 404),
+            (GroupBookingCreate(flight_id="NOPE", passengers=[{"passenger_id": "P-GRP0"}]), 404),
+            (GroupBookingCreate(flight_id="GRP1", passengers=[{"passenger_id": "P-GRP0"}] * 2), 400),
+            (group("1B", "1B"), 400),
+            (group("9A"), 400),
+            (group("1A"), 409),
+            (group(None, None, None), 409),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                await service.create_group_booking(request)
+            assert exc_info.value.status_code == status_code
+        assert await session.scalar(select(func.count()).select_from(Booking)) == 0
+
+@pytest.mark.asyncio
+async def test_group_booking_endpoint(sqlite_session_factory, sqlite_client):
+    """Test POST /api/bookings/group returns every booking and bounds the group size."""
+    await seed(sqlite_session_factory)
+
+    response = await sqlite_client.post("/api/bookings/group", json={
+        "flight_id": "GRP1",
+        "passengers": [{"passenger_id": "P-GRP0", "seat_number": "2c"}, {"passenger_id": "P-GRP1"}]
+    })
+    assert response.status_code == 201
+    assert [b["seat_number"] for b in response.json()] == ["2C", "1A"]
+
+    too_many = [{"passenger_id": f"P{i}"} for i in range(MAX_GROUP_SIZE + 1)]
+    response = await sqlite_client.post("/api/bookings/group", json={"flight_id": "GRP1", "passengers": too_many})
+    assert response.status_code == 422
@@ -0,0 +1,120 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, func, select
+
+from app.core.models import Booking, CheckinRecord
+from app.core.schemas import CheckinRequest, GroupCheckinRequest
+from conftest import build_booking_service, make_flight, make_passenger
+
+SEATS = ["3A", "3B", "14C", "31D"]
+
+async def seed(session_factory, hours_to_departure=6):
+    async with session_factory() as session:
+        session.add(make_flight("GC1", hours=hours_to_departure))
+        session.add(make_flight("GC2", hours=30))
+        for i, seat_number in enumerate(SEATS):
+            session.add(make_passenger(f"P-GC{i}"))
+            session.add(Booking(booking_id=f"B-GC{i}", flight_id="GC1", passenger_id=f"P-GC{i}", seat_number=seat_number))
+        session.add(Booking(booking_id="B-LATER", flight_id="GC2", passenger_id="P-GC0", seat_number="1A"))
+        await session.commit()
+
+def party(*indexes, passenger_ids=None):
+    return GroupCheckinRequest(checkins=[
+        CheckinRequest(booking_id=f"B-GC{i}", passenger_id=f"P-GC{i}") for i in indexes
+    ] + [CheckinRequest(booking_id=booking_id, passenger_id=passenger_id)
+         for booking_id, passenger_id in (passenger_ids or [])])
+
+async def stored_state(session_factory):
+    async with session_factory() as session:
+        statuses = dict((await session.execute(select(Booking.booking_id, Booking.booking_status))).all())
+        checkins = await session.scalar(select(func.count()).select_from(CheckinRecord))
+        return statuses, checkins
+
+@pytest.mark.asyncio
+async def test_party_checked_in_with_three_statements(sqlite_session_factory):
+    """Test a party is one joined SELECT, one INSERT and one UPDATE, with passes in request order."""
+    await seed(sqlite_session_factory)
+
+    async with sqlite_session_factory() as session:
+        statements = []
+        event.listen(session.sync_session.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        passes = await build_booking_service(session).group_checkin(party(3, 0, 1, 2))
+
+    assert len(statements) == 3
+    assert statements[0].startswith("SELECT") and "JOIN" in statements[0]
+    assert statements[1].startswith("INSERT INTO checkin_records") and "ON CONFLICT" in statements[1]
+    assert statements[2].startswith("UPDATE bookings")
+    assert [(p.seat_number, p.boarding_group) for p in passes] == [("31D", "C"), ("3A", "A"), ("3B", "A"), ("14C", "B")]
+    assert len({p.checkin_id for p in passes}) == len({p.boarding_pass_number for p in passes}) == 4
+    assert all(p.flight_id == "GC1" and p.checkin_time for p in passes)
+
+    statuses, checkins = await stored_state(sqlite_session_factory)
+    assert checkins == 4
+    assert [statuses[f"B-GC{i}"] for i in range(4)] == ["checked_in"] * 4
+    assert statuses["B-LATER"] == "confirmed"
+
+@pytest.mark.asyncio
+async def test_party_is_checked_in_all_or_none(sqlite_session_factory):
+    """Test any booking failing validation or already checked in leaves the whole party unchanged."""
+    await seed(sqlite_session_factory)
+    async with sqlite_session_factory() as session:
+        await build_booking_service(session).checkin(CheckinRequest(booking_id="B-GC2", passenger_id="P-GC2"))
+
+    async with sqlite_session_factory() as session:
+        service = build_booking_service(session)
+        for request, status_code in (
+            (party(0, passenger_ids=[("MISSING", "P-GC1")]), 404),
+            (party(0, passenger_ids=[("B-GC1", "P-GC3")]), 400),
+            (party(0, 1, passenger_ids=[("B-GC0", "P-GC0")]), 400),
+            (party(0, 1, 2), 409),
+            (party(1, passenger_ids=[("B-LATER", "P-GC0")]), 409),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                await service.group_checkin(request)
+            assert exc_info.value.status_code == status_code
+
+    statuses, checkins = await stored_state(sqlite_session_factory)
+    assert checkins == 1
+    assert [statuses[f"B-GC{i}"] for i in range(4)] == ["confirmed", "confirmed", "checked_in", "confirmed"]
+
+@pytest.mark.asyncio
+async def test_party_losing_a_race_rolls_back(sqlite_session_factory):
+    """Test a booking checked in between validation and insert rolls the party back with 409."""
+    await seed(sqlite_session_factory)
+
+    async with sqlite_session_factory() as session:
+        service = build_booking_service(session)
+        validate = service.booking_repo.get_for_checkin
+
+        async def race(booking_ids):
+            bookings = await validate(booking_ids)
+            async with sqlite_session_factory() as other:
+                await build_booking_service(other).checkin(CheckinRequest(booking_id="B-GC1", passenger_id="P-GC1"))
+            return bookings
+
+        service.booking_repo.get_for_checkin = race
+        with pytest.raises(HTTPException) as exc_info:
+            await service.group_checkin(party(0, 1))
+        assert exc_info.value.status_code == 409
+
+    statuses, checkins = await stored_state(sqlite_session_factory)
+    assert checkins == 1
+    assert (statuses["B-GC0"], statuses["B-GC1"]) == ("confirmed", "checked_in")
+
+@pytest.mark.asyncio
+async def test_group_checkin_endpoint(sqlite_session_factory, sqlite_client):
+    """Test POST /api/checkin/group returns every boarding pass and rejects an empty party."""
+    await seed(sqlite_session_factory)
+
+    response = await sqlite_client.post("/api/checkin/group", json={"checkins": [
+        {"booking_id": "B-GC0", "passenger_id": "P-GC0"},
+        {"booking_id": "B-GC1", "passenger_id": "P-GC1"}
+    ]})
+    assert response.status_code == 201
+    assert [p["seat_number"] for p in response.json()] == ["3A", "3B"]
+
+    statuses = await sqlite_client.post("/api/bookings/checkin-status", json={"ids": ["B-GC0", "B-GC1", "B-GC2"]})
+    assert [s["checkin_id"] for s in statuses.json()] == [p["checkin_id"] for p in response.json()] + [None]
+
+    assert (await sqlite_client.post("/api/checkin/group", json={"checkins": []})).status_code == 422
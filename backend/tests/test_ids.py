@@ -0,0 +1,92 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from app.core import ids
+from app.core.ids import (
+    ENCODED_LENGTH, MAX_WORKER_ID, SEQUENCE_MASK, SnowflakeGenerator,
+    decode_id, default_worker_id, encode_id, id_timestamp, id_worker
+)
+
+def test_ids_are_unique_and_increasing():
+    """Test a generator issues strictly increasing IDs."""
+    generator = SnowflakeGenerator(worker_id=7)
+
+    values = [generator.next_id() for _ in range(50000)]
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert all(id_worker(v) == 7 for v in values)
+
+def test_sequence_overflow_borrows_next_millisecond():
+    """Test exhausting a millisecond's sequence keeps IDs unique without waiting."""
+    generator = SnowflakeGenerator(worker_id=1)
+
+    with patch("app.core.ids.time.time_ns", return_value=(ids.EPOCH_MS + 1000) * 1_000_000):
+        values = [generator.next_id() for _ in range(SEQUENCE_MASK + 3)]
+
+    assert len(set(values)) == len(values)
+    assert values == sorted(values)
+    assert id_timestamp(values[-1]) - id_timestamp(values[0]) == timedelta(milliseconds=1)
+
+def test_clock_moving_backwards_keeps_order():
+    """Test a wall clock step back does not produce duplicate or smaller IDs."""
+    generator = SnowflakeGenerator(worker_id=1)
+
+    with patch("app.core.ids.time.time_ns", return_value=(ids.EPOCH_MS + 5000) * 1_000_000):
+        before = generator.next_id()
+    with patch("app.core.ids.time.time_ns", return_value=(ids.EPOCH_MS + 1000) * 1_000_000):
+        after = generator.next_id()
+
+    assert after > before
+
+def test_workers_never_collide():
+    """Test two workers generating in the same millisecond produce disjoint IDs."""
+    with patch("app.core.ids.time.time_ns", return_value=(ids.EPOCH_MS + 1000) * 1_000_000):
+        first, second = SnowflakeGenerator(worker_id=1), SnowflakeGenerator(worker_id=2)
+        first_ids = {first.next_id() for _ in range(100)}
+        second_ids = {second.next_id() for _ in range(100)}
+
+    assert not first_ids & second_ids
+
+def test_worker_id_range_checked():
+    """Test worker IDs outside the 10-bit range are rejected."""
+    with pytest.raises(ValueError):
+        SnowflakeGenerator(worker_id=MAX_WORKER_ID + 1)
+    with pytest.raises(ValueError):
+        SnowflakeGenerator(worker_id=-1)
+
+def test_encoding_round_trips_and_sorts():
+    """Test the base32 encoding is fixed width, reversible and order preserving."""
+    generator = SnowflakeGenerator(worker_id=3)
+    values = [generator.next_id() for _ in range(1000)]
+    encoded = [encode_id(v) for v in values]
+
+    assert all(len(e) == ENCODED_LENGTH for e in encoded)
+    assert [decode_id(e) for e in encoded] == values
+    assert encoded == sorted(encoded)
+    assert not set("".join(encoded)) & set("ILOU")
+
+def test_decoding_tolerates_lowercase_and_lookalikes():
+    """Test hand-typed IDs decode with lowercase, O/0 and I/L/1 mixed up."""
+    value = decode_id("01HZ3K9Q2M4T7")
+
+    assert decode_id("o1hz3k9q2m4t7") == value
+    assert decode_id("0IHZ-3K9Q-2M4T7") == value
+    with pytest.raises(ValueError):
+        decode_id("01HZ3K9Q2M4T*")
+
+def test_id_timestamp_matches_generation_time():
+    """Test the embedded timestamp is the generation time."""
+    before = datetime.now(timezone.utc) - timedelta(milliseconds=1)
+    value = SnowflakeGenerator(worker_id=0).next_id()
+
+    assert before <= id_timestamp(value) <= datetime.now(timezone.utc) + timedelta(milliseconds=1)
+
+def test_default_worker_id(monkeypatch):
+    """Test ID_WORKER_ID overrides the PID-derived worker ID."""
+    monkeypatch.setenv("ID_WORKER_ID", "42")
+    assert default_worker_id() == 42
+
+    monkeypatch.delenv("ID_WORKER_ID")
+    assert 0 <= default_worker_id() <= MAX_WORKER_ID
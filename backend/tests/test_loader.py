@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from sqlalchemy import event
+
+from app.core.flight_cache import flight_cache
+from app.core.loader import BatchLoader, enable_batch_loading
+from app.core.models import Booking, Passenger
+from app.repositories.booking_repository import BookingRepository
+from app.repositories.flight_repository import FlightRepository
+from app.repositories.passenger_repository import PassengerRepository
+from conftest import make_flight, make_passenger
+
+async def seed(session_factory, count=3):
+    async with session_factory() as session:
+        for i in range(count):
+            session.add(make_flight(f"DL{i}"))
+            session.add(make_passenger(f"P-DL{i}"))
+            session.add(Booking(booking_id=f"B-DL{i}", flight_id=f"DL{i}", passenger_id=f"P-DL{i}", seat_number="1A"))
+        await session.commit()
+
+def count_selects(session):
+    selects = []
+    event.listen(
+        session.sync_session.bind, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: selects.append(statement) if statement.startswith("SELECT") else None
+    )
+    return selects
+
+def lookups(session):
+    passengers, bookings = PassengerRepository(session), BookingRepository(session)
+    return [
+        *(passengers.get_by_id(f"P-DL{i}") for i in range(3)),
+        passengers.get_by_id("P-DL0"),
+        passengers.get_by_id("MISSING"),
+        *(bookings.get_by_id(f"B-DL{i}") for i in range(3))
+    ]
+
+@pytest.mark.asyncio
+async def test_lookups_in_one_tick_share_one_query_per_table(sqlite_session_factory):
+    """Test concurrent get_by_id calls become one IN query per repository and repeats are memoized."""
+    await seed(sqlite_session_factory)
+
+    async with sqlite_session_factory() as session:
+        selects = count_selects(session)
+        # Without loaders a session runs one lookup at a time
+        unbatched = [await lookup for lookup in lookups(session)]
+        assert len(selects) == 8
+
+    async with sqlite_session_factory() as session:
+        enable_batch_loading(session)
+        selects = count_selects(session)
+        found = await asyncio.gather(*lookups(session))
+        assert len(selects) == 2
+        assert all(" IN " in statement for statement in selects)
+        again = await PassengerRepository(session).get_by_id("P-DL1")
+        assert len(selects) == 2
+
+    assert [getattr(row, "passenger_id", None) for row in found[:5]] == ["P-DL0", "P-DL1", "P-DL2", "P-DL0", None]
+    assert [row.booking_id for row in found[5:]] == ["B-DL0", "B-DL1", "B-DL2"]
+    assert found[0] is found[3] and again is found[1]
+    assert [getattr(row, "passenger_id", None) for row in unbatched[:5]] == ["P-DL0", "P-DL1", "P-DL2", "P-DL0", None]
+
+@pytest.mark.asyncio
+async def test_writes_forget_memoized_lookups(sqlite_session_factory):
+    """Test a miss memoized before a flush is looked up again after it."""
+    async with sqlite_session_factory() as session:
+        enable_batch_loading(session)
+        selects = count_selects(session)
+        repo = PassengerRepository(session)
+        assert await repo.get_by_id("P-NEW") is None
+        assert await repo.get_by_id("P-NEW") is None
+        assert len(selects) == 1
+
+        session.add(Passenger(
+            passenger_id="P-NEW",
+            first_name="Jane",
+            last_name="Doe",
+            email="new.dl@test.com",
+            phone="+1234567890",
+            date_of_birth="1990-01-15"
+        ))
+        await session.flush()
+        assert (await repo.get_by_id("P-NEW")).email == "new.dl@test.com"
+        assert len(selects) == 2
+
+@pytest.mark.asyncio
+async def test_flight_get_many_reads_through_cache(sqlite_session_factory):
+    """Test get_many loads every uncached flight in one SELECT and serves the next request from the cache."""
+    await seed(sqlite_session_factory)
+
+    async with sqlite_session_factory() as session:
+        enable_batch_loading(session)
+        selects = count_selects(session)
+        flights = await FlightRepository(session).get_many(["DL0", "DL1", "DL2", "DL1", "NONE"])
+        assert sorted(flights) == ["DL0", "DL1", "DL2"]
+        assert len(selects) == 1
+
+    async with sqlite_session_factory() as session:
+        selects = count_selects(session)
+        flights = await FlightRepository(session).get_many(["DL2", "DL0"])
+        assert [flights[flight_id].flight_id for flight_id in ("DL0", "DL2")] == ["DL0", "DL2"]
+        assert len(selects) == 0
+    assert flight_cache.stats()["flights"] == 3
+
+@pytest.mark.asyncio
+async def test_failed_fetch_reaches_every_caller_and_is_retried():
+    """Test a failing batch raises for each waiting load and is not memoized."""
+    calls = []
+
+    async def fetch(keys):
+        calls.append(sorted(keys))
+        if len(calls) == 1:
+            raise RuntimeError("database down")
+        return {key: key.upper() for key in keys}
+
+    loader = BatchLoader(fetch)
+    results = await asyncio.gather(loader.load("a"), loader.load("b"), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await loader.load_many(["a", "b", "a"]) == ["A", "B", "A"]
+    assert calls == [["a", "b"], ["a", "b"]]
@@ -4,7 +4,6 @@ from datetime import datetime, timedelta
 from fastapi import HTTPException
 
 from app.repositories.checkin_repository import CheckinRepository
-from app.repositories.flight_repository import FlightRepository
 from app.services.passenger_service import PassengerService
 from app.services.flight_service import FlightService
 from app.services.booking_service import BookingService
@@ -36,20 +35,6 @@ async def test_checkin_repository_get_with_booking_and_flight():
     result = await repo.get_with_booking_and_flight("CHECK123")
     assert result is None
 
-# Cover remaining lines in flight_repository.py
-@pytest.mark.asyncio
-async def test_flight_repository_get_all():
-    mock_session = AsyncMock()
-    repo = FlightRepository(mock_session)
-    
-    mock_result = AsyncMock()
-    mock_result.scalars = MagicMock()
-    mock_result.scalars.return_value.all = MagicMock(return_value=[])
-    mock_session.execute = AsyncMock(return_value=mock_result)
-    
-    result = await repo.get_all()
-    assert result == []
-
 # Cover remaining lines in passenger_service.py
 @pytest.mark.asyncio
 async def test_passenger_service_get_passenger_not_found():
@@ -0,0 +1,107 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+
+from app.core.models import Booking, Flight, Passenger
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.repositories.flight_repository import FlightRepository
+from app.repositories.passenger_repository import PassengerRepository
+from app.services.flight_service import FlightService
+from app.services.passenger_service import PassengerService
+
+DEPARTURE = datetime(2026, 1, 1, 8)
+
+def make_flight(flight_id, hours):
+    return Flight(
+        flight_id=flight_id,
+        departure_airport="JFK",
+        arrival_airport="LAX",
+        departure_time=DEPARTURE + timedelta(hours=hours),
+        arrival_time=DEPARTURE + timedelta(hours=hours + 6),
+        aircraft_type="Boeing 737",
+        total_seats=180,
+        available_seats=180,
+        status="scheduled"
+    )
+
+async def seed_flights(session_factory):
+    # FL2 and FL1 share a departure time, so the flight id breaks the tie
+    async with session_factory() as session:
+        session.add_all([make_flight("FL3", 2), make_flight("FL2", 0), make_flight("FL1", 0), make_flight("FL4", 1)])
+        await session.commit()
+
+def test_cursor_round_trips_and_rejects_tampering():
+    """Test cursors decode to their position and foreign or garbled cursors are rejected."""
+    cursor = encode_cursor("flights", (DEPARTURE, "FL1"))
+    assert decode_cursor("flights", cursor) == (DEPARTURE, "FL1")
+    assert decode_cursor("flights", None) is None
+
+    for bad in (cursor[:-3], "not-a-cursor", encode_cursor("bookings", (DEPARTURE, "FL1"))):
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor("flights", bad)
+        assert exc_info.value.status_code == 400
+
+@pytest.mark.asyncio
+async def test_flight_pages_follow_departure_then_id(sqlite_session_factory):
+    """Test pages walk every flight once in (departure_time, flight_id) order."""
+    await seed_flights(sqlite_session_factory)
+    seen, cursor = [], None
+    async with sqlite_session_factory() as session:
+        service = FlightService(FlightRepository(session))
+        while True:
+            page = await service.get_flights_page(3 if cursor is None else 2, cursor)
+            seen.append([flight.flight_id for flight in page.items])
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+    assert seen == [["FL1", "FL2", "FL4"], ["FL3"]]
+
+@pytest.mark.asyncio
+async def test_exact_last_page_has_no_cursor(sqlite_session_factory):
+    """Test a page that ends exactly at the last flight does not hand out a cursor."""
+    await seed_flights(sqlite_session_factory)
+    async with sqlite_session_factory() as session:
+        page = await FlightService(FlightRepository(session)).get_flights_page(4)
+
+    assert len(page.items) == 4
+    assert page.next_cursor is None
+
+@pytest.mark.asyncio
+async def test_passenger_bookings_are_paged(sqlite_session_factory):
+    """Test a passenger's bookings are paged by booking date and unknown passengers 404."""
+    async with sqlite_session_factory() as session:
+        session.add(make_flight("FL1", 0))
+        session.add(Passenger(passenger_id="P1", first_name="A", last_name="B", email="a@test.com",
+                              phone="+10000000000", date_of_birth="1990-01-01"))
+        for i in range(3):
+            session.add(Booking(booking_id=f"B{i}", flight_id="FL1", passenger_id="P1", seat_number=f"{i + 1}A",
+                                booking_date=DEPARTURE - timedelta(days=3 - i)))
+        await session.commit()
+
+    async with sqlite_session_factory() as session:
+        service = PassengerService(PassengerRepository(session))
+        first = await service.get_passenger_bookings_page("P1", 2)
+        second = await service.get_passenger_bookings_page("P1", 2, first.next_cursor)
+        with pytest.raises(HTTPException) as exc_info:
+            await service.get_passenger_bookings_page("MISSING", 2)
+
+    assert [b.booking_id for b in first.items] == ["B0", "B1"]
+    assert ([b.booking_id for b in second.items], second.next_cursor) == (["B2"], None)
+    assert exc_info.value.status_code == 404
+
+@pytest.mark.asyncio
+async def test_flights_endpoint_returns_cursor_header(sqlite_session_factory, sqlite_client):
+    """Test GET /api/flights caps the page size and returns the next cursor in a header."""
+    await seed_flights(sqlite_session_factory)
+
+    headers = {"Authorization": "Bearer token"}
+    first = await sqlite_client.get("/api/flights?limit=3", headers=headers)
+    cursor = first.headers[NEXT_CURSOR_HEADER]
+    second = await sqlite_client.get("/api/flights", params={"limit": 3, "cursor": cursor}, headers=headers)
+    too_big = await sqlite_client.get("/api/flights?limit=100000", headers=headers)
+
+    assert [f["flight_id"] for f in first.json()] == ["FL1", "FL2", "FL4"]
+    assert [f["flight_id"] for f in second.json()] == ["FL3"]
+    assert NEXT_CURSOR_HEADER not in second.headers
+    assert too_big.status_code == 422
@@ -0,0 +1,92 @@
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient, ASGITransport
+
+from app.core.auth import get_password_hash
+from app.core.database import get_db
+from app.core.dependencies import get_current_active_user
+from app.core.password_pool import PasswordPool, password_pool
+from app.core.user_models import User
+from main_refactored import app
+
+@pytest.mark.asyncio
+async def test_blocking_hash_leaves_event_loop_free():
+    """Test a slow hash runs in the pool while other coroutines keep running."""
+    pool = PasswordPool(workers=1)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        assert await pool.run(lambda: time.sleep(0.2) or "hashed") == "hashed"
+    finally:
+        task.cancel()
+        pool.shutdown()
+
+    assert ticks >= 5
+
+@pytest.mark.asyncio
+async def test_pool_bounds_concurrency_and_counts_queue():
+    """Test no more than workers hashes run at once and the rest are counted as queued."""
+    pool = PasswordPool(workers=2)
+    running = peak = 0
+
+    def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        time.sleep(0.05)
+        running -= 1
+
+    await asyncio.gather(*(pool.run(work) for _ in range(6)))
+    pool.shutdown()
+
+    stats = pool.stats()
+    assert peak <= 2
+    assert (stats["completed"], stats["peak_queued"], stats["active"], stats["queued"]) == (6, 4, 0, 0)
+
+@pytest.mark.asyncio
+async def test_full_queue_is_refused():
+    """Test hashes beyond the queue limit fail fast with 503 instead of waiting."""
+    pool = PasswordPool(workers=1, max_queue=1)
+    results = await asyncio.gather(*(pool.run(time.sleep, 0.05) for _ in range(3)), return_exceptions=True)
+    pool.shutdown()
+
+    refused = [r for r in results if isinstance(r, HTTPException)]
+    assert len(refused) == 1
+    assert refused[0].status_code == 503
+    assert pool.stats()["rejected"] == 1
+
+@pytest.mark.asyncio
+async def test_login_verifies_password_in_pool(sqlite_session_factory, monkeypatch):
+    """Test /auth/token checks the bcrypt hash through the password pool."""
+    monkeypatch.setattr("app.core.dependencies.ADMIN_USERNAMES", frozenset({"admin"}))
+    async with sqlite_session_factory() as session:
+        session.add(User(username="alice", email="alice@test.com", hashed_password=get_password_hash("secret123")))
+        await session.commit()
+
+    async def override_get_db():
+        async with sqlite_session_factory() as session:
+            yield session
+
+    completed = password_pool.completed
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            ok = await client.post("/auth/token", data={"username": "alice", "password": "secret123"})
+            wrong = await client.post("/auth/token", data={"username": "alice", "password": "nope"})
+            app.dependency_overrides[get_current_active_user] = lambda: User(id=1, username="admin", is_active=True)
+            stats = await client.get("/admin/auth/password-pool")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert (ok.status_code, wrong.status_code) == (200, 401)
+    assert password_pool.completed == completed + 2
+    assert stats.json()["completed"] == password_pool.completed
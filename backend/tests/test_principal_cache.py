@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.core.auth import create_access_token
+from app.core.dependencies import get_current_user
+from app.core.principal_cache import MemoryPrincipalBackend, principal_cache
+from app.core.user_models import User
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+async def seed_user(session_factory, username="alice"):
+    async with session_factory() as session:
+        session.add(User(username=username, email=f"{username}@test.com", hashed_password="hashed", is_active=True))
+        await session.commit()
+
+def count_queries(session):
+    queries = []
+    event.listen(session.sync_session.bind, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    return queries
+
+@pytest.mark.asyncio
+async def test_memory_backend_expires_and_evicts():
+    """Test the in-process backend drops expired entries and the least recently used user."""
+    clock = FakeClock()
+    backend = MemoryPrincipalBackend(capacity=2, clock=clock)
+    await backend.set("alice", {"username": "alice"}, ttl=10)
+    await backend.set("bob", {"username": "bob"}, ttl=10)
+    await backend.get("alice")
+    await backend.set("carol", {"username": "carol"}, ttl=10)
+
+    assert await backend.get("bob") is None
+    assert await backend.get("alice") == {"username": "alice"}
+    clock.now = 11
+    assert await backend.get("alice") is None
+    assert len(backend) == 1
+
+@pytest.mark.asyncio
+async def test_cached_principal_needs_no_query(sqlite_session_factory):
+    """Test the second request with the same token resolves the user without SQL."""
+    await seed_user(sqlite_session_factory)
+    token = create_access_token({"sub": "alice"})
+    hits, misses = principal_cache.hits, principal_cache.misses
+
+    async with sqlite_session_factory() as session:
+        queries = count_queries(session)
+        first = await get_current_user(token, session)
+        second = await get_current_user(token, session)
+
+    assert len(queries) == 1
+    assert (second.id, second.username, second.is_active) == (first.id, "alice", True)
+    assert second.hashed_password is None
+    assert (principal_cache.hits - hits, principal_cache.misses - misses) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_deactivation_invalidates_principal(sqlite_session_factory):
+    """Test a committed deactivation reaches the next request instead of the cached user."""
+    await seed_user(sqlite_session_factory)
+    token = create_access_token({"sub": "alice"})
+    async with sqlite_session_factory() as session:
+        await get_current_user(token, session)
+
+    async with sqlite_session_factory() as session:
+        user = await session.get(User, 1)
+        user.is_active = False
+        await session.commit()
+    await asyncio.sleep(0)
+
+    assert await principal_cache.get("alice") is None
+    # The deactivation also revoked the tokens alice held
+    async with sqlite_session_factory() as session:
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(token, session)
+    assert exc_info.value.status_code == 401
+
+@pytest.mark.asyncio
+async def test_rename_invalidates_old_subject(sqlite_session_factory):
+    """Test tokens for a renamed user stop resolving once the rename commits."""
+    await seed_user(sqlite_session_factory)
+    token = create_access_token({"sub": "alice"})
+    async with sqlite_session_factory() as session:
+        await get_current_user(token, session)
+
+    async with sqlite_session_factory() as session:
+        user = await session.get(User, 1)
+        user.username = "alicia"
+        await session.commit()
+    await asyncio.sleep(0)
+
+    async with sqlite_session_factory() as session:
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(token, session)
+    assert exc_info.value.status_code == 401
+
+@pytest.mark.asyncio
+async def test_rolled_back_change_keeps_principal(sqlite_session_factory, monkeypatch):
+    """Test an uncommitted change does not invalidate anything."""
+    await seed_user(sqlite_session_factory)
+    invalidate = AsyncMock()
+    monkeypatch.setattr(principal_cache, "invalidate", invalidate)
+
+    async with sqlite_session_factory() as session:
+        user = await session.get(User, 1)
+        user.is_active = False
+        await session.flush()
+        await session.rollback()
+        await session.commit()
+    await asyncio.sleep(0)
+
+    invalidate.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_backend_outage_falls_back_to_database(sqlite_session_factory, monkeypatch):
+    """Test a failing shared backend costs a query instead of failing authentication."""
+    await seed_user(sqlite_session_factory)
+    backend = AsyncMock()
+    backend.get.side_effect = ConnectionError("cache down")
+    backend.set.side_effect = ConnectionError("cache down")
+    monkeypatch.setattr(principal_cache, "backend", backend)
+    errors = principal_cache.errors
+
+    async with sqlite_session_factory() as session:
+        user = await get_current_user(create_access_token({"sub": "alice"}), session)
+
+    assert user.username == "alice"
+    assert principal_cache.errors == errors + 2
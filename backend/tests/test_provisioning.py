@@ -0,0 +1,101 @@
+import json
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event, select
+from httpx import AsyncClient, ASGITransport
+
+from app.core.auth import verify_password
+from app.core.database import get_db
+from app.core.dependencies import get_current_active_user
+from app.core.provisioning import UserProvisioner, hash_pool, iterate, stream_lines
+from app.core.user_models import User
+from main_refactored import app
+
+async def seed_user(session_factory, username, email):
+    async with session_factory() as session:
+        session.add(User(username=username, email=email, hashed_password="hashed", is_active=True))
+        await session.commit()
+
+def jsonl(*users):
+    return [json.dumps({"username": u, "email": f"{u}@test.com", "password": "secret123"}) for u in users]
+
+@pytest.mark.asyncio
+async def test_bulk_insert_batches_and_hashes(sqlite_session_factory):
+    """Test users are created with one SELECT and one INSERT per batch and usable passwords."""
+    async with sqlite_session_factory() as session:
+        statements = []
+        event.listen(session.sync_session.bind, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        with ThreadPoolExecutor(2) as executor:
+            report = await UserProvisioner(session, executor, processes=2, batch_size=3).run(
+                iterate(jsonl("agent1", "agent2", "agent3", "agent4", "agent5")), "jsonl"
+            )
+        users = (await session.execute(select(User).order_by(User.username))).scalars().all()
+
+    assert report.created == 5
+    assert [u.username for u in users] == ["agent1", "agent2", "agent3", "agent4", "agent5"]
+    assert verify_password("secret123", users[0].hashed_password)
+    assert len([s for s in statements if s.startswith("INSERT")]) == 2
+
+@pytest.mark.asyncio
+async def test_duplicates_and_invalid_rows_are_reported(sqlite_session_factory):
+    """Test existing users, repeated rows and bad rows are reported while the rest are created."""
+    await seed_user(sqlite_session_factory, "taken", "taken@test.com")
+    lines = [
+        "username,email,password",
+        "new1,new1@test.com,secret123",
+        "taken,other@test.com,secret123",
+        "new2,taken@test.com,secret123",
+        "new1,again@test.com,secret123",
+        "x,not-an-email,1",
+        "",
+        "new3,new3@test.com,secret123",
+    ]
+    async with sqlite_session_factory() as session:
+        with ThreadPoolExecutor(1) as executor:
+            report = await UserProvisioner(session, executor, processes=1).run(iterate(lines), "csv")
+
+    assert report.created == 2
+    assert [(d.line, d.reason) for d in report.duplicates] == [
+        (5, "username repeats line 2"), (3, "username exists"), (4, "email exists")
+    ]
+    assert [i.line for i in report.invalid] == [6]
+
+@pytest.mark.asyncio
+async def test_stream_lines_rejoins_chunks():
+    """Test lines split across body chunks are reassembled."""
+    async def chunks():
+        for chunk in (b"\xef\xbb\xbfone\ntw", b"o\nthr", b"ee"):
+            yield chunk
+
+    assert [line async for line in stream_lines(chunks())] == ["one", "two", "three"]
+
+@pytest.mark.asyncio
+async def test_bulk_endpoint_streams_body(sqlite_session_factory, monkeypatch):
+    """Test the admin endpoint provisions a JSONL body through the shared process pool and refuses non-admins."""
+    monkeypatch.setattr("app.core.dependencies.ADMIN_USERNAMES", frozenset({"admin"}))
+
+    async def override_get_db():
+        async with sqlite_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = lambda: User(id=1, username="admin", is_active=True)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/admin/users/bulk?format=jsonl", content="\n".join(jsonl("bulk1", "bulk2", "bulk1")))
+            bad_format = await client.post("/admin/users/bulk?format=xml", content="")
+            executor = hash_pool.executor
+            again = await client.post("/admin/users/bulk?format=jsonl", content="\n".join(jsonl("bulk3")))
+            assert hash_pool.executor is executor
+            app.dependency_overrides[get_current_active_user] = lambda: User(id=2, username="agent", is_active=True)
+            forbidden = await client.post("/admin/users/bulk?format=jsonl", content="\n".join(jsonl("bulk4")))
+    finally:
+        app.dependency_overrides.clear()
+        hash_pool.shutdown()
+
+    assert response.status_code == 200
+    assert response.json()["created"] == 2
+    assert response.json()["duplicates"][0]["username"] == "bulk1"
+    assert bad_format.status_code == 422
+    assert again.json()["created"] == 1
+    assert forbidden.status_code == 403
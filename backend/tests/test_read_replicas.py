@@ -0,0 +1,179 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from httpx import AsyncClient, ASGITransport
+
+from app.core.models import Base
+from app.core.replicas import Replica, ReplicaRouter
+from app.core.database import get_db
+from app.core.dependencies import get_current_active_user
+from app.core.user_models import User
+import app.core.dependencies as dependencies
+from main_refactored import app
+from conftest import make_flight
+
+@pytest.fixture
+async def sqlite_databases(tmp_path):
+    """Primary and replica SQLite files; the replica holds a flight the primary lacks."""
+    engines = {}
+    factories = {}
+    for name in ("primary", "replica"):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        engines[name] = engine
+        factories[name] = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with factories["replica"]() as session:
+        session.add(make_flight("REP1"))
+        await session.commit()
+
+    yield factories
+
+    for engine in engines.values():
+        await engine.dispose()
+
+def make_router(*replicas, **kwargs):
+    kwargs.setdefault("lag_probe", AsyncMock(return_value=0.0))
+    return ReplicaRouter(list(replicas), **kwargs)
+
+@pytest.mark.asyncio
+async def test_router_without_replicas_uses_primary():
+    """Test no configured replicas routes every read to the primary."""
+    router = ReplicaRouter([])
+
+    assert await router.choose("alice") is None
+
+@pytest.mark.asyncio
+async def test_router_round_robins_replicas():
+    """Test reads are spread across healthy replicas."""
+    first = Replica(name="r1", session_factory=MagicMock())
+    second = Replica(name="r2", session_factory=MagicMock())
+    router = make_router(first, second)
+
+    chosen = [await router.choose("alice") for _ in range(4)]
+
+    assert [r.name for r in chosen] == ["r1", "r2", "r1", "r2"]
+
+@pytest.mark.asyncio
+async def test_router_pins_writer_to_primary():
+    """Test read-your-writes pinning only affects the writing client."""
+    router = make_router(Replica(name="r1", session_factory=MagicMock()))
+
+    router.pin("alice")
+
+    assert await router.choose("alice") is None
+    assert (await router.choose("bob")).name == "r1"
+    assert router.stats()["pinned_reads"] == 1
+
+@pytest.mark.asyncio
+async def test_router_pin_expires():
+    """Test a pin stops applying once it expires."""
+    router = make_router(Replica(name="r1", session_factory=MagicMock()), pin_seconds=0)
+
+    router.pin("alice")
+
+    assert (await router.choose("alice")).name == "r1"
+
+@pytest.mark.asyncio
+async def test_router_skips_lagging_replica():
+    """Test replicas over the lag threshold are skipped."""
+    lagging = Replica(name="lagging", session_factory=MagicMock())
+    fresh = Replica(name="fresh", session_factory=MagicMock())
+    probe = AsyncMock(side_effect=[30.0, 0.5])
+    router = make_router(lagging, fresh, max_lag=5.0, lag_probe=probe)
+
+    chosen = await router.choose("alice")
+
+    assert chosen.name == "fresh"
+    assert lagging.lag == 30.0
+
+@pytest.mark.asyncio
+async def test_router_falls_back_when_all_replicas_unhealthy():
+    """Test failing lag probes mark replicas unhealthy and reads fall back to the primary."""
+    replica = Replica(name="down", session_factory=MagicMock())
+    router = make_router(replica, lag_probe=AsyncMock(side_effect=OSError("connection refused")))
+
+    assert await router.choose("alice") is None
+    assert replica.healthy is False
+    assert router.stats()["primary_fallback_reads"] == 1
+
+@pytest.mark.asyncio
+async def test_router_caches_lag_between_checks():
+    """Test the lag probe runs at most once per check interval."""
+    probe = AsyncMock(return_value=0.0)
+    router = make_router(Replica(name="r1", session_factory=MagicMock()), lag_probe=probe, lag_check_interval=60)
+
+    for _ in range(5):
+        await router.choose("alice")
+
+    assert probe.await_count == 1
+
+@pytest.mark.asyncio
+async def test_get_flight_reads_from_replica_until_pinned(sqlite_databases, monkeypatch):
+    """Test GET routes read from the replica file and pinned users read from the primary file."""
+    router = ReplicaRouter([Replica(name="replica", session_factory=sqlite_databases["replica"])])
+    monkeypatch.setattr(dependencies, "replica_router", router)
+
+    async def override_get_db():
+        async with sqlite_databases["primary"]() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_active_user] = lambda: User(id=1, username="alice", is_active=True)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            from_replica = await client.get("/api/flights/REP1")
+            router.pin("alice")
+            from_primary = await client.get("/api/flights/REP1")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert from_replica.status_code == 200
+    assert from_replica.json()["flight_id"] == "REP1"
+    assert from_primary.status_code == 404
+
+@pytest.mark.asyncio
+async def test_creators_read_their_new_flight_and_passenger(sqlite_databases, monkeypatch):
+    """Test creating a flight or passenger pins the creator to the primary file."""
+    router = ReplicaRouter([Replica(name="replica", session_factory=sqlite_databases["replica"])])
+    monkeypatch.setattr(dependencies, "replica_router", router)
+
+    async def override_get_db():
+        async with sqlite_databases["primary"]() as session:
+            yield session
+
+    flight = make_flight("NEW1")
+    flight_data = {
+        "flight_id": "NEW1",
+        "departure_airport": flight.departure_airport,
+        "arrival_airport": flight.arrival_airport,
+        "departure_time": flight.departure_time.isoformat(),
+        "arrival_time": flight.arrival_time.isoformat(),
+        "aircraft_type": flight.aircraft_type,
+        "total_seats": flight.total_seats
+    }
+    passenger_data = {
+        "first_name": "Bob",
+        "last_name": "Doe",
+        "email": "bob.doe@test.com",
+        "phone": "+1234567890",
+        "date_of_birth": "1990-01-15"
+    }
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            app.dependency_overrides[get_current_active_user] = lambda: User(id=1, username="alice", is_active=True)
+            created_flight = await client.post("/api/flights", json=flight_data)
+            read_flight = await client.get("/api/flights/NEW1")
+            app.dependency_overrides[get_current_active_user] = lambda: User(id=2, username="bob", is_active=True)
+            created_passenger = await client.post("/api/passengers", json=passenger_data)
+            passenger_id = created_passenger.json()["passenger_id"]
+            read_passenger = await client.get(f"/api/passengers/{passenger_id}")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert (created_flight.status_code, read_flight.status_code) == (201, 200)
+    assert (created_passenger.status_code, read_passenger.status_code) == (201, 200)
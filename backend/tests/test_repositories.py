@@ -56,53 +56,6 @@ async def test_flight_repository_get_by_id(db_session: AsyncSession):
     flight = await repo.get_by_id("NONEXISTENT")
     assert flight is None
 
-@pytest.mark.asyncio
-async def test_flight_repository_get_all(db_session: AsyncSession):
-    """Test flight repository get all."""
-    repo = FlightRepository(db_session)
-    
-    # Initially empty
-    flights = await repo.get_all()
-    assert len(flights) == 0
-    
-    # Create flights
-    for i in range(3):
-        flight_data = FlightCreate(
-            flight_id=f"TEST{i}",
-            departure_airport="JFK",
-            arrival_airport="LAX",
-            departure_time=datetime.utcnow() + timedelta(hours=6),
-            arrival_time=datetime.utcnow() + timedelta(hours=12),
-            aircraft_type="Boeing 737",
-            total_seats=180
-        )
-        await repo.create(flight_data)
-    
-    flights = await repo.get_all()
-    assert len(flights) == 3
-
-@pytest.mark.asyncio
-async def test_flight_repository_update_seats(db_session: AsyncSession):
-    """Test flight repository update available seats."""
-    repo = FlightRepository(db_session)
-    
-    flight_data = FlightCreate(
-        flight_id="TEST123",
-        departure_airport="JFK",
-        arrival_airport="LAX",
-        departure_time=datetime.utcnow() + timedelta(hours=6),
-        arrival_time=datetime.utcnow() + timedelta(hours=12),
-        aircraft_type="Boeing 737",
-        total_seats=180
-    )
-    await repo.create(flight_data)
-    
-    # Update seats
-    await repo.update_available_seats("TEST123", -1)
-    
-    flight = await repo.get_by_id("TEST123")
-    assert flight.available_seats == 179
-
 @pytest.mark.asyncio
 async def test_passenger_repository_create(db_session: AsyncSession):
     """Test passenger repository create method."""
@@ -58,57 +58,6 @@ async def test_flight_repository_get_by_id(db_session: AsyncSession):
     assert flight.flight_id == "TEST123"
     assert flight.departure_airport == "JFK"
 
-@pytest.mark.asyncio
-async def test_flight_repository_get_all(db_session: AsyncSession):
-    """Test flight repository get all flights."""
-    repo = FlightRepository(db_session)
-    
-    # Create multiple flights
-    for i in range(3):
-        flight_data = {
-            "flight_id": f"TEST{i}",
-            "departure_airport": "JFK",
-            "arrival_airport": "LAX",
-            "departure_time": datetime.utcnow() + timedelta(hours=6+i),
-            "arrival_time": datetime.utcnow() + timedelta(hours=12+i),
-            "aircraft_type": "Boeing 737",
-            "total_seats": 180,
-            "available_seats": 180,
-            "status": "scheduled"
-        }
-        await repo.create(flight_data)
-    
-    flights = await repo.get_all()
-    
-    assert len(flights) == 3
-    assert all(f.flight_id.startswith("TEST") for f in flights)
-
-@pytest.mark.asyncio
-async def test_flight_repository_update_available_seats(db_session: AsyncSession):
-    """Test flight repository update available seats."""
-    repo = FlightRepository(db_session)
-    
-    # Create flight
-    flight_data = {
-        "flight_id": "TEST123",
-        "departure_airport": "JFK",
-        "arrival_airport": "LAX",
-        "departure_time": datetime.utcnow() + timedelta(hours=6),
-        "arrival_time": datetime.utcnow() + timedelta(hours=12),
-        "aircraft_type": "Boeing 737",
-        "total_seats": 180,
-        "available_seats": 180,
-        "status": "scheduled"
-    }
-    
-    await repo.create(flight_data)
-    
-    # Update available seats
-    await repo.update_available_seats("TEST123", -1)
-    
-    flight = await repo.get_by_id("TEST123")
-    assert flight.available_seats == 179
-
 @pytest.mark.asyncio
 async def test_passenger_repository_create(db_session: AsyncSession):
     """Test passenger repository create operation."""
@@ -151,52 +100,6 @@ async def test_passenger_repository_get_by_email(db_session: AsyncSession):
     assert passenger.passenger_id == created_passenger.passenger_id
     assert passenger.first_name == "John"
 
-@pytest.mark.asyncio
-async def test_passenger_repository_get_bookings(db_session: AsyncSession):
-    """Test passenger repository get bookings."""
-    passenger_repo = PassengerRepository(db_session)
-    flight_repo = FlightRepository(db_session)
-    booking_repo = BookingRepository(db_session)
-    
-    # Create passenger
-    passenger_data = {
-        "first_name": "John",
-        "last_name": "Doe",
-        "email": "john.doe@test.com",
-        "phone": "+1234567890",
-        "date_of_birth": "1990-01-15"
-    }
-    passenger = await passenger_repo.create(passenger_data)
-    
-    # Create flight
-    flight_data = {
-        "flight_id": "TEST123",
-        "departure_airport": "JFK",
-        "arrival_airport": "LAX",
-        "departure_time": datetime.utcnow() + timedelta(hours=6),
-        "arrival_time": datetime.utcnow() + timedelta(hours=12),
-        "aircraft_type": "Boeing 737",
-        "total_seats": 180,
-        "available_seats": 180,
-        "status": "scheduled"
-    }
-    await flight_repo.create(flight_data)
-    
-    # Create booking
-    booking_data = {
-        "flight_id": "TEST123",
-        "passenger_id": passenger.passenger_id,
-        "seat_number": "12A",
-        "booking_status": "confirmed"
-    }
-    await booking_repo.create(booking_data)
-    
-    # Get passenger bookings
-    bookings = await passenger_repo.get_bookings(passenger.passenger_id)
-    
-    assert len(bookings) == 1
-    assert bookings[0].seat_number == "12A"
-
 @pytest.mark.asyncio
 async def test_booking_repository_create(db_session: AsyncSession):
     """Test booking repository create operation."""
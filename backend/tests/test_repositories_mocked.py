@@ -12,8 +12,7 @@ async def test_flight_repository_create_mocked():
     """Test flight repository create with mocked database."""
     mock_session = AsyncMock()
     mock_session.add = MagicMock()
-    mock_session.commit = AsyncMock()
-    mock_session.refresh = AsyncMock()
+    mock_session.flush = AsyncMock()
     
     repo = FlightRepository(mock_session)
     
@@ -30,7 +29,8 @@ async def test_flight_repository_create_mocked():
     result = await repo.create(flight_data)
     
     mock_session.add.assert_called_once()
-    mock_session.commit.assert_called_once()
+    mock_session.flush.assert_called_once()
+    mock_session.commit.assert_not_called()
     assert isinstance(result, Flight)
 
 @pytest.mark.asyncio
@@ -64,8 +64,7 @@ async def test_passenger_repository_create_mocked():
     """Test passenger repository create with mocked database."""
     mock_session = AsyncMock()
     mock_session.add = MagicMock()
-    mock_session.commit = AsyncMock()
-    mock_session.refresh = AsyncMock()
+    mock_session.flush = AsyncMock()
     
     repo = PassengerRepository(mock_session)
     
@@ -80,14 +79,15 @@ async def test_passenger_repository_create_mocked():
     result = await repo.create(passenger_data)
     
     mock_session.add.assert_called_once()
-    mock_session.commit.assert_called_once()
+    mock_session.flush.assert_called_once()
+    mock_session.commit.assert_not_called()
     assert isinstance(result, Passenger)
 
 @pytest.mark.asyncio
 async def test_repository_error_handling_mocked():
     """Test repository error handling with mocked database."""
     mock_session = AsyncMock()
-    mock_session.commit = AsyncMock(side_effect=Exception("Database error"))
+    mock_session.flush = AsyncMock(side_effect=Exception("Database error"))
     
     repo = FlightRepository(mock_session)
     
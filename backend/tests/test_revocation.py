@@ -0,0 +1,153 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from httpx import AsyncClient, ASGITransport
+
+from app.core import dependencies
+from app.core.auth import create_access_token, decode_token, principal_claims
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.core.revocation import RevocationList, revocation_list
+from app.core.user_models import TokenRevocation, User
+from main_refactored import app
+
+async def seed_user(session_factory, username="alice"):
+    async with session_factory() as session:
+        user = User(username=username, email=f"{username}@test.com", hashed_password="hashed", is_active=True)
+        session.add(user)
+        await session.commit()
+        return user
+
+def count_queries(session):
+    queries = []
+    event.listen(session.sync_session.bind, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    return queries
+
+def revocation(jti=None, username=None, revoked_at=None, expires_in=30, id=None):
+    revoked_at = revoked_at or datetime.utcnow()
+    return TokenRevocation(
+        id=id, jti=jti, username=username, revoked_at=revoked_at,
+        expires_at=datetime.utcnow() + timedelta(minutes=expires_in)
+    )
+
+@pytest.mark.asyncio
+async def test_stateless_principal_needs_no_query(sqlite_session_factory, monkeypatch):
+    """Test stateless mode builds the user from the token claims without SQL."""
+    monkeypatch.setattr(dependencies, "AUTH_MODE", "stateless")
+    user = await seed_user(sqlite_session_factory)
+    token = create_access_token(principal_claims(user))
+
+    async with sqlite_session_factory() as session:
+        queries = count_queries(session)
+        principal = await get_current_user(token, session)
+
+    assert queries == []
+    assert (principal.id, principal.username, principal.is_active) == (user.id, "alice", True)
+
+@pytest.mark.asyncio
+async def test_revoked_token_is_rejected_in_both_modes(sqlite_session_factory, monkeypatch):
+    """Test a revoked jti fails authentication whatever the auth mode."""
+    user = await seed_user(sqlite_session_factory)
+    token = create_access_token(principal_claims(user))
+    async with sqlite_session_factory() as session:
+        await revocation_list.revoke_token(session, decode_token(token))
+
+    for mode in ("database", "stateless"):
+        monkeypatch.setattr(dependencies, "AUTH_MODE", mode)
+        async with sqlite_session_factory() as session:
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_user(token, session)
+        assert exc_info.value.status_code == 401
+
+def test_user_revocation_only_matches_older_tokens():
+    """Test revoking a user leaves tokens issued after the revocation valid."""
+    revocations = RevocationList()
+    revocations.add(revocation(username="alice", revoked_at=datetime.utcnow() - timedelta(minutes=1)))
+    claims = decode_token(create_access_token({"sub": "alice"}, timedelta(minutes=5)))
+    old = {**claims, "iat": claims["iat"] - 120}
+
+    assert revocations.is_revoked(old)
+    assert not revocations.is_revoked(decode_token(create_access_token({"sub": "alice"})))
+    assert not revocations.is_revoked(decode_token(create_access_token({"sub": "bob"})))
+
+def test_prune_drops_expired_revocations():
+    """Test entries go once every token they could match has expired."""
+    revocations = RevocationList()
+    revocations.add(revocation(jti="gone", expires_in=-1))
+    revocations.add(revocation(jti="kept"))
+    revocations.add(revocation(username="alice", expires_in=-1))
+    revocations.prune()
+
+    assert not revocations.is_revoked({"jti": "gone", "sub": "bob"})
+    assert revocations.is_revoked({"jti": "kept", "sub": "bob"})
+    assert not revocations.is_revoked({"jti": "x", "sub": "alice", "iat": 0})
+
+@pytest.mark.asyncio
+async def test_refresh_loads_other_workers_revocations(sqlite_session_factory):
+    """Test refresh picks up rows written elsewhere and skips expired ones."""
+    async with sqlite_session_factory() as session:
+        session.add_all([revocation(jti="a"), revocation(jti="b", expires_in=-1)])
+        await session.commit()
+    worker = RevocationList()
+
+    async with sqlite_session_factory() as session:
+        assert await worker.refresh(session) == 1
+        session.add(revocation(jti="c"))
+        await session.commit()
+        await worker.refresh(session)
+
+    assert worker.is_revoked({"jti": "a", "sub": "x"})
+    assert worker.is_revoked({"jti": "c", "sub": "x"})
+    assert not worker.is_revoked({"jti": "b", "sub": "x"})
+
+@pytest.mark.asyncio
+async def test_deactivation_revokes_user_tokens(sqlite_session_factory, monkeypatch):
+    """Test deactivating a user writes a revocation row and rejects its stateless tokens."""
+    monkeypatch.setattr(dependencies, "AUTH_MODE", "stateless")
+    user = await seed_user(sqlite_session_factory)
+    token = create_access_token(principal_claims(user))
+
+    async with sqlite_session_factory() as session:
+        user = await session.get(User, user.id)
+        user.is_active = False
+        await session.commit()
+        rows = (await session.execute(select(TokenRevocation))).scalars().all()
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_user(token, session)
+
+    assert [row.username for row in rows] == ["alice"]
+    assert exc_info.value.status_code == 401
+
+@pytest.mark.asyncio
+async def test_rolled_back_deactivation_revokes_nothing(sqlite_session_factory):
+    """Test an uncommitted deactivation leaves the user's tokens valid."""
+    user = await seed_user(sqlite_session_factory)
+    async with sqlite_session_factory() as session:
+        user = await session.get(User, user.id)
+        user.is_active = False
+        await session.flush()
+        await session.rollback()
+
+    assert not revocation_list.is_revoked({"sub": "alice", "iat": 0})
+
+@pytest.mark.asyncio
+async def test_logout_revokes_token(sqlite_session_factory):
+    """Test logging out makes the same token fail authentication."""
+    user = await seed_user(sqlite_session_factory)
+    token = create_access_token(principal_claims(user))
+
+    async def override_get_db():
+        async with sqlite_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            headers = {"Authorization": f"Bearer {token}"}
+            assert (await client.post("/auth/logout", headers=headers)).status_code == 204
+            response = await client.get("/admin/cache/principals", headers=headers)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 401
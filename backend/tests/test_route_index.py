@@ -0,0 +1,169 @@
+import random
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+
+from app.core.models import Flight
+from app.core.pagination import decode_cursor
+from app.core.route_index import FlightRecord, RouteIndex, route_index
+from app.core.schemas import FlightCreate, FlightSearch
+from app.core.seat_counts import seat_counts
+from app.core.unit_of_work import UnitOfWork
+from app.repositories.flight_repository import FlightRepository
+from app.services.flight_service import FlightService
+
+NOW = datetime.utcnow().replace(microsecond=0)
+
+def record(flight_id, origin, destination, hours, status="scheduled", available_seats=180):
+    return FlightRecord(
+        flight_id=flight_id,
+        departure_airport=origin,
+        arrival_airport=destination,
+        departure_time=NOW + timedelta(hours=hours),
+        arrival_time=NOW + timedelta(hours=hours + 5),
+        aircraft_type="Boeing 737",
+        total_seats=180,
+        available_seats=available_seats,
+        status=status
+    )
+
+def flight_data(flight_id, hours):
+    return FlightCreate(
+        flight_id=flight_id,
+        departure_airport="JFK",
+        arrival_airport="LAX",
+        departure_time=NOW + timedelta(hours=hours),
+        arrival_time=NOW + timedelta(hours=hours + 6),
+        aircraft_type="Boeing 737",
+        total_seats=6
+    )
+
+def count_selects(session):
+    selects = []
+    event.listen(
+        session.sync_session.bind, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: selects.append(statement) if statement.startswith("SELECT") else None
+    )
+    return selects
+
+def test_search_merges_routes_in_departure_order():
+    """Test searches merge every matching route and honour the cursor, range and status."""
+    index = RouteIndex()
+    index.build([
+        record("FL1", "JFK", "LAX", 3),
+        record("FL2", "JFK", "SFO", 1),
+        record("FL3", "ORD", "LAX", 2, status="delayed"),
+        record("FL4", "JFK", "LAX", 1),
+        record("FL5", "JFK", "LAX", 9),
+    ], NOW)
+    start = NOW
+
+    def ids(limit=10, after=None, **filters):
+        return [r.flight_id for r in index.search(FlightSearch(departure_from=start, **filters), limit, after)]
+
+    assert ids() == ["FL2", "FL4", "FL3", "FL1", "FL5"]
+    assert ids(departure_airport="JFK", arrival_airport="LAX") == ["FL4", "FL1", "FL5"]
+    assert ids(arrival_airport="LAX", status="delayed") == ["FL3"]
+    assert ids(departure_to=NOW + timedelta(hours=3)) == ["FL2", "FL4", "FL3"]
+    assert ids(limit=2, after=(NOW + timedelta(hours=1), "FL2")) == ["FL4", "FL3"]
+    assert ids(departure_airport="BOS") == []
+
+def test_upsert_moves_and_seat_counts_update_in_place():
+    """Test a rescheduled flight moves within its route and seat counts change without a rebuild."""
+    index = RouteIndex()
+    index.build([record("FL1", "JFK", "LAX", 1), record("FL2", "JFK", "LAX", 2)], NOW)
+
+    index.upsert(record("FL1", "JFK", "LAX", 3))
+    index.upsert(record("OLD", "JFK", "LAX", -1))
+    index.set_available_seats({"FL2": 7, "MISSING": 1})
+    found = index.search(FlightSearch(departure_from=NOW), 10)
+
+    assert [(r.flight_id, r.available_seats) for r in found] == [("FL2", 7), ("FL1", 180)]
+    index.remove("FL2")
+    assert len(index) == 1
+
+def test_route_changes_leave_running_searches_alone():
+    """Test flights added, moved and removed while a search iterates a route do not shift what that search reads."""
+    index = RouteIndex()
+    index.build([record(f"FL{i}", "JFK", "LAX", i) for i in range(1, 6)], NOW)
+    running = index.routes_from("JFK")["LAX"].departing_from(NOW)
+    assert next(running).flight_id == "FL1"
+
+    index.upsert(record("FL0", "JFK", "LAX", 0))
+    index.upsert(record("FL3", "JFK", "LAX", 9))
+    index.remove("FL2")
+
+    assert [r.flight_id for r in running] == ["FL2", "FL3", "FL4", "FL5"]
+    assert [r.flight_id for r in index.routes_from("JFK")["LAX"].departing_from(NOW)] == ["FL0", "FL1", "FL4", "FL5", "FL3"]
+
+def test_index_matches_sorted_scan():
+    """Test randomized searches return what filtering and sorting every flight would."""
+    rng = random.Random(7)
+    airports = ["JFK", "LAX", "ORD", "SFO"]
+    records = [
+        record(f"FL{i:04d}", rng.choice(airports), rng.choice(airports), rng.randrange(0, 500),
+               status=rng.choice(["scheduled", "delayed"]))
+        for i in range(2000)
+    ]
+    index = RouteIndex()
+    index.build(records, NOW)
+
+    for _ in range(200):
+        search = FlightSearch(
+            departure_airport=rng.choice(airports + [None]),
+            arrival_airport=rng.choice(airports + [None]),
+            departure_from=NOW + timedelta(hours=rng.randrange(0, 100)),
+            departure_to=rng.choice([None, NOW + timedelta(hours=rng.randrange(100, 500))]),
+            status=rng.choice(["delayed", None])
+        )
+        expected = sorted(
+            (r for r in records
+             if (not search.departure_airport or r.departure_airport == search.departure_airport)
+             and (not search.arrival_airport or r.arrival_airport == search.arrival_airport)
+             and r.departure_time >= search.departure_from
+             and (search.departure_to is None or r.departure_time < search.departure_to)
+             and (not search.status or r.status == search.status)),
+            key=lambda r: (r.departure_time, r.flight_id)
+        )[:25]
+        assert [r.flight_id for r in index.search(search, 25)] == [r.flight_id for r in expected]
+
+@pytest.mark.asyncio
+async def test_covered_search_needs_no_query(sqlite_session_factory):
+    """Test a search inside the index horizon is answered and paged without SQL."""
+    async with sqlite_session_factory() as session:
+        service = FlightService(FlightRepository(session), UnitOfWork(session))
+        for i in range(3):
+            await service.create_flight(flight_data(f"RI{i}", i + 1))
+        await route_index.rebuild(session)
+
+    async with sqlite_session_factory() as session:
+        selects = count_selects(session)
+        service = FlightService(FlightRepository(session))
+        search = FlightSearch(departure_airport="JFK", departure_from=route_index.horizon)
+        first = await service.get_flights_page(2, search=search)
+        second = await service.get_flights_page(2, first.next_cursor, search)
+        older = await service.get_flights_page(2, search=FlightSearch(departure_airport="JFK"))
+
+    assert [f.flight_id for f in first.items + second.items] == ["RI0", "RI1", "RI2"]
+    assert len(selects) == 1
+    assert [f.flight_id for f in older.items] == ["RI0", "RI1"]
+
+@pytest.mark.asyncio
+async def test_commits_and_seat_refreshes_reach_the_index(sqlite_session_factory):
+    """Test created flights appear once committed and seat count refreshes update their records."""
+    async with sqlite_session_factory() as session:
+        await route_index.rebuild(session)
+
+    async with sqlite_session_factory() as session:
+        repo = FlightRepository(session)
+        await FlightService(repo, UnitOfWork(session)).create_flight(flight_data("RI9", 2))
+        async with session.begin_nested():
+            await repo.create(flight_data("GONE", 3))
+            await session.rollback()
+        await repo.claim_seat("RI9", "B1")
+        await session.commit()
+        seat_counts.mark("RI9")
+        await seat_counts.flush(session)
+
+    found = route_index.search(FlightSearch(departure_from=route_index.horizon), 10)
+    assert [(r.flight_id, r.available_seats) for r in found] == [("RI9", 5)]
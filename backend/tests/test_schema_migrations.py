@@ -0,0 +1,148 @@
+import io
+import pytest
+import sqlalchemy as sa
+from datetime import datetime, timedelta
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.models import Base
+from app.core.schema import (
+    SchemaVersionError, alembic_config, head_revision, prepare_schema,
+    upgrade_schema, verify_schema
+)
+
+@pytest.fixture
+async def sqlite_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    yield engine
+    await engine.dispose()
+
+async def index_names(engine, table):
+    async with engine.connect() as conn:
+        return await conn.run_sync(lambda c: {i["name"]: i for i in inspect(c).get_indexes(table)})
+
+@pytest.mark.asyncio
+async def test_upgrade_creates_hot_path_indexes(sqlite_engine):
+    """Test migrating to head creates the lookup indexes and records the revision."""
+    await upgrade_schema(sqlite_engine)
+
+    bookings = await index_names(sqlite_engine, "bookings")
+    checkins = await index_names(sqlite_engine, "checkin_records")
+    flights = await index_names(sqlite_engine, "flights")
+
+    assert {"ix_bookings_flight_id", "ix_bookings_passenger_id"} <= set(bookings)
+    assert checkins["ix_checkin_records_booking_id"]["unique"]
+    assert flights["ix_flights_route_departure_flight"]["column_names"] == [
+        "departure_airport", "arrival_airport", "departure_time", "flight_id"
+    ]
+    assert "ix_flights_departure_time" in flights
+    assert await verify_schema(sqlite_engine) == head_revision()
+
+@pytest.mark.asyncio
+async def test_migrations_match_models(sqlite_engine):
+    """Test the migration tree produces exactly the schema the models describe."""
+    await upgrade_schema(sqlite_engine)
+
+    async with sqlite_engine.connect() as conn:
+        diff = await conn.run_sync(lambda c: compare_metadata(MigrationContext.configure(c), Base.metadata))
+
+    assert diff == []
+
+@pytest.mark.asyncio
+async def test_verify_rejects_unmigrated_database(sqlite_engine):
+    """Test verify mode refuses an empty or outdated database."""
+    with pytest.raises(SchemaVersionError) as exc_info:
+        await prepare_schema(sqlite_engine, "verify")
+    assert exc_info.value.current is None
+
+    await upgrade_schema(sqlite_engine, "0001")
+
+    with pytest.raises(SchemaVersionError) as exc_info:
+        await verify_schema(sqlite_engine)
+    assert exc_info.value.current == "0001"
+
+@pytest.mark.asyncio
+async def test_migrate_mode_is_idempotent(sqlite_engine):
+    """Test migrate mode upgrades once and is a no-op on the next boot."""
+    await prepare_schema(sqlite_engine, "migrate")
+    await prepare_schema(sqlite_engine, "migrate")
+
+    assert await verify_schema(sqlite_engine) == head_revision()
+
+@pytest.mark.asyncio
+async def test_create_mode_stamps_head(sqlite_engine):
+    """Test create mode builds tables from the models and stamps the head revision."""
+    await prepare_schema(sqlite_engine, "create")
+
+    await prepare_schema(sqlite_engine, "verify")
+    assert "ix_bookings_flight_id" in await index_names(sqlite_engine, "bookings")
+
+@pytest.mark.asyncio
+async def test_unknown_schema_mode_rejected(sqlite_engine):
+    """Test an unknown DB_SCHEMA_MODE fails fast."""
+    with pytest.raises(ValueError):
+        await prepare_schema(sqlite_engine, "drop")
+
+@pytest.mark.asyncio
+async def test_checkin_booking_id_is_unique(sqlite_engine):
+    """Test the database rejects a second check-in for the same booking."""
+    await upgrade_schema(sqlite_engine)
+    row = {"booking_id": "B1", "checkin_time": datetime.utcnow(), "boarding_group": "A"}
+
+    async with sqlite_engine.begin() as conn:
+        await conn.execute(Base.metadata.tables["checkin_records"].insert(), {**row, "checkin_id": "C1", "boarding_pass_number": "BP1"})
+
+    with pytest.raises(IntegrityError):
+        async with sqlite_engine.begin() as conn:
+            await conn.execute(Base.metadata.tables["checkin_records"].insert(), {**row, "checkin_id": "C2", "boarding_pass_number": "BP2"})
+
+@pytest.mark.asyncio
+async def test_seat_index_migration_reseats_duplicates(sqlite_engine):
+    """Test upgrading moves duplicate live seats to free ones before adding the unique seat index."""
+    await upgrade_schema(sqlite_engine, "0002")
+    now = datetime.utcnow()
+    tables = Base.metadata.tables
+
+    async with sqlite_engine.begin() as conn:
+        await conn.execute(tables["flights"].insert(), {
+            "flight_id": "DUP1", "departure_airport": "JFK", "arrival_airport": "LAX",
+            "departure_time": now, "arrival_time": now, "aircraft_type": "Boeing 737",
+            "total_seats": 6, "available_seats": 2, "status": "scheduled"
+        })
+        await conn.execute(tables["bookings"].insert(), [
+            {"booking_id": "B1", "flight_id": "DUP1", "passenger_id": "P1", "seat_number": "1A", "booking_status": "confirmed", "booking_date": now},
+            {"booking_id": "B2", "flight_id": "DUP1", "passenger_id": "P2", "seat_number": "1A", "booking_status": "checked_in", "booking_date": now + timedelta(minutes=1)},
+            {"booking_id": "B3", "flight_id": "DUP1", "passenger_id": "P3", "seat_number": "1B", "booking_status": "confirmed", "booking_date": now},
+            {"booking_id": "B4", "flight_id": "DUP1", "passenger_id": "P4", "seat_number": "1B", "booking_status": "cancelled", "booking_date": now},
+        ])
+
+    await upgrade_schema(sqlite_engine)
+
+    async with sqlite_engine.connect() as conn:
+        seats = dict((await conn.execute(sa.select(tables["bookings"].c.booking_id, tables["bookings"].c.seat_number))).all())
+    assert seats == {"B1": "1C", "B2": "1A", "B3": "1B", "B4": "1B"}
+
+    with pytest.raises(IntegrityError):
+        async with sqlite_engine.begin() as conn:
+            await conn.execute(tables["bookings"].insert(), {
+                "booking_id": "B5", "flight_id": "DUP1", "passenger_id": "P5", "seat_number": "1A",
+                "booking_status": "confirmed", "booking_date": now
+            })
+
+def test_postgres_indexes_built_concurrently():
+    """Test the offline Postgres script builds the indexes concurrently outside a transaction."""
+    config = alembic_config()
+    config.set_main_option("sqlalchemy.url", "postgresql://localhost/flight_checkin")
+    config.output_buffer = io.StringIO()
+
+    command.upgrade(config, "0001:head", sql=True)
+    sql = config.output_buffer.getvalue()
+
+    assert "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_bookings_flight_id ON bookings (flight_id)" in sql
+    assert "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_checkin_records_booking_id" in sql
+    assert "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_bookings_flight_seat ON bookings (flight_id, seat_number) WHERE booking_status <> 'cancelled'" in sql
+    assert sql.index("COMMIT") < sql.index("CONCURRENTLY")
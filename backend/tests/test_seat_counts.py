@@ -0,0 +1,67 @@
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.models import Flight
+from app.core.seat_counts import SeatCountRefresher
+from app.repositories.flight_repository import FlightRepository
+from conftest import add_seated_flight
+
+async def seed_flight(session_factory, flight_id, total_seats=6):
+    async with session_factory() as session:
+        await add_seated_flight(session, flight_id, total_seats)
+        await session.commit()
+
+@pytest.mark.asyncio
+async def test_flush_recounts_marked_flights_only(sqlite_session_factory):
+    """Test one flush recounts the marked flights from their free seat rows."""
+    await seed_flight(sqlite_session_factory, "SC1")
+    await seed_flight(sqlite_session_factory, "SC2")
+    async with sqlite_session_factory() as session:
+        repo = FlightRepository(session)
+        await repo.claim_seat("SC1", "B1")
+        await repo.claim_seat("SC1", "B2")
+        await repo.claim_seat("SC2", "B3")
+        await session.commit()
+
+    refresher = SeatCountRefresher()
+    refresher.mark("SC1")
+    refresher.mark("SC1")
+    async with sqlite_session_factory() as session:
+        assert await refresher.flush(session) == 1
+        assert await refresher.flush(session) == 0
+
+    async with sqlite_session_factory() as session:
+        assert (await session.get(Flight, "SC1")).available_seats == 4
+        assert (await session.get(Flight, "SC2")).available_seats == 6
+    assert refresher.pending == set()
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_flights_pending():
+    """Test flights stay marked when the recount fails, so the next run retries them."""
+    session = AsyncMock()
+    session.execute.side_effect = RuntimeError("DB Error")
+    refresher = SeatCountRefresher()
+    refresher.mark("SC1")
+
+    with pytest.raises(RuntimeError):
+        await refresher.flush(session)
+
+    session.rollback.assert_awaited_once()
+    assert refresher.pending == {"SC1"}
+
+@pytest.mark.asyncio
+async def test_stop_flushes_pending_counts(sqlite_session_factory):
+    """Test stopping the background task writes out what is still pending."""
+    await seed_flight(sqlite_session_factory, "SC1")
+    async with sqlite_session_factory() as session:
+        await FlightRepository(session).claim_seat("SC1", "B1")
+        await session.commit()
+
+    refresher = SeatCountRefresher(interval=3600)
+    refresher.start(sqlite_session_factory)
+    refresher.mark("SC1")
+    await refresher.stop(sqlite_session_factory)
+
+    async with sqlite_session_factory() as session:
+        assert (await session.get(Flight, "SC1")).available_seats == 5
+    assert refresher._task is None
@@ -0,0 +1,139 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.models import Flight, Booking, Seat
+from app.core.schemas import BookingCreate, FlightCreate
+from app.core.seat_counts import seat_counts
+from app.core.seat_map import layout_for
+from app.repositories.flight_repository import FlightRepository
+from conftest import add_seated_flight, build_booking_service, make_passenger
+
+def test_layout_follows_aircraft_type():
+    """Test seat letters come from the aircraft family and rows fill front to back."""
+    narrow = layout_for("Boeing 737-800", 180)
+    wide = layout_for("Boeing 777", 350)
+
+    assert narrow.letters == "ABCDEF"
+    assert narrow.seat_at(0) == "1A"
+    assert narrow.seat_at(179) == "30F"
+    assert wide.letters == "ABCDEFGHJK"
+    assert wide.seat_at(9) == "1K"
+    assert layout_for("Small Jet", 10).letters == "ABCDEF"
+
+def test_layout_rejects_seats_outside_cabin():
+    """Test seat numbers beyond the last seat or with unknown letters have no index."""
+    layout = layout_for("Airbus A320", 15)
+
+    assert layout.index_of("3C") == 14
+    assert layout.index_of("3c") == 14
+    assert layout.index_of("3D") is None
+    assert layout.index_of("1I") is None
+    assert layout.index_of("0A") is None
+    assert layout.index_of("") is None
+    assert len(layout.seat_numbers()) == 15
+
+@pytest.mark.asyncio
+async def test_flight_creation_materializes_seats(sqlite_session_factory):
+    """Test a new flight gets one free seat row per seat in cabin order."""
+    async with sqlite_session_factory() as session:
+        await FlightRepository(session).create(FlightCreate(
+            flight_id="SM2",
+            departure_airport="JFK",
+            arrival_airport="LAX",
+            departure_time=datetime.utcnow() + timedelta(hours=6),
+            arrival_time=datetime.utcnow() + timedelta(hours=12),
+            aircraft_type="Boeing 777",
+            total_seats=12
+        ))
+        await session.commit()
+
+    async with sqlite_session_factory() as session:
+        seats = (await session.execute(
+            select(Seat.seat_number, Seat.booking_id).where(Seat.flight_id == "SM2").order_by(Seat.seat_index)
+        )).all()
+    assert [seat.seat_number for seat in seats] == ["1A", "1B", "1C", "1D", "1E", "1F", "1G", "1H", "1J", "1K", "2A", "2B"]
+    assert all(seat.booking_id is None for seat in seats)
+
+async def seed_flight(session_factory, total_seats=12):
+    async with session_factory() as session:
+        await add_seated_flight(session, "SM1", total_seats)
+        session.add(make_passenger("P-SM"))
+        await session.commit()
+
+async def book(session_factory, seat_number=None):
+    async with session_factory() as session:
+        service = build_booking_service(session)
+        return await service.create_booking(BookingCreate(flight_id="SM1", passenger_id="P-SM", seat_number=seat_number))
+
+async def cancel(session_factory, booking_id):
+    async with session_factory() as session:
+        service = build_booking_service(session)
+        await service.cancel_booking(booking_id)
+
+@pytest.mark.asyncio
+async def test_cancelled_seat_is_reassigned(sqlite_session_factory):
+    """Test a cancelled seat goes to the next booking instead of a duplicate."""
+    await seed_flight(sqlite_session_factory)
+
+    first = await book(sqlite_session_factory)
+    second = await book(sqlite_session_factory)
+    await cancel(sqlite_session_factory, first.booking_id)
+    third = await book(sqlite_session_factory)
+    fourth = await book(sqlite_session_factory)
+
+    assert [first.seat_number, second.seat_number] == ["1A", "1B"]
+    assert [third.seat_number, fourth.seat_number] == ["1A", "1C"]
+
+@pytest.mark.asyncio
+async def test_requested_seat_taken_or_unknown(sqlite_session_factory):
+    """Test requesting a taken seat is a conflict and a missing seat a bad request."""
+    await seed_flight(sqlite_session_factory)
+    await book(sqlite_session_factory, "2B")
+
+    with pytest.raises(HTTPException) as exc_info:
+        await book(sqlite_session_factory, "2B")
+    assert exc_info.value.status_code == 409
+
+    with pytest.raises(HTTPException) as exc_info:
+        await book(sqlite_session_factory, "9A")
+    assert exc_info.value.status_code == 400
+
+    async with sqlite_session_factory() as session:
+        assert await seat_counts.flush(session) == 1
+        flight = await session.get(Flight, "SM1")
+        assert flight.available_seats == 11
+
+@pytest.mark.asyncio
+async def test_booking_links_seat_row(sqlite_session_factory):
+    """Test the claimed seat row carries the booking id and cancellation clears it."""
+    await seed_flight(sqlite_session_factory)
+    booking = await book(sqlite_session_factory, "1D")
+
+    async with sqlite_session_factory() as session:
+        seat = await session.get(Seat, ("SM1", "1D"))
+        assert seat.booking_id == booking.booking_id
+
+    await cancel(sqlite_session_factory, booking.booking_id)
+
+    async with sqlite_session_factory() as session:
+        seat = await session.get(Seat, ("SM1", "1D"))
+        assert seat.booking_id is None
+        assert await session.scalar(select(Booking.booking_status)) == "cancelled"
+
+@pytest.mark.asyncio
+async def test_failed_booking_releases_claimed_seat(sqlite_session_factory):
+    """Test a booking that rolls back does not leave its seat row held."""
+    await seed_flight(sqlite_session_factory)
+
+    async with sqlite_session_factory() as session:
+        service = build_booking_service(session)
+        async def failing_commit():
+            raise RuntimeError("commit failed")
+        session.commit = failing_commit
+        with pytest.raises(RuntimeError):
+            await service.create_booking(BookingCreate(flight_id="SM1", passenger_id="P-SM"))
+
+    assert (await book(sqlite_session_factory)).seat_number == "1A"
+    assert seat_counts.pending == {"SM1"}
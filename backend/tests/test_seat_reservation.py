@@ -0,0 +1,139 @@
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock
+from fastapi import HTTPException
+from sqlalchemy import select, func
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.models import Base, Flight, Booking
+from app.core.schemas import BookingCreate
+from app.core.seat_counts import seat_counts
+from app.repositories.flight_repository import FlightRepository
+from app.services.booking_service import BookingService
+from conftest import add_seated_flight, build_booking_service, make_passenger
+
+SEATS = 100
+BOOKING_ATTEMPTS = 2000
+
+@pytest.fixture
+async def contended_session_factory(tmp_path):
+    """SQLite file with a pool wide enough for many writers to queue on the same row."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'seats.db'}",
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=20,
+        max_overflow=0,
+        pool_timeout=120,
+        connect_args={"timeout": 60}
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    await engine.dispose()
+
+async def seed_flight(session_factory, seats):
+    async with session_factory() as session:
+        await add_seated_flight(session, "HOT1", seats)
+        session.add(make_passenger("P-HOT"))
+        await session.commit()
+
+@pytest.mark.asyncio
+async def test_claim_seat_takes_frontmost_free_seat(sqlite_session_factory):
+    """Test claims without a seat number fill the cabin front to back."""
+    await seed_flight(sqlite_session_factory, 8)
+
+    async with sqlite_session_factory() as session:
+        repo = FlightRepository(session)
+        assert await repo.claim_seat("HOT1", "B1") == "1A"
+        assert await repo.claim_seat("HOT1", "B2", "1C") == "1C"
+        assert await repo.claim_seat("HOT1", "B3") == "1B"
+        assert await repo.claim_seat("HOT1", "B4") == "1D"
+        await session.commit()
+
+    async with sqlite_session_factory() as session:
+        seat = await FlightRepository(session).get_seat("HOT1", "1C")
+        assert seat.booking_id == "B2"
+
+@pytest.mark.asyncio
+async def test_claim_seat_reports_taken_and_sold_out(sqlite_session_factory):
+    """Test claims match nothing for a held seat, a full cabin or an unknown flight."""
+    await seed_flight(sqlite_session_factory, 1)
+
+    async with sqlite_session_factory() as session:
+        repo = FlightRepository(session)
+        assert await repo.claim_seat("HOT1", "B1") == "1A"
+        assert await repo.claim_seat("HOT1", "B2", "1A") is None
+        assert await repo.claim_seat("HOT1", "B2") is None
+        assert await repo.claim_seat("HOT1", "B2", "9Z") is None
+        assert await repo.claim_seat("MISSING", "B2") is None
+
+        await repo.release_seat("B1")
+        assert await repo.claim_seat("HOT1", "B2") == "1A"
+
+@pytest.mark.asyncio
+async def test_claim_seat_skips_locked_rows_on_postgres():
+    """Test the free-seat lookup compiles to FOR UPDATE SKIP LOCKED."""
+    session = AsyncMock()
+    await FlightRepository(session).claim_seat("HOT1", "B1")
+
+    statement = session.execute.await_args.args[0]
+    assert "FOR UPDATE SKIP LOCKED" in str(statement.compile(dialect=postgresql.dialect()))
+
+@pytest.mark.asyncio
+async def test_create_booking_skips_flight_select_when_seat_claimed():
+    """Test the happy path claims a seat row without reading or writing the flight."""
+    flight_repo = AsyncMock()
+    flight_repo.claim_seat.return_value = "1A"
+    booking_repo = AsyncMock()
+    booking_repo.create.return_value = Booking(
+        booking_id="B1",
+        flight_id="HOT1",
+        passenger_id="P-HOT",
+        seat_number="1A",
+        booking_status="confirmed",
+        booking_date=datetime.utcnow()
+    )
+    service = BookingService(booking_repo, flight_repo, AsyncMock(), AsyncMock(), AsyncMock())
+
+    await service.create_booking(BookingCreate(flight_id="HOT1", passenger_id="P-HOT"))
+
+    flight_repo.get_by_id.assert_not_called()
+    booking_id = flight_repo.claim_seat.await_args.args[1]
+    booking_repo.create.assert_awaited_once()
+    assert booking_repo.create.await_args.args[1:] == ("1A", booking_id)
+    assert seat_counts.pending == {"HOT1"}
+
+@pytest.mark.asyncio
+async def test_concurrent_bookings_never_oversell(contended_session_factory):
+    """Test thousands of simultaneous bookings fill the flight exactly once."""
+    await seed_flight(contended_session_factory, SEATS)
+
+    async def book():
+        async with contended_session_factory() as session:
+            service = build_booking_service(session)
+            try:
+                booking = await service.create_booking(BookingCreate(flight_id="HOT1", passenger_id="P-HOT"))
+            except HTTPException as e:
+                return e.status_code
+            return booking.seat_number
+
+    results = await asyncio.gather(*(book() for _ in range(BOOKING_ATTEMPTS)))
+
+    seats = [r for r in results if isinstance(r, str)]
+    rejected = [r for r in results if not isinstance(r, str)]
+    assert len(seats) == SEATS
+    assert len(set(seats)) == SEATS
+    assert rejected == [409] * (BOOKING_ATTEMPTS - SEATS)
+
+    async with contended_session_factory() as session:
+        assert await seat_counts.flush(session) == 1
+        flight = await session.get(Flight, "HOT1")
+        bookings = await session.scalar(select(func.count()).select_from(Booking))
+        assert flight.available_seats == 0
+        assert bookings == SEATS
@@ -156,18 +156,8 @@ async def test_booking_service_create_success():
     mock_passenger_repo = AsyncMock()
     mock_checkin_repo = AsyncMock()
     
-    # Mock flight exists with available seats
-    mock_flight_repo.get_by_id.return_value = Flight(
-        flight_id="TEST123",
-        departure_airport="JFK",
-        arrival_airport="LAX",
-        departure_time=datetime.utcnow() + timedelta(hours=6),
-        arrival_time=datetime.utcnow() + timedelta(hours=12),
-        aircraft_type="Boeing 737",
-        total_seats=180,
-        available_seats=10,
-        status="scheduled"
-    )
+    # Mock the seat row claim
+    mock_flight_repo.claim_seat.return_value = "12A"
     
     # Mock passenger exists
     mock_passenger_repo.get_by_id.return_value = Passenger(
@@ -201,7 +191,8 @@ async def test_booking_service_create_success():
     
     assert result.flight_id == "TEST123"
     assert result.seat_number == "12A"
-    mock_flight_repo.update_available_seats.assert_called_once_with("TEST123", -1)
+    assert mock_flight_repo.claim_seat.call_args.args[::2] == ("TEST123", "12A")
+    mock_flight_repo.get_by_id.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_booking_service_create_no_seats():
@@ -212,6 +203,7 @@ async def test_booking_service_create_no_seats():
     mock_checkin_repo = AsyncMock()
     
     # Mock flight exists but no available seats
+    mock_flight_repo.claim_seat.return_value = None
     mock_flight_repo.get_by_id.return_value = Flight(
         flight_id="TEST123",
         departure_airport="JFK",
@@ -276,11 +268,17 @@ async def test_booking_service_checkin_success():
         status="scheduled"
     )
     
-    mock_booking_repo.get_with_flight.return_value = (booking, flight)
-    mock_checkin_repo.get_by_booking_id.return_value = None  # Not checked in yet
+    mock_booking_repo.mark_checked_in.return_value = MagicMock(
+        booking_id=booking.booking_id,
+        flight_id=flight.flight_id,
+        passenger_id=booking.passenger_id,
+        seat_number=booking.seat_number,
+        departure_time=flight.departure_time,
+        already_checked_in=False
+    )
     
     from app.core.models import CheckinRecord
-    mock_checkin_repo.create.return_value = CheckinRecord(
+    mock_checkin_repo.create_if_absent.return_value = CheckinRecord(
         checkin_id="C123",
         booking_id="B123",
         boarding_pass_number="TEST123-B123-20241226120000",
@@ -301,6 +299,9 @@ async def test_booking_service_checkin_success():
     assert result.flight_id == "TEST123"
     assert result.seat_number == "12A"
     assert result.boarding_group == "B"
+    mock_booking_repo.mark_checked_in.assert_awaited_once_with("B123")
+    mock_booking_repo.get_with_flight.assert_not_called()
+    mock_checkin_repo.get_by_booking_id.assert_not_called()
 
 @pytest.mark.asyncio
 async def test_booking_service_checkin_already_checked_in():
@@ -331,17 +332,14 @@ async def test_booking_service_checkin_already_checked_in():
         status="scheduled"
     )
     
-    mock_booking_repo.get_with_flight.return_value = (booking, flight)
-    
     # Already checked in
-    from app.core.models import CheckinRecord
-    mock_checkin_repo.get_by_booking_id.return_value = CheckinRecord(
-        checkin_id="C123",
-        booking_id="B123",
-        boarding_pass_number="TEST123-B123-20241226120000",
-        gate_number="A1",
-        boarding_group="B",
-        checkin_time=datetime.utcnow()
+    mock_booking_repo.mark_checked_in.return_value = MagicMock(
+        booking_id=booking.booking_id,
+        flight_id=flight.flight_id,
+        passenger_id=booking.passenger_id,
+        seat_number=booking.seat_number,
+        departure_time=flight.departure_time,
+        already_checked_in=True
     )
     
     service = BookingService(mock_booking_repo, mock_flight_repo, mock_passenger_repo, mock_checkin_repo)
@@ -354,4 +352,5 @@ async def test_booking_service_checkin_already_checked_in():
     with pytest.raises(HTTPException) as exc_info:
         await service.checkin(checkin_data)
     
-    assert exc_info.value.status_code == 409
\ No newline at end of file
+    assert exc_info.value.status_code == 409
+    mock_checkin_repo.create_if_absent.assert_not_called()
\ No newline at end of file
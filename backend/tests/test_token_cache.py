@@ -0,0 +1,51 @@
+import pytest
+from datetime import timedelta
+from fastapi import HTTPException
+
+from app.core.auth import create_access_token, decode_token
+from app.core.token_cache import TokenCache, token_cache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_entries_expire_at_token_exp():
+    """Test a cached token is dropped once its own exp has passed."""
+    clock = FakeClock()
+    cache = TokenCache(clock=clock)
+    cache.put("short", {"sub": "alice", "exp": 10})
+    cache.put("long", {"sub": "alice", "exp": 100})
+    cache.put("no-exp", {"sub": "alice"})
+
+    clock.now = 10
+    assert cache.get("short") is None
+    assert cache.get("long")["exp"] == 100
+    assert cache.get("no-exp") is None
+
+def test_cache_evicts_least_recently_used():
+    """Test the cache keeps at most its capacity, dropping the least recently used token."""
+    cache = TokenCache(capacity=2, clock=FakeClock())
+    cache.put("a", {"exp": 100})
+    cache.put("b", {"exp": 100})
+    cache.get("a")
+    cache.put("c", {"exp": 100})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["tokens"] == 2
+
+def test_decode_token_caches_only_valid_tokens():
+    """Test a verified token is decoded once and an invalid one is never cached."""
+    token = create_access_token({"sub": "alice"})
+    hits, misses = token_cache.hits, token_cache.misses
+    assert decode_token(token) is decode_token(token)
+    assert (token_cache.hits - hits, token_cache.misses - misses) == (1, 1)
+
+    expired = create_access_token({"sub": "alice"}, timedelta(minutes=-1))
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            decode_token(expired)
+    assert token_cache.stats()["tokens"] == 1
@@ -0,0 +1,64 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.core.models import Booking, CheckinRecord
+from conftest import build_booking_service, make_flight, make_passenger
+
+async def seed_trip(session_factory, checked_in=False):
+    async with session_factory() as session:
+        session.add(make_flight("TR1", available_seats=179))
+        session.add(make_passenger("P-TR", first_name="Jane", email="jane.tr@test.com"))
+        session.add(Booking(booking_id="B-TR", flight_id="TR1", passenger_id="P-TR", seat_number="12A"))
+        if checked_in:
+            session.add(CheckinRecord(checkin_id="C-TR", booking_id="B-TR", boarding_pass_number="BPTR0001",
+                                      boarding_group="B", gate_number="A5"))
+        await session.commit()
+
+@pytest.mark.asyncio
+async def test_trip_is_one_select(sqlite_session_factory):
+    """Test a checked-in trip comes back whole from a single joined SELECT."""
+    await seed_trip(sqlite_session_factory, checked_in=True)
+
+    async with sqlite_session_factory() as session:
+        statements = []
+        event.listen(session.sync_session.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        trip = await build_booking_service(session).get_trip("B-TR")
+
+    assert len(statements) == 1
+    assert trip.booking.seat_number == "12A"
+    assert (trip.flight.flight_id, trip.flight.arrival_airport) == ("TR1", "LAX")
+    assert trip.passenger.first_name == "Jane"
+    assert trip.boarding_pass.boarding_pass_number == "BPTR0001"
+    assert (trip.boarding_pass.seat_number, trip.boarding_pass.gate_number) == ("12A", "A5")
+
+@pytest.mark.asyncio
+async def test_trip_without_checkin_and_unknown_booking(sqlite_session_factory):
+    """Test a trip before check-in has no boarding pass and an unknown booking is a 404."""
+    await seed_trip(sqlite_session_factory)
+
+    async with sqlite_session_factory() as session:
+        service = build_booking_service(session)
+        trip = await service.get_trip("B-TR")
+        with pytest.raises(HTTPException) as exc_info:
+            await service.get_trip("MISSING")
+
+    assert trip.boarding_pass is None
+    assert trip.booking.booking_status == "confirmed"
+    assert exc_info.value.status_code == 404
+
+@pytest.mark.asyncio
+async def test_trip_endpoint(sqlite_session_factory, sqlite_client):
+    """Test GET /api/trips/{booking_id} returns booking, flight, passenger and boarding pass together."""
+    await seed_trip(sqlite_session_factory, checked_in=True)
+
+    response = await sqlite_client.get("/api/trips/B-TR")
+    missing = await sqlite_client.get("/api/trips/MISSING")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"booking", "flight", "passenger", "boarding_pass"}
+    assert body["boarding_pass"]["checkin_id"] == "C-TR"
+    assert body["passenger"]["email"] == "jane.tr@test.com"
+    assert missing.status_code == 404
@@ -0,0 +1,116 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import event, select, func
+
+from app.core.unit_of_work import UnitOfWork
+from app.core.models import Flight, Booking, CheckinRecord, Seat
+from app.core.schemas import BookingCreate, CheckinRequest
+from app.core.seat_counts import seat_counts
+from conftest import add_seated_flight, build_booking_service, make_passenger
+
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once_on_success():
+    """Test leaving the unit of work commits exactly once."""
+    session = AsyncMock()
+    uow = UnitOfWork(session)
+
+    async with uow:
+        assert uow.active
+
+    session.commit.assert_awaited_once()
+    session.rollback.assert_not_awaited()
+    assert not uow.active
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_on_error():
+    """Test an exception inside the unit of work rolls back and propagates."""
+    session = AsyncMock()
+
+    with pytest.raises(ValueError):
+        async with UnitOfWork(session):
+            raise ValueError("boom")
+
+    session.rollback.assert_awaited_once()
+    session.commit.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_unit_of_work_nested_entries_join_outer_transaction():
+    """Test nested entries defer the commit to the outermost exit."""
+    session = AsyncMock()
+    uow = UnitOfWork(session)
+
+    async with uow:
+        async with uow:
+            pass
+        session.commit.assert_not_awaited()
+
+    session.commit.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_unit_of_work_rolls_back_failed_commit():
+    """Test a failing commit is rolled back and re-raised."""
+    session = AsyncMock()
+    session.commit.side_effect = RuntimeError("serialization failure")
+
+    with pytest.raises(RuntimeError):
+        async with UnitOfWork(session):
+            pass
+
+    session.rollback.assert_awaited_once()
+
+async def seed_flight_and_passenger(session_factory):
+    async with session_factory() as session:
+        await add_seated_flight(session, "UOW1", 180)
+        session.add(make_passenger("P-UOW"))
+        await session.commit()
+
+@pytest.mark.asyncio
+async def test_create_booking_and_checkin_commit_once_each(sqlite_session_factory):
+    """Test booking and check-in each issue a single commit and no refresh queries."""
+    await seed_flight_and_passenger(sqlite_session_factory)
+
+    async with sqlite_session_factory() as session:
+        commits = []
+        event.listen(session.sync_session, "after_commit", lambda s: commits.append(s))
+        session.refresh = AsyncMock(side_effect=AssertionError("refresh should not be needed"))
+        service = build_booking_service(session)
+
+        booking = await service.create_booking(BookingCreate(flight_id="UOW1", passenger_id="P-UOW", seat_number="12A"))
+        assert len(commits) == 1
+        assert booking.booking_status == "confirmed"
+        assert booking.booking_date is not None
+
+        with patch('app.services.booking_service.validate_checkin_window', return_value=(True, "")):
+            boarding_pass = await service.checkin(CheckinRequest(booking_id=booking.booking_id, passenger_id="P-UOW"))
+        assert len(commits) == 2
+        assert boarding_pass.checkin_id
+        assert boarding_pass.checkin_time is not None
+
+    async with sqlite_session_factory() as session:
+        await seat_counts.flush(session)
+        flight = await session.get(Flight, "UOW1")
+        stored = await session.get(Booking, booking.booking_id)
+        assert flight.available_seats == 179
+        assert stored.booking_status == "checked_in"
+
+@pytest.mark.asyncio
+async def test_create_booking_is_atomic(sqlite_session_factory):
+    """Test a failure after the seat is reserved leaves no partial state behind."""
+    await seed_flight_and_passenger(sqlite_session_factory)
+
+    async with sqlite_session_factory() as session:
+        service = build_booking_service(session)
+        service.booking_repo.create = AsyncMock(side_effect=RuntimeError("DB Error"))
+
+        with pytest.raises(RuntimeError):
+            await service.create_booking(BookingCreate(flight_id="UOW1", passenger_id="P-UOW", seat_number="12A"))
+
+    async with sqlite_session_factory() as session:
+        bookings = await session.scalar(select(func.count()).select_from(Booking))
+        checkins = await session.scalar(select(func.count()).select_from(CheckinRecord))
+        flight = await session.get(Flight, "UOW1")
+        held = await session.scalar(select(func.count()).select_from(Seat).where(Seat.booking_id.is_not(None)))
+        assert bookings == 0
+        assert checkins == 0
+        assert held == 0
+        assert flight.available_seats == 180
@@ -5,7 +5,6 @@ from app.core.utils import (
     generate_id,
     generate_boarding_pass_number,
     get_boarding_group,
-    assign_seat,
     validate_checkin_window
 )
 
@@ -22,12 +21,11 @@ def test_generate_id():
 def test_generate_boarding_pass_number():
     """Test boarding pass number generation."""
     flight_id = "AA123"
-    booking_id = "B12345678"
     
-    boarding_pass = generate_boarding_pass_number(flight_id, booking_id)
+    boarding_pass = generate_boarding_pass_number(flight_id)
     
-    assert boarding_pass.startswith("AA123-B1234567")  # First 8 chars of booking_id
-    assert len(boarding_pass.split("-")) == 3  # flight-booking-timestamp
+    assert boarding_pass.startswith("AA123-")
+    assert len(boarding_pass.split("-")[1]) == 13  # flight-encoded ID
 
 def test_get_boarding_group():
     """Test boarding group assignment."""
@@ -43,20 +41,6 @@ def test_get_boarding_group():
     assert get_boarding_group("35B") == "C"
     assert get_boarding_group("50F") == "C"
 
-def test_assign_seat():
-    """Test automatic seat assignment."""
-    # First seat
-    seat = assign_seat(total_seats=180, available_seats=180)
-    assert seat == "1A"
-    
-    # Second seat
-    seat = assign_seat(total_seats=180, available_seats=179)
-    assert seat == "2A"
-    
-    # Last seat
-    seat = assign_seat(total_seats=180, available_seats=1)
-    assert seat == "180A"
-
 def test_validate_checkin_window():
     """Test check-in window validation."""
     now = datetime.utcnow()
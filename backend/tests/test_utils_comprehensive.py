@@ -6,7 +6,6 @@ from app.core.utils import (
     generate_id,
     generate_boarding_pass_number,
     get_boarding_group,
-    assign_seat,
     validate_checkin_window
 )
 
@@ -29,40 +28,26 @@ def test_generate_id():
 def test_generate_boarding_pass_number():
     """Test boarding pass number generation."""
     flight_id = "TEST123"
-    booking_id = "booking-12345678-abcd-efgh"
     
-    boarding_pass = generate_boarding_pass_number(flight_id, booking_id)
-    
-    # Should contain flight ID
-    assert flight_id in boarding_pass
-    
-    # Should contain first 8 chars of booking ID
-    assert "booking-" in boarding_pass
-    
-    # Should contain timestamp
-    assert len(boarding_pass.split("-")) >= 3
+    boarding_pass = generate_boarding_pass_number(flight_id)
     
     # Should be consistent format
     parts = boarding_pass.split("-")
     assert parts[0] == flight_id
-    # The timestamp should be the last part after splitting
-    assert len(parts[-1]) == 14  # Timestamp format YYYYMMDDHHMMSS
+    # Encoded ID is fixed width and barcode safe
+    assert len(parts[-1]) == 13
+    assert parts[-1].isalnum()
+    assert parts[-1] == parts[-1].upper()
 
-def test_generate_boarding_pass_number_different_times():
-    """Test boarding pass numbers generated at different times are unique."""
+def test_generate_boarding_pass_number_same_instant():
+    """Test boarding pass numbers generated back to back are unique and ordered."""
     flight_id = "TEST123"
-    booking_id = "booking-12345678"
-    
-    pass1 = generate_boarding_pass_number(flight_id, booking_id)
     
-    # Small delay to ensure different timestamp
-    import time
-    time.sleep(1.1)  # Ensure at least 1 second difference
+    passes = [generate_boarding_pass_number(flight_id) for _ in range(10000)]
     
-    pass2 = generate_boarding_pass_number(flight_id, booking_id)
-    
-    # Should be different due to timestamp
-    assert pass1 != pass2
+    # Unique even within the same millisecond
+    assert len(set(passes)) == len(passes)
+    assert passes == sorted(passes)
 
 def test_get_boarding_group_group_a():
     """Test boarding group A assignment (rows 1-10)."""
@@ -104,38 +89,6 @@ def test_get_boarding_group_edge_cases():
     assert get_boarding_group("15E") == "B"
     assert get_boarding_group("15F") == "B"
 
-def test_assign_seat():
-    """Test seat assignment utility."""
-    # First passenger on 180-seat flight
-    seat1 = assign_seat(180, 180)
-    assert seat1 == "1A"
-    
-    # Second passenger
-    seat2 = assign_seat(180, 179)
-    assert seat2 == "2A"
-    
-    # 50th passenger
-    seat50 = assign_seat(180, 131)  # 180 - 131 + 1 = 50
-    assert seat50 == "50A"
-    
-    # Last passenger
-    seat_last = assign_seat(180, 1)
-    assert seat_last == "180A"
-
-def test_assign_seat_edge_cases():
-    """Test seat assignment edge cases."""
-    # Small aircraft
-    seat_small = assign_seat(10, 10)
-    assert seat_small == "1A"
-    
-    # Large aircraft
-    seat_large = assign_seat(500, 1)
-    assert seat_large == "500A"
-    
-    # Single seat aircraft
-    seat_single = assign_seat(1, 1)
-    assert seat_single == "1A"
-
 def test_validate_checkin_window_valid():
     """Test valid check-in window."""
     # 12 hours before departure (valid)
@@ -202,9 +155,8 @@ def test_utility_functions_with_real_data():
     """Test utility functions with realistic data."""
     # Generate realistic boarding pass
     flight_id = "AA1234"
-    booking_id = "bk-" + generate_id()
     
-    boarding_pass = generate_boarding_pass_number(flight_id, booking_id)
+    boarding_pass = generate_boarding_pass_number(flight_id)
     assert "AA1234" in boarding_pass
     
     # Test realistic seat assignments
@@ -242,13 +194,3 @@ def test_utility_functions_error_handling():
     # Test boarding group with non-numeric row
     with pytest.raises(ValueError):
         get_boarding_group("AA")
-    
-    # Test assign_seat with invalid parameters
-    with pytest.raises(ValueError):
-        assign_seat(0, 1)  # Total seats can't be 0
-    
-    with pytest.raises(ValueError):
-        assign_seat(10, 11)  # Available seats can't exceed total
-    
-    with pytest.raises(ValueError):
-        assign_seat(-5, 1)  # Negative total seats
\ No newline at end of file
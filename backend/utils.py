@@ -1,14 +1,15 @@
 import uuid
 from datetime import datetime, timedelta
 
+from app.core.ids import next_encoded_id
+
 def generate_id() -> str:
     """Generate unique ID"""
     return str(uuid.uuid4())
 
-def generate_boarding_pass_number(flight_id: str, booking_id: str) -> str:
-    """Generate boarding pass number"""
-    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-    return f"{flight_id}-{booking_id[:8]}-{timestamp}"
+def generate_boarding_pass_number(flight_id: str) -> str:
+    """Generate boarding pass number: flight plus a time-ordered, process-unique ID"""
+    return f"{flight_id}-{next_encoded_id()}"
 
 def get_boarding_group(seat_number: str) -> str:
     """Determine boarding group based on seat"""
@@ -20,12 +21,6 @@ def get_boarding_group(seat_number: str) -> str:
     else:
         return "C"  # Economy
 
-def assign_seat(total_seats: int, available_seats: int) -> str:
-    """Auto-assign seat"""
-    row = total_seats - available_seats + 1
-    seat_letter = 'A'
-    return f"{row}{seat_letter}"
-
 def validate_checkin_window(departure_time: datetime) -> tuple[bool, str]:
     """Validate if check-in is allowed"""
     now = datetime.utcnow()
@@ -7,7 +7,8 @@ const api = axios;
 api.defaults.baseURL = API_BASE_URL;
 
 export const flightAPI = {
-  getFlights: () => api.get('/api/flights'),
+  // params: departure_airport, arrival_airport, departure_from, departure_to, status, limit, cursor
+  getFlights: (params) => api.get('/api/flights', { params }),
   createFlight: (flightData) => api.post('/api/flights', flightData),
   getFlight: (flightId) => api.get(`/api/flights/${flightId}`),
 };
@@ -21,6 +22,8 @@ export const bookingAPI = {
   createBooking: (bookingData) => api.post('/api/bookings', bookingData),
   getBooking: (bookingId) => api.get(`/api/bookings/${bookingId}`),
   cancelBooking: (bookingId) => api.delete(`/api/bookings/${bookingId}`),
+  // Booking, flight, passenger and boarding pass (null before check-in) in one request
+  getTrip: (bookingId) => api.get(`/api/trips/${bookingId}`),
 };
 
 export const checkinAPI = {
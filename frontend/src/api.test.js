@@ -62,6 +62,10 @@ describe('bookingAPI', () => {
   test('cancelBooking function exists', () => {
     expect(typeof bookingAPI.cancelBooking).toBe('function');
   });
+
+  test('getTrip function exists', () => {
+    expect(typeof bookingAPI.getTrip).toBe('function');
+  });
 });
 
 describe('checkinAPI', () => {
@@ -102,6 +106,7 @@ describe('API Functions Integration', () => {
     expect(() => bookingAPI.createBooking({})).not.toThrow();
     expect(() => bookingAPI.getBooking('123')).not.toThrow();
     expect(() => bookingAPI.cancelBooking('123')).not.toThrow();
+    expect(() => bookingAPI.getTrip('123')).not.toThrow();
     
     expect(() => checkinAPI.checkin({})).not.toThrow();
     expect(() => checkinAPI.getBoardingPass('123')).not.toThrow();
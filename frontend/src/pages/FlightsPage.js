@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useCallback } from 'react';
 import { flightAPI } from '../api';
 
 const FlightsPage = () => {
@@ -22,29 +22,41 @@ const FlightsPage = () => {
     }
   };
 
-  useEffect(() => {
-    const fetchFlights = async () => {
-      try {
-        console.log('Fetching flights from API...');
-        const response = await flightAPI.getFlights();
-        console.log('Flights response:', response.data);
-        setFlights(response.data);
-      } catch (err) {
-        console.error('Error fetching flights:', err);
-        if (err.code === 'ECONNREFUSED' || err.message.includes('Network Error')) {
-          setError('Cannot connect to backend server. Please ensure the backend is running on port 8000.');
-        } else if (err.response) {
-          setError(`Server error: ${err.response.status} - ${err.response.data?.detail || 'Unknown error'}`);
-        } else {
-          setError('Failed to load flights. Please check your connection.');
-        }
-      } finally {
-        setLoading(false);
+  // Upcoming flights only, from when the page was opened; the API pages by departure time
+  const [departureFrom] = useState(() => new Date().toISOString());
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const fetchFlights = useCallback(async (cursor) => {
+    try {
+      console.log('Fetching flights from API...');
+      const response = await flightAPI.getFlights({ departure_from: departureFrom, cursor: cursor || undefined });
+      console.log('Flights response:', response.data);
+      setFlights((loaded) => (cursor ? [...loaded, ...response.data] : response.data));
+      setNextCursor(response.headers?.['x-next-cursor'] || null);
+    } catch (err) {
+      console.error('Error fetching flights:', err);
+      if (err.code === 'ECONNREFUSED' || err.message.includes('Network Error')) {
+        setError('Cannot connect to backend server. Please ensure the backend is running on port 8000.');
+      } else if (err.response) {
+        setError(`Server error: ${err.response.status} - ${err.response.data?.detail || 'Unknown error'}`);
+      } else {
+        setError('Failed to load flights. Please check your connection.');
       }
-    };
+    } finally {
+      setLoading(false);
+    }
+  }, [departureFrom]);
 
-    fetchFlights();
-  }, []);
+  useEffect(() => {
+    fetchFlights(null);
+  }, [fetchFlights]);
+
+  const loadMore = async () => {
+    setLoadingMore(true);
+    await fetchFlights(nextCursor);
+    setLoadingMore(false);
+  };
 
   if (loading) return <div className="text-center py-8">Loading flights...</div>;
   if (error) return <div className="text-red-600 text-center py-8">{error}</div>;
@@ -120,6 +132,18 @@ const FlightsPage = () => {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="text-center mt-6">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="px-4 py-2 bg-blue-600 hover:bg-blue-700 disabled:bg-blue-400 text-white rounded-md text-sm"
+          >
+            {loadingMore ? 'Loading...' : 'Load more flights'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
@@ -1,9 +1,47 @@
 import React from 'react';
-import { render, screen } from '@testing-library/react';
+import { render, screen, fireEvent, waitFor } from '@testing-library/react';
 import '@testing-library/jest-dom';
 import FlightsPage from './FlightsPage';
+import { flightAPI } from '../api';
+
+jest.mock('../api', () => ({ flightAPI: { getFlights: jest.fn() } }));
+
+const flight = (flightId) => ({
+  flight_id: flightId,
+  departure_airport: 'JFK',
+  arrival_airport: 'LAX',
+  departure_time: '2030-01-01T10:00:00',
+  arrival_time: '2030-01-01T16:00:00',
+  aircraft_type: 'Boeing 737',
+  total_seats: 180,
+  available_seats: 100,
+  status: 'scheduled',
+});
 
 describe('FlightsPage Component', () => {
+  beforeEach(() => {
+    flightAPI.getFlights.mockReset();
+    flightAPI.getFlights.mockResolvedValue({ data: [], headers: {} });
+  });
+
+  test('loads upcoming flights and follows the next cursor', async () => {
+    flightAPI.getFlights
+      .mockResolvedValueOnce({ data: [flight('FL1')], headers: { 'x-next-cursor': 'page-2' } })
+      .mockResolvedValueOnce({ data: [flight('FL2')], headers: {} });
+    render(<FlightsPage />);
+
+    expect(await screen.findByText('FL1')).toBeInTheDocument();
+    const firstParams = flightAPI.getFlights.mock.calls[0][0];
+    expect(firstParams.departure_from).toBeTruthy();
+    expect(firstParams.cursor).toBeUndefined();
+
+    fireEvent.click(screen.getByText('Load more flights'));
+    expect(await screen.findByText('FL2')).toBeInTheDocument();
+    expect(screen.getByText('FL1')).toBeInTheDocument();
+    expect(flightAPI.getFlights.mock.calls[1][0]).toEqual({ departure_from: firstParams.departure_from, cursor: 'page-2' });
+    await waitFor(() => expect(screen.queryByText('Load more flights')).not.toBeInTheDocument());
+  });
+
   test('renders flights page title', () => {
     render(<FlightsPage />);
     
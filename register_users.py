@@ -20,6 +20,28 @@ def register_user(username, email, password):
         print(f"❌ Registration failed: {response.text}")
         return None
 
+def register_users_bulk(path, token):
+    """Register every user in a CSV (with a header) or JSONL file in one streamed request"""
+    fmt = "csv" if path.lower().endswith(".csv") else "jsonl"
+    with open(path, "rb") as body:
+        response = requests.post(
+            f"{API_URL}/admin/users/bulk",
+            params={"format": fmt},
+            data=body,
+            headers={"Authorization": f"Bearer {token}"}
+        )
+    
+    if response.status_code == 200:
+        report = response.json()
+        print(f"✅ {report['created']} users registered, "
+              f"{len(report['duplicates'])} duplicates, {len(report['invalid'])} invalid")
+        for issue in report["duplicates"] + report["invalid"]:
+            print(f"   line {issue['line']}: {issue['reason']}")
+        return report
+    else:
+        print(f"❌ Bulk registration failed: {response.text}")
+        return None
+
 if __name__ == "__main__":
     # Register test user
     register_user("admin", "admin@example.com", "admin123")